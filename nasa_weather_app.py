@@ -3,16 +3,27 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-import requests
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta
 import folium
 from streamlit_folium import st_folium
 import calendar
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
 from reportlab.lib.utils import ImageReader
 import streamlit.components.v1 as components
-import io
+from power_weather.analysis import (
+    DEFAULT_ANALYSIS_OFFSET_DAYS,
+    analysis_data_key,
+    build_alt_dates,
+    fetch_analysis_inputs,
+    get_date_limits,
+    present_analysis,
+)
+from power_weather.best_dates import MAX_WINDOW_DAYS, find_best_dates
+from power_weather.geocode import get_city_name, get_city_name_nowait
+from power_weather.heatmap import heatmap_overlays, overlay_codes, overlay_colour
+from power_weather.messages import format_message
+from power_weather.recommendations import EVENT_TYPES, get_event_specific_recommendations
+from power_weather.reports import lazy_exports
+from power_weather.warmup import load_venues, start_background_warmup
 
 st.set_page_config(
     page_title="NASA POWER Weather Intelligence",
@@ -137,11 +148,13 @@ languages = {
         "subtitle": "Açık Hava Etkinliği İçin Veri Bazlı Hava Tahmini",
         "select_location": "### 🗺️ Konum Seçin",
         "event_type_label": "*🎪 Etkinlik Tipi*",
-        "event_type_select": ["Düğün", "Konser", "Spor Etkinliği", "Festival", "Açık Hava Partisi", "Piknik", "İş Toplantısı", "Diğer"],
+        "event_type_select": EVENT_TYPES["tr"],
         "date_select_label": "*📅 Etkinlik Tarihi Seçin*",
         "coord_input_label": "*📍 Koordinat Girin:*",
         "set_coord_btn": "📍 Koordinatı Ayarla",
         "quick_cities_label": "*🏙️ Hızlı Şehir Seçimi:*",
+        "risk_layers": {"overall": "Genel risk", "thi": "THI riski", "wind": "Rüzgar riski", "precip": "Yağış riski"},
+        "risk_layer_caption": "🟩 düşük 🟧 orta 🟥 yüksek risk: {date} için {period} ortalamaları (±{window} gün)",
         "analyze_btn": "🚀 SEÇİLEN TARİHİ ANALİZ ET",
         "recommendations_title": "### 💡 Akıllı Öneriler",
         "comparison_title": "### 📊 Yakın Tarihlerle Karşılaştırma",
@@ -149,19 +162,30 @@ languages = {
         "footer_note": "⚠️ 3 aydan sonraki tarihler için tahmin güvenilirliği düşüktür | 📅 Bugün: ",
         "download_pdf": "📄 PDF İndir",
         "download_csv": "📊 CSV İndir",
+        "download_parquet": "🧱 Parquet İndir",
+        "download_arrow": "🏹 Arrow İndir",
         "graphs_title": "### 📈 Grafik Analizi",
-        "comparison_graph": "Yakın Tarih Karşılaştırması"
+        "comparison_graph": "Yakın Tarih Karşılaştırması",
+        "best_dates_title": "### 🔎 En İyi Tarih Bulucu",
+        "best_dates_help": "Seçilen dönemdeki her günü 10 yıllık klimatolojiye göre puanlar ve en düşük riskli günleri listeler (en fazla 6 ay).",
+        "best_dates_start": "Dönem başlangıcı",
+        "best_dates_end": "Dönem sonu",
+        "best_dates_top_n": "Gösterilecek gün sayısı",
+        "best_dates_btn": "🔎 EN İYİ TARİHLERİ BUL",
+        "best_dates_graph": "Günlük Birleşik Risk"
     },
     "en": {
         "title": "🌤️ POWER WEATHER INTELLIGENCE",
         "subtitle": "Data-Based Weather Forecast for Outdoor Events",
         "select_location": "### 🗺️ Select Location",
         "event_type_label": "*🎪 Event Type*",
-        "event_type_select": ["Wedding", "Concert", "Sports Event", "Festival", "Outdoor Party", "Picnic", "Business Meeting", "Other"],
+        "event_type_select": EVENT_TYPES["en"],
         "date_select_label": "*📅 Select Event Date*",
         "coord_input_label": "*📍 Enter Coordinates:*",
         "set_coord_btn": "📍 Set Coordinates",
         "quick_cities_label": "*🏙️ Quick City Selection:*",
+        "risk_layers": {"overall": "Overall risk", "thi": "THI risk", "wind": "Wind risk", "precip": "Precipitation risk"},
+        "risk_layer_caption": "🟩 low 🟧 medium 🟥 high risk: {period} averages for {date} (±{window} days)",
         "analyze_btn": "🚀 ANALYZE SELECTED DATE",
         "recommendations_title": "### 💡 Smart Recommendations",
         "comparison_title": "### 📊 Comparison with Nearby Dates",
@@ -169,8 +193,17 @@ languages = {
         "footer_note": "⚠️ Forecast reliability decreases for dates beyond 3 months | 📅 Today: ",
         "download_pdf": "📄 Download PDF",
         "download_csv": "📊 Download CSV",
+        "download_parquet": "🧱 Download Parquet",
+        "download_arrow": "🏹 Download Arrow",
         "graphs_title": "### 📈 Graph Analysis",
-        "comparison_graph": "Nearby Dates Comparison"
+        "comparison_graph": "Nearby Dates Comparison",
+        "best_dates_title": "### 🔎 Best Date Finder",
+        "best_dates_help": "Scores every day of the chosen period against the 10-year climatology and lists the lowest-risk days (up to 6 months).",
+        "best_dates_start": "Period start",
+        "best_dates_end": "Period end",
+        "best_dates_top_n": "Number of days to show",
+        "best_dates_btn": "🔎 FIND BEST DATES",
+        "best_dates_graph": "Daily Combined Risk"
     }
 }
 
@@ -191,719 +224,47 @@ st.markdown(
 )
 
 # Get current date for reference - HER ZAMAN GÜNCEL TARİH
-today = date.today()
-three_months_later = today + timedelta(days=90)
-ten_years_ago = today - timedelta(days=365*10)
-
-# Function to get city name from coordinates
-def get_city_name(lat, lon):
-    try:
-        url = f"https://nominatim.openstreetmap.org/reverse?lat={lat}&lon={lon}&format=json"
-        headers = {'User-Agent': 'NASAWeatherApp/1.0'}
-        response = requests.get(url, headers=headers, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            return data.get('display_name', f"{lat:.2f}, {lon:.2f}")
-        return f"{lat:.2f}, {lon:.2f}"
-    except:
-        return f"{lat:.2f}, {lon:.2f}"
-
-# NASA POWER API Functions
-def get_nasa_power_daily(lat, lon, start_date, end_date):
-    """Fetch daily data from NASA POWER API"""
-    try:
-        url = "https://power.larc.nasa.gov/api/temporal/daily/point"
-        params = {
-            'parameters': 'PRECTOTCORR,T2M,T2M_MAX,T2M_MIN,RH2M,WS2M',
-            'community': 'RE',
-            'longitude': lon,
-            'latitude': lat,
-            'start': start_date.strftime("%Y%m%d"),
-            'end': end_date.strftime("%Y%m%d"),
-            'format': 'JSON'
-        }
-        
-        st.info(f"🌍 Sending request to NASA API: {start_date} - {end_date}" if lang_code == "en" else f"🌍 NASA API'ye istek gönderiliyor: {start_date} - {end_date}")
-        
-        response = requests.get(url, params=params, timeout=30)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if 'properties' in data and 'parameter' in data['properties']:
-                st.success("✅ NASA daily data retrieved successfully!" if lang_code == "en" else "✅ NASA günlük verileri başarıyla alındı!")
-                return data
-            else:
-                st.warning("⚠️ NASA data structure unexpected, using simulation" if lang_code == "en" else "⚠️ NASA veri yapısı beklenenden farklı, simülasyon kullanılıyor")
-                return None
-        else:
-            st.warning(f"⚠️ NASA API error: {response.status_code}, using simulation" if lang_code == "en" else f"⚠️ NASA API hatası: {response.status_code}, simülasyon kullanılıyor")
-            return None
-    except Exception as e:
-        st.warning(f"⚠️ NASA API connection error: {str(e)}, using simulation" if lang_code == "en" else f"⚠️ NASA API bağlantı hatası: {str(e)}, simülasyon kullanılıyor")
-        return None
-
-def analyze_selected_date(lat, lon, selected_date, event_type, city_name):
-    """Analyze weather for the selected date, adapted to THI-based risk assessment from the research"""
-    if selected_date > three_months_later:
-        return {
-            'status': 'too_far',
-            'message': f"Selected date ({selected_date.strftime('%d.%m.%Y')}) is beyond 3 months. NASA POWER data cannot provide reliable forecasts." if lang_code == "en" else f"Seçtiğiniz tarih ({selected_date.strftime('%d.%m.%Y')}) 3 aydan daha ileride. NASA POWER verileri bu tarih için güvenilir tahmin sağlayamaz.",
-            'recommendation': f"Please select a date between {ten_years_ago.strftime('%d.%m.%Y')} and {three_months_later.strftime('%d.%m.%Y')}." if lang_code == "en" else f"Lütfen {ten_years_ago.strftime('%d.%m.%Y')} - {three_months_later.strftime('%d.%m.%Y')} aralığında bir tarih seçin."
-        }
-    
-    is_past = selected_date < today
-    analysis_start = selected_date - timedelta(days=2)
-    analysis_end = selected_date + timedelta(days=2)
-    
-    if is_past:
-        # Use historical daily data for past dates
-        data = get_nasa_power_daily(lat, lon, selected_date, selected_date)
-        if data:
-            params = data['properties']['parameter']
-            date_key = selected_date.strftime("%Y%m%d")
-            t_avg = params['T2M'].get(date_key, 22.0)
-            rh_avg = params['RH2M'].get(date_key, 60.0)
-            precip = params['PRECTOTCORR'].get(date_key, 2.0)
-            wind_speed = params['WS2M'].get(date_key, 3.0) 
-            thi_avg = calculate_thi(t_avg, rh_avg)
-            risk_level = get_thi_risk_level(thi_avg)
-            confidence = 'high'
-            data_source = 'NASA POWER Historical'
-            historical_period = f"{selected_date.year}"
-            accuracy = 'Based on actual historical data (high accuracy)'
-        else:
-            return get_simulation_analysis_for_date(lat, lon, selected_date, event_type)
-    else:
-        # For future dates, use climatology (monthly averages) as before, but incorporate THI
-        start_year = today.year - 10
-        end_year = today.year - 1
-        target_month = selected_date.month
-        target_day = selected_date.day
-        
-        climate_data = get_nasa_power_climatology_for_date_range(lat, lon, target_month, target_day, start_year, end_year)
-        
-        if not climate_data:
-            return get_simulation_analysis_for_date(lat, lon, selected_date, event_type)
-        
-        precip = climate_data.get('precipitation', 2.0)
-        t_avg = climate_data.get('temperature', 22.0)
-        rh_avg = climate_data.get('rh', 60.0)
-        wind_speed = climate_data.get('wind_speed', 3.0)
-        thi_avg = calculate_thi(t_avg, rh_avg)
-        risk_level = get_thi_risk_level(thi_avg)
-        confidence = climate_data.get('confidence', 'medium')
-        data_source = 'NASA POWER Climatology'
-        historical_period = f"{start_year}-{end_year}"
-        accuracy = 'Prediction based on historical climatology data'
-    
-    return {
-        'status': 'success',
-        'selected_date': selected_date,
-        'precipitation': precip,
-        'temperature': t_avg,
-        'wind_speed': wind_speed,
-        'thi': thi_avg,
-        'risk_level': risk_level,
-        'confidence': confidence,
-        'location': f"{lat:.2f}, {lon:.2f}",
-        'city_name': city_name,
-        'historical_period': historical_period,
-        'data_source': data_source,
-        'analysis_period': f"{analysis_start.strftime('%d.%m')} - {analysis_end.strftime('%d.%m')}",
-        'accuracy': accuracy if lang_code == "en" else 'Tarihi klimatoloji verilerine dayalı tahminidir' if not is_past else 'Tarihi klimatoloji verilerine dayalı tahminidir'
-    }
-
-def get_nasa_power_climatology_for_date_range(lat, lon, target_month, target_day, start_year, end_year):
-    """Fetch NASA POWER climatology data for a date range, extended for RH and WS2M"""
-    try:
-        url = "https://power.larc.nasa.gov/api/temporal/climatology/point"
-        params = {
-            'parameters': 'PRECTOTCORR,T2M,RH2M,WS2M',
-            'community': 'RE',
-            'longitude': lon,
-            'latitude': lat,
-            'start': start_year,
-            'end': end_year,
-            'format': 'JSON'
-        }
-        
-        response = requests.get(url, params=params, timeout=30)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if 'properties' in data and 'parameter' in data['properties']:
-                monthly_data = data['properties']['parameter']
-                month_names = ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 
-                              'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
-                month_key = month_names[target_month - 1]
-                
-                if month_key in monthly_data['PRECTOTCORR']:
-                    precip = monthly_data['PRECTOTCORR'][month_key]
-                    temp = monthly_data['T2M'][month_key]
-                    rh = monthly_data['RH2M'][month_key] if 'RH2M' in monthly_data else 60.0
-                    wind_speed = monthly_data['WS2M'][month_key] if 'WS2M' in monthly_data else 3.0
-                    day_variation = (target_day - 15) / 30 * 0.3
-                    precip_adj = max(0.1, precip * (1 + day_variation))
-                    
-                    return {
-                        'precipitation': precip_adj,
-                        'temperature': temp,
-                        'rh': rh,
-                        'wind_speed': wind_speed,
-                        'confidence': 'high'
-                    }
-        return None
-    except Exception as e:
-        return None
-
-def calculate_thi(t, rh):
-    """Calculate Temperature-Humidity Index (THI) based on the research formula"""
-    return (1.8 * t + 32) - ((0.55 - 0.0055 * rh) * (1.8 * t - 26))
-
-def get_thi_risk_level(thi):
-    """Determine risk level based on THI thresholds (adapted for outdoor events; research focused on livestock, but generalizable)"""
-    if thi < 72:
-        return 'low'
-    elif thi < 79:
-        return 'medium'
-    else:
-        return 'high'
-
-def get_wind_risk_level(wind_speed):
-    """Determine risk level based on wind speed"""
-    if wind_speed < 5.0:
-        return 'low'
-    elif wind_speed < 10.0:
-        return 'medium'
-    else:
-        return 'high'
-
-def get_precipitation_risk_level(precip):
-    """Determine risk level based on precipitation"""
-    if precip < 1.0:
-        return 'low'
-    elif precip < 5.0:
-        return 'medium'
-    else:
-        return 'high'
-
-def get_simulation_analysis_for_date(lat, lon, selected_date, event_type):
-    """Use simulation if NASA data is unavailable, incorporating THI and wind speed"""
-    st.info("🔬 Using simulation data" if lang_code == "en" else "🔬 Simülasyon verileri kullanılıyor")
-    
-    month = selected_date.month
-    day = selected_date.day
-    
-    if month in [12, 1, 2]:
-        base_precip = 3.5
-        base_temp = 5.0
-        base_rh = 70.0
-        base_wind = 4.0
-    elif month in [3, 4, 5]:
-        base_precip = 2.0
-        base_temp = 15.0
-        base_rh = 65.0
-        base_wind = 3.5
-    elif month in [6, 7, 8]:
-        base_precip = 0.8
-        base_temp = 27.0
-        base_rh = 55.0
-        base_wind = 2.5
-    else:  # Fall
-        base_precip = 2.5
-        base_temp = 18.0
-        base_rh = 60.0
-        base_wind = 3.0
-    
-    day_factor = 1.0 + (day - 15) / 30 * 0.4
-    precip = max(0.1, base_precip * day_factor)
-    temp = base_temp + (day - 15) * 0.1
-    rh = base_rh
-    wind_speed = base_wind + (day - 15) * 0.05 
-    thi = calculate_thi(temp, rh)
-    risk_level = get_thi_risk_level(thi)
-    
-    return {
-        'status': 'success',
-        'selected_date': selected_date,
-        'precipitation': precip,
-        'temperature': temp,
-        'wind_speed': wind_speed,
-        'thi': thi,
-        'risk_level': risk_level,
-        'confidence': 'medium',
-        'location': f"{lat:.2f}, {lon:.2f}",
-        'city_name': get_city_name(lat, lon),
-        'historical_period': "2013-2023 (Simulation)" if lang_code == "en" else "2013-2023 (Simülasyon)",
-        'data_source': 'Simulation' if lang_code == "en" else 'Simülasyon',
-        'analysis_period': "±2 days window" if lang_code == "en" else "±2 günlük pencere",
-        'accuracy': 'Estimated 70-80% based on historical climatology data' if lang_code == "en" else 'Tarihi klimatoloji verilerine dayalı tahmini %70-80 doğruluk'
-    }
-
-def get_event_specific_recommendations(event_type, analysis_data):
-    """Generate event-specific recommendations, incorporating THI risk and wind speed"""
-    recommendations = []
-    selected_date = analysis_data['selected_date']
-    precip = analysis_data['precipitation']
-    thi = analysis_data['thi']
-    wind_speed = analysis_data['wind_speed']
-    temp = analysis_data['temperature']
-    risk_level = analysis_data['risk_level']
-    wind_risk_level = get_wind_risk_level(wind_speed)
-    precip_risk_level = get_precipitation_risk_level(precip)
-    location = analysis_data['location']
-    date_str = selected_date.strftime('%d.%m.%Y')
-    
-    # Main recommendation based on risk level
-    if risk_level == 'low':
-        recommendations.append({
-            'type': 'success',
-            'title': '✅ PERFECT CHOICE!' if lang_code == "en" else '✅ MÜKEMMEL SEÇİM!',
-            'message': f'{date_str} has low heat stress risk for {location}' if lang_code == "en" else f'{date_str} tarihi {location} için düşük ısı stresi riskine sahip',
-            'details': [
-                f'Average THI: {thi:.1f}, Precipitation: {precip:.1f} mm/day, Wind: {wind_speed:.1f} m/s on {date_str}' if lang_code == "en" else f'Ortalama THI: {thi:.1f}, Yağış: {precip:.1f} mm/gün, Rüzgar: {wind_speed:.1f} m/s {date_str} tarihinde',
-                'Ideal conditions for outdoor events' if lang_code == "en" else 'Açık hava etkinliği için ideal koşullar',
-                f'Analysis period: {analysis_data.get("analysis_period", "±2 days")}' if lang_code == "en" else f'Analiz dönemi: {analysis_data.get("analysis_period", "±2 gün")}',
-                'Data reliability: High' if lang_code == "en" else 'Veri güvenilirliği: Yüksek'
-            ]
-        })
-    elif risk_level == 'medium':
-        recommendations.append({
-            'type': 'warning',
-            'title': '⚠️ MEDIUM RISK' if lang_code == "en" else '⚠️ ORTA SEVİYE RİSK',
-            'message': f'{date_str} has moderate heat stress risk' if lang_code == "en" else f'{date_str} tarihi orta ısı stresi riski taşıyor',
-            'details': [
-                f'Average THI: {thi:.1f}, Precipitation: {precip:.1f} mm/day, Wind: {wind_speed:.1f} m/s on {date_str}' if lang_code == "en" else f'Ortalama THI: {thi:.1f}, Yağış: {precip:.1f} mm/gün, Rüzgar: {wind_speed:.1f} m/s {date_str} tarihinde',
-                'Prepare for moderate heat and humidity' if lang_code == "en" else 'Orta seviye ısı ve nem için hazırlıklı olun',
-                'Plan hydration and shaded areas' if lang_code == "en" else 'Hidrasyon ve gölgeli alanlar planlayın',
-                'Inform guests about weather conditions' if lang_code == "en" else 'Misafirleri hava durumu konusunda bilgilendirin'
-            ]
-        })
-    else:
-        recommendations.append({
-            'type': 'danger',
-            'title': '🌡️ HIGH RISK' if lang_code == "en" else '🌡️ YÜKSEK RİSK',
-            'message': f'{date_str} has high heat stress risk' if lang_code == "en" else f'{date_str} tarihi yüksek ısı stresi riski taşıyor',
-            'details': [
-                f'Average THI: {thi:.1f}, Precipitation: {precip:.1f} mm/day, Wind: {wind_speed:.1f} m/s on {date_str}' if lang_code == "en" else f'Ortalama THI: {thi:.1f}, Yağış: {precip:.1f} mm/gün, Rüzgar: {wind_speed:.1f} m/s {date_str} tarihinde',
-                'Not suitable for prolonged outdoor activities' if lang_code == "en" else 'Uzun süreli açık hava etkinlikleri için uygun değil',
-                'Consider indoor alternatives or rescheduling' if lang_code == "en" else 'Kapalı mekan alternatifi veya erteleme düşünün',
-                'High risk of heat-related issues' if lang_code == "en" else 'Isı kaynaklı sorunlar için yüksek risk'
-            ]
-        })
-    
-    # Wind-specific recommendations
-    if wind_risk_level == 'high':
-        recommendations.append({
-            'type': 'warning',
-            'title': '💨 HIGH WIND WARNING' if lang_code == "en" else '💨 YÜKSEK RÜZGAR UYARISI',
-            'message': f'High wind speed expected: {wind_speed:.1f} m/s' if lang_code == "en" else f'Yüksek rüzgar hızı bekleniyor: {wind_speed:.1f} m/s',
-            'details': [
-                'Secure loose items and decorations' if lang_code == "en" else 'Gevşek eşyaları ve dekorasyonları sabitleyin',
-                'Consider wind protection for outdoor setups' if lang_code == "en" else 'Açık hava düzenlemeleri için rüzgar koruması düşünün',
-                'Monitor weather updates for wind gusts' if lang_code == "en" else 'Rüzgar sağanakları için hava durumu güncellemelerini takip edin',
-                'Postpone activities requiring stable conditions' if lang_code == "en" else 'Sabit koşullar gerektiren aktiviteleri erteleyin'
-            ]
-        })
-    elif wind_risk_level == 'medium':
-        recommendations.append({
-            'type': 'info',
-            'title': '💨 MODERATE WIND' if lang_code == "en" else '💨 ORTA SEVİYE RÜZGAR',
-            'message': f'Moderate wind speed: {wind_speed:.1f} m/s' if lang_code == "en" else f'Orta seviye rüzgar hızı: {wind_speed:.1f} m/s',
-            'details': [
-                'Light items may be affected by wind' if lang_code == "en" else 'Hafif eşyalar rüzgardan etkilenebilir',
-                'Consider securing paper materials and light decorations' if lang_code == "en" else 'Kağıt malzemeleri ve hafif dekorasyonları sabitlemeyi düşünün',
-                'Wind may affect sound quality for outdoor speeches' if lang_code == "en" else 'Rüzgar açık hava konuşmalarında ses kalitesini etkileyebilir'
-            ]
-        })
-    
-    # Precipitation-specific recommendations
-    if precip_risk_level == 'high':
-        recommendations.append({
-            'type': 'danger',
-            'title': '🌧️ HEAVY RAIN WARNING' if lang_code == "en" else '🌧️ ŞİDDETLİ YAĞMUR UYARISI',
-            'message': f'High precipitation expected: {precip:.1f} mm/day' if lang_code == "en" else f'Yüksek yağış bekleniyor: {precip:.1f} mm/gün',
-            'details': [
-                'Postpone outdoor activities or move indoors' if lang_code == "en" else 'Açık hava aktivitelerini erteleyin veya iç mekana taşıyın',
-                'Ensure proper drainage at venue' if lang_code == "en" else 'Mekanda uygun drenaj olduğundan emin olun',
-                'Prepare for potential flooding in low areas' if lang_code == "en" else 'Alçak bölgelerde olası su baskınlarına hazırlıklı olun',
-                'Have emergency shelters ready' if lang_code == "en" else 'Acil barınaklar hazır bulundurun'
-            ]
-        })
-    elif precip_risk_level == 'medium':
-        recommendations.append({
-            'type': 'warning',
-            'title': '🌦️ LIGHT RAIN POSSIBLE' if lang_code == "en" else '🌦️ HAFİF YAĞMUR OLABİLİR',
-            'message': f'Light to moderate precipitation: {precip:.1f} mm/day' if lang_code == "en" else f'Hafif-orta şiddette yağış: {precip:.1f} mm/gün',
-            'details': [
-                'Have umbrellas and rain covers ready' if lang_code == "en" else 'Şemsiye ve yağmur örtüleri hazır bulundurun',
-                'Protect electronic equipment from moisture' if lang_code == "en" else 'Elektronik ekipmanları nemden koruyun',
-                'Consider temporary shelters or tents' if lang_code == "en" else 'Geçici barınaklar veya çadırlar düşünün',
-                'Prepare for potential schedule adjustments' if lang_code == "en" else 'Olası program değişikliklerine hazırlıklı olun'
-            ]
-        })
-    
-    # Temperature-specific recommendations
-    if temp < 10:
-        recommendations.append({
-            'type': 'warning',
-            'title': '🥶 COLD WEATHER ALERT' if lang_code == "en" else '🥶 SOĞUK HAVA UYARISI',
-            'message': f'Cold temperature expected: {temp:.1f}°C' if lang_code == "en" else f'Soğuk sıcaklık bekleniyor: {temp:.1f}°C',
-            'details': [
-                'Provide heating solutions for outdoor areas' if lang_code == "en" else 'Açık alanlar için ısıtma çözümleri sağlayın',
-                'Warm beverages and indoor warming areas recommended' if lang_code == "en" else 'Sıcak içecekler ve kapalı ısınma alanları önerilir',
-                'Inform guests to dress warmly' if lang_code == "en" else 'Misafirlere sıcak giyinmeleri konusunda bilgi verin',
-                'Consider shorter duration for outdoor activities' if lang_code == "en" else 'Açık hava aktiviteleri için daha kısa süre düşünün'
-            ]
-        })
-    elif temp > 30:
-        recommendations.append({
-            'type': 'warning',
-            'title': '🥵 HOT WEATHER ALERT' if lang_code == "en" else '🥵 SICAK HAVA UYARISI',
-            'message': f'Hot temperature expected: {temp:.1f}°C' if lang_code == "en" else f'Sıcak hava bekleniyor: {temp:.1f}°C',
-            'details': [
-                'Provide ample shaded areas and cooling stations' if lang_code == "en" else 'Bol gölgeli alanlar ve serinleme istasyonları sağlayın',
-                'Ensure proper hydration with water stations' if lang_code == "en" else 'Su istasyonları ile uygun hidrasyon sağlayın',
-                'Schedule activities during cooler morning/evening hours' if lang_code == "en" else 'Aktiviteleri daha serin sabah/akşam saatlerine planlayın',
-                'Have medical support for heat-related issues' if lang_code == "en" else 'Isı kaynaklı sorunlar için tıbbi destek hazır bulundurun'
-            ]
-        })
+today, ten_years_ago, three_months_later = get_date_limits()
 
-    # GENİŞLETİLMİŞ ETKİNLİK BAZLI ÖNERİLER - EXPANDED EVENT-SPECIFIC RECOMMENDATIONS
-    event_recommendations_tr = {
-        "Düğün": {
-            "low": [
-                "Mükemmel düğün havası! Açık alanda tören için ideal koşullar",
-                "Dış mekan fotoğraf çekimi için harika fırsat",
-                "Misafirler için konforlu bir ortam sağlanacak",
-                "Açık hava resepsiyonu için yeşil ışık"
-            ],
-            "medium": [
-                "Yedek iç mekan planı yapın, hava değişebilir",
-                "Gelinlik ve takım elbise seçimlerinde hava koşullarını dikkate alın",
-                "Misafirler için şemsiye ve hafif yelek bulundurun",
-                "Fotoğraf çekimi için hem iç hem dış mekan planlayın"
-            ],
-            "high": [
-                "KESİNLİKLE iç mekan yedek planı uygulayın",
-                "Düğün programını kısaltmayı düşünün",
-                "Misafir konforu için klima/ısıtma önlemleri alın",
-                "Ulaşımda hava koşullarını dikkate alın"
-            ]
-        },
-        "Konser": {
-            "low": [
-                "Harika konser havası! Açık hava sahnesi için mükemmel",
-                "Ses kalitesi için ideal rüzgar koşulları",
-                "Seyirci konforu üst düzeyde",
-                "Uzun süreli performanslar için uygun"
-            ],
-            "medium": [
-                "Sahne ekipmanlarını koruyucu örtülerle koruyun",
-                "Ses sistemini rüzgar yönüne göre optimize edin",
-                "Seyirci alanında gölgelikler düşünün",
-                "Elektrik güvenliği için ek önlemler alın"
-            ],
-            "high": [
-                "Konseri iptal etmeyi veya kapalı mekana taşımayı düşünün",
-                "Elektrikli ekipmanları yağmurdan koruyun",
-                "Seyirci güvenliği için acil tahliye planı hazırlayın",
-                "Kısa program ve erken bitiş planlayın"
-            ]
-        },
-        "Festival": {
-            "low": [
-                "Festival için mükemmel hava koşulları!",
-                "Tüm gün açık hava etkinlikleri için uygun",
-                "Yiyecek-içecek stantları için ideal",
-                "Katılımın yüksek olması beklenir"
-            ],
-            "medium": [
-                "Çadır alanları için su geçirmez zemin hazırlayın",
-                "Acil yağmur planı oluşturun",
-                "Elektrik hatlarını yalıtımlı koruyun",
-                "İlk yardım istasyonlarını artırın"
-            ],
-            "high": [
-                "Festivali ertelemeyi ciddi olarak düşünün",
-                "Tüm açık hava aktivitelerini iptal edin",
-                "Güvenlik ekibini artırın",
-                "Acildurum iletişim planını devreye alın"
-            ]
-        },
-        "Spor Etkinliği": {
-            "low": [
-                "Spor müsabakaları için ideal koşullar",
-                "Atlet performansı maksimum düzeyde",
-                "Seyirci konforu üst düzeyde",
-                "Uzun süreli müsabakalar için uygun"
-            ],
-            "medium": [
-                "Saha durumunu sürekli kontrol edin",
-                "Molaları sıklaştırın",
-                "Seyirciler için ek su istasyonları kurun",
-                "Hava durumuna göre program esnekliği sağlayın"
-            ],
-            "high": [
-                "Müsabakayı erteleyin veya iptal edin",
-                "Atlet sağlığını ön planda tutun",
-                "Seyirci güvenliği için önlemleri artırın",
-                "Alternatif kapalı mekan planı uygulayın"
-            ]
-        },
-        "Açık Hava Partisi": {
-            "low": [
-                "Parti için mükemmel hava! Tüm planlar uygulanabilir",
-                "Dış mekan dekorasyonları için ideal",
-                "Misafirler rahatça sosyalleşebilir",
-                "Gece saatlerine kadar parti devam edebilir"
-            ],
-            "medium": [
-                "Yedek çadır veya şemsiye bulundurun",
-                "Müzik ekipmanlarını koruyucu örtülerle koruyun",
-                "Hafif yiyecekler tercih edin",
-                "Misafir sayısını sınırlamayı düşünün"
-            ],
-            "high": [
-                "Partiyi kapalı mekana taşıyın",
-                "Kısa süreli bir program planlayın",
-                "Misafirleri önceden bilgilendirin",
-                "Alternatif tarih önerin"
-            ]
-        },
-        "Piknik": {
-            "low": [
-                "Harika piknik havası! Doğayla iç içe keyifli vakit",
-                "Açık ateş için uygun koşullar",
-                "Uzun süreli açık hava aktiviteleri mümkün",
-                "Fotoğraf çekimi için mükemmel ışık"
-            ],
-            "medium": [
-                "Piknik alanı seçerken yüksek ve korunaklı yerleri tercih edin",
-                "Yiyecekleri kapalı kaplarda saklayın",
-                "Acil durum çadırı bulundurun",
-                "Programı esnek tutun"
-            ],
-            "high": [
-                "Pikniği iptal edin veya kapalı mekana taşıyın",
-                "Açık ateş kesinlikle yakmayın",
-                "Islak zeminde kayma riskine karşı dikkatli olun",
-                "Alternatif aktivite planlayın"
-            ]
-        },
-        "İş Toplantısı": {
-            "low": [
-                "Verimli bir açık hava toplantısı için ideal koşullar",
-                "Doğal ortamda yaratıcı fikirler geliştirme fırsatı",
-                "Katılımcı motivasyonu yüksek olacak",
-                "Uzun süreli oturumlar için uygun"
-            ],
-            "medium": [
-                "Yedek kapalı mekan ayarlayın",
-                "Elektronik cihazları koruyucu önlemler alın",
-                "Sunum ekipmanlarını yedekleyin",
-                "Toplantı süresini optimize edin"
-            ],
-            "high": [
-                "Toplantıyı kesinlikle kapalı mekana alın",
-                "Video konferans alternatifi sunun",
-                "Katılımcı ulaşımını yeniden planlayın",
-                "Toplantıyı ertelemeyi düşünün"
-            ]
-        },
-        "Diğer": {
-            "low": ["Mükemmel koşullar - planlarınızı güvenle uygulayın"],
-            "medium": ["Dikkatli olun - yedek planlar yapın"],
-            "high": ["Riskli koşullar - alternatif plan uygulayın"]
-        }
-    }
+@st.cache_resource
+def get_quick_cities():
+    """Quick-city venues, read once per server process; their data is pre-fetched in the background"""
+    venues = load_venues()
+    start_background_warmup(venues)
+    return venues
 
-    event_recommendations_en = {
-        "Wedding": {
-            "low": [
-                "Perfect wedding weather! Ideal conditions for outdoor ceremony",
-                "Great opportunity for outdoor photography",
-                "Comfortable environment for guests",
-                "Green light for outdoor reception"
-            ],
-            "medium": [
-                "Have an indoor backup plan, weather may change",
-                "Consider weather conditions for dress and suit selections",
-                "Have umbrellas and light jackets available for guests",
-                "Plan both indoor and outdoor photography options"
-            ],
-            "high": [
-                "DEFINITELY implement indoor backup plan",
-                "Consider shortening the wedding program",
-                "Take air conditioning/heating measures for guest comfort",
-                "Consider transportation weather conditions"
-            ]
-        },
-        "Concert": {
-            "low": [
-                "Great concert weather! Perfect for outdoor stage",
-                "Ideal wind conditions for sound quality",
-                "Maximum audience comfort",
-                "Suitable for long performances"
-            ],
-            "medium": [
-                "Protect stage equipment with protective covers",
-                "Optimize sound system according to wind direction",
-                "Consider shades in audience area",
-                "Take extra electrical safety measures"
-            ],
-            "high": [
-                "Consider canceling concert or moving indoors",
-                "Protect electrical equipment from rain",
-                "Prepare emergency evacuation plan for audience safety",
-                "Plan shorter program and early ending"
-            ]
-        },
-        "Festival": {
-            "low": [
-                "Perfect weather conditions for festival!",
-                "Suitable for all-day outdoor activities",
-                "Ideal for food and beverage stands",
-                "High attendance expected"
-            ],
-            "medium": [
-                "Prepare waterproof flooring for tent areas",
-                "Create emergency rain plan",
-                "Protect electrical lines with insulation",
-                "Increase first aid stations"
-            ],
-            "high": [
-                "Seriously consider postponing the festival",
-                "Cancel all outdoor activities",
-                "Increase security team",
-                "Activate emergency communication plan"
-            ]
-        },
-        "Sports Event": {
-            "low": [
-                "Ideal conditions for sports competitions",
-                "Maximum athlete performance",
-                "Maximum spectator comfort",
-                "Suitable for long competitions"
-            ],
-            "medium": [
-                "Continuously monitor field conditions",
-                "Increase break frequency",
-                "Set up additional water stations for spectators",
-                "Provide schedule flexibility based on weather"
-            ],
-            "high": [
-                "Postpone or cancel the competition",
-                "Prioritize athlete health",
-                "Increase spectator safety measures",
-                "Implement alternative indoor venue plan"
-            ]
-        },
-        "Outdoor Party": {
-            "low": [
-                "Perfect party weather! All plans can be implemented",
-                "Ideal for outdoor decorations",
-                "Guests can socialize comfortably",
-                "Party can continue until night hours"
-            ],
-            "medium": [
-                "Have backup tents or umbrellas",
-                "Protect music equipment with covers",
-                "Prefer light foods",
-                "Consider limiting number of guests"
-            ],
-            "high": [
-                "Move party indoors",
-                "Plan short-term program",
-                "Inform guests in advance",
-                "Suggest alternative date"
-            ]
-        },
-        "Picnic": {
-            "low": [
-                "Great picnic weather! Enjoyable time in nature",
-                "Suitable conditions for open fire",
-                "Long-term outdoor activities possible",
-                "Perfect lighting for photography"
-            ],
-            "medium": [
-                "Choose high and protected areas for picnic location",
-                "Store food in closed containers",
-                "Have emergency tent available",
-                "Keep schedule flexible"
-            ],
-            "high": [
-                "Cancel picnic or move indoors",
-                "Absolutely no open fire",
-                "Be careful of slipping risk on wet ground",
-                "Plan alternative activity"
-            ]
-        },
-        "Business Meeting": {
-            "low": [
-                "Ideal conditions for productive outdoor meeting",
-                "Opportunity to develop creative ideas in natural environment",
-                "High participant motivation",
-                "Suitable for long sessions"
-            ],
-            "medium": [
-                "Arrange backup indoor venue",
-                "Take protective measures for electronic devices",
-                "Backup presentation equipment",
-                "Optimize meeting duration"
-            ],
-            "high": [
-                "Definitely move meeting indoors",
-                "Offer video conference alternative",
-                "Replan participant transportation",
-                "Consider postponing meeting"
-            ]
-        },
-        "Other": {
-            "low": ["Perfect conditions - implement your plans with confidence"],
-            "medium": ["Be careful - make backup plans"],
-            "high": ["Risky conditions - implement alternative plan"]
-        }
-    }
+cities = get_quick_cities()
 
-    # Add event-specific recommendations based on language
-    event_recommendations = event_recommendations_tr if lang_code == "tr" else event_recommendations_en
-    
-    # Map event type names between languages
-    event_type_mapping = {
-        "tr": {
-            "Düğün": "Düğün", "Konser": "Konser", "Spor Etkinliği": "Spor Etkinliği",
-            "Festival": "Festival", "Açık Hava Partisi": "Açık Hava Partisi",
-            "Piknik": "Piknik", "İş Toplantısı": "İş Toplantısı", "Diğer": "Diğer"
-        },
-        "en": {
-            "Wedding": "Wedding", "Concert": "Concert", "Sports Event": "Sports Event",
-            "Festival": "Festival", "Outdoor Party": "Outdoor Party",
-            "Picnic": "Picnic", "Business Meeting": "Business Meeting", "Other": "Other"
-        }
-    }
-    
-    current_event_type = event_type_mapping[lang_code].get(event_type, "Other")
-    
-    if current_event_type in event_recommendations:
-        event_recs = event_recommendations[current_event_type][risk_level]
-        recommendations.append({
-            'type': 'info',
-            'title': f'🎪 {current_event_type.upper()} { "ÖZEL ÖNERİLER" if lang_code == "tr" else "SPECIFIC RECOMMENDATIONS"}',
-            'message': f'{current_event_type} için {risk_level} risk seviyesine göre öneriler:' if lang_code == "tr" else f'Recommendations for {current_event_type} at {risk_level} risk level:',
-            'details': event_recs
-        })
-    
-    return recommendations
+def show_messages(messages):
+    """Render structured status messages from the data layer in the current language"""
+    for message in messages:
+        getattr(st, message['level'])(format_message(message, lang_code))
 
 # Map function for displaying interactive map
-def create_turkish_map(center_lat=39, center_lon=35, zoom_start=6, selected_coords=None):
+def create_turkish_map(center_lat=39, center_lon=35, zoom_start=6, selected_coords=None, risk_date=None):
     m = folium.Map(
         location=[center_lat, center_lon],
         zoom_start=zoom_start,
         tiles='OpenStreetMap'
     )
     
+    # Precomputed risk rasters (python -m power_weather.heatmap); read from disk, no API calls
+    overlays = heatmap_overlays(risk_date) if risk_date else None
+    if overlays:
+        metadata, paths = overlays
+        for layer, path in paths.items():
+            # Rows are reprojected from the latitude grid to Web Mercator; cells are drawn as sharp blocks
+            folium.raster_layers.ImageOverlay(
+                overlay_codes(path),
+                bounds=metadata['bounds'],
+                colormap=overlay_colour,
+                mercator_project=True,
+                pixelated=True,
+                name=texts['risk_layers'][layer],
+                show=layer == 'overall'
+            ).add_to(m)
+        folium.LayerControl(collapsed=True).add_to(m)
+    
     if selected_coords:
         folium.Marker(
             selected_coords,
@@ -923,9 +284,10 @@ if 'manual_lat' not in st.session_state:
 if 'manual_lon' not in st.session_state:
     st.session_state.manual_lon = st.session_state.selected_lon
 if 'city_name' not in st.session_state:
-    st.session_state.city_name = get_city_name(st.session_state.selected_lat, st.session_state.selected_lon)
+    # Never block first paint on the lookup; the analysis fills the name in if it is still missing
+    st.session_state.city_name = get_city_name_nowait(st.session_state.selected_lat, st.session_state.selected_lon)
 if 'selected_date' not in st.session_state:
-    st.session_state.selected_date = today + timedelta(days=30)  # Always use current date
+    st.session_state.selected_date = today + timedelta(days=DEFAULT_ANALYSIS_OFFSET_DAYS)  # Always use current date
 if 'analyze' not in st.session_state:
     st.session_state.analyze = False
 if 'analysis_results' not in st.session_state:
@@ -946,6 +308,10 @@ if 'pending_lat' in st.session_state:
     del st.session_state.pending_lon
     del st.session_state.pending_city_name
 
+# Pick up a place name resolved in the background since the last rerun
+if not st.session_state.city_name:
+    st.session_state.city_name = get_city_name_nowait(st.session_state.selected_lat, st.session_state.selected_lon)
+
 # Main layout with two columns
 col1, col2 = st.columns([2, 1])
 
@@ -959,19 +325,28 @@ with col1:
         center_lat=map_center[0],
         center_lon=map_center[1],
         zoom_start=map_zoom,
-        selected_coords=map_center
+        selected_coords=map_center,
+        risk_date=st.session_state.selected_date
     )
     
     st.markdown('<div class="map-container">', unsafe_allow_html=True)
     map_data = st_folium(m, width=700, height=400, key="main_map") 
     st.markdown('</div>', unsafe_allow_html=True)
+    st.caption(f"📍 {st.session_state.city_name or f'{st.session_state.selected_lat:.4f}, {st.session_state.selected_lon:.4f}'}")
+    heatmap = heatmap_overlays(st.session_state.selected_date)
+    if heatmap:
+        st.caption(texts['risk_layer_caption'].format(
+            date=st.session_state.selected_date.strftime('%d.%m'),
+            period=heatmap[0]['period'],
+            window=heatmap[0]['window_days']
+        ))
     
     if map_data and map_data.get("last_clicked"):
         clicked_lat = map_data["last_clicked"]["lat"]
         clicked_lon = map_data["last_clicked"]["lng"]
         st.session_state.pending_lat = clicked_lat
         st.session_state.pending_lon = clicked_lon
-        st.session_state.pending_city_name = get_city_name(clicked_lat, clicked_lon)
+        st.session_state.pending_city_name = get_city_name_nowait(clicked_lat, clicked_lon)
         st.success(f"Location selected: {clicked_lat:.4f}, {clicked_lon:.4f}" if lang_code == "en" else f"Konum seçildi: {clicked_lat:.4f}, {clicked_lon:.4f}")
         st.rerun()
     
@@ -979,17 +354,6 @@ with col1:
     st.markdown('<div class="quick-cities-container">', unsafe_allow_html=True)
     st.markdown(texts['quick_cities_label'])
     
-    cities = {
-        "İstanbul": (41.0082, 28.9784),
-        "Ankara": (39.9334, 32.8597),
-        "Paris": (48.8566, 2.3522),
-        "Londra": (51.5074, -0.1278),
-        "Berlin": (52.5200, 13.4050),
-        "Roma": (41.9028, 12.4964),
-        "Tokyo": (35.6762, 139.6503),
-        "New York": (40.7128, -74.0060)
-    }
-    
     city_cols = st.columns(4)
     for idx, (city, coords) in enumerate(cities.items()):
         with city_cols[idx % 4]:
@@ -1077,7 +441,7 @@ with col2:
         if st.button(texts['set_coord_btn'], key="coord_btn", use_container_width=True):
             st.session_state.selected_lat = manual_lat
             st.session_state.selected_lon = manual_lon
-            st.session_state.city_name = get_city_name(manual_lat, manual_lon)
+            st.session_state.city_name = get_city_name_nowait(manual_lat, manual_lon)
             st.success("Coordinates set!" if lang_code == "en" else "Koordinat ayarlandı!")
         
         st.markdown('</div>', unsafe_allow_html=True)
@@ -1091,41 +455,39 @@ if st.button(texts['analyze_btn'], type="primary", use_container_width=True, key
 # Analysis results
 if st.session_state.get('analyze', False):
     with st.spinner("Analyzing NASA POWER data for selected date..." if lang_code == "en" else f"{selected_date.strftime('%d.%m.%Y')} tarihi için NASA POWER verileri analiz ediliyor..."):
-        city_name = st.session_state.city_name
-        analysis_results = analyze_selected_date(
-            st.session_state.selected_lat,
-            st.session_state.selected_lon,
-            st.session_state.selected_date,
-            st.session_state.selected_event_type,
-            city_name
-        )
-        st.session_state.analysis_results = analysis_results
-        
-        alt_dates = []
-        for days in [-3, -2, -1, 0, 1, 2, 3]:
-            alt_date = analysis_results['selected_date'] + timedelta(days=days)
-            if alt_date >= ten_years_ago and alt_date <= today + timedelta(days=365):
-                if days == 0:
-                    alt_precip = analysis_results['precipitation']
-                    alt_thi = analysis_results['thi']
-                    alt_wind = analysis_results['wind_speed']
-                    alt_risk = analysis_results['risk_level']
-                else:
-                    variation = 1.0 + (abs(days) * 0.1) * (-1 if days % 2 == 0 else 1)
-                    alt_precip = max(0.1, analysis_results['precipitation'] * variation)
-                    alt_thi = analysis_results['thi'] + (days * 0.5)  
-                    alt_wind = analysis_results['wind_speed'] + (days * 0.1) 
-                    alt_risk = get_thi_risk_level(alt_thi)
-                
-                alt_dates.append({
-                    'date': alt_date,
-                    'precipitation': alt_precip,
-                    'thi': alt_thi,
-                    'wind_speed': alt_wind,
-                    'risk_level': alt_risk,
-                    'is_selected': (days == 0)
-                })
-        st.session_state.alt_dates = alt_dates
+        lat = st.session_state.selected_lat
+        lon = st.session_state.selected_lon
+        # Only a new grid cell or date goes back to NASA POWER; reruns reuse the stored data
+        data_key = analysis_data_key(lat, lon, st.session_state.selected_date, today)
+        if st.session_state.get('analysis_data_key') != data_key:
+            # POWER data and the place name are fetched concurrently
+            data, city_name = fetch_analysis_inputs(
+                lat, lon, st.session_state.selected_date, st.session_state.city_name, today
+            )
+            st.session_state.analysis_data = data
+            # A simulated fallback is shown but not kept, so the next rerun asks NASA POWER again
+            st.session_state.analysis_data_key = None if data.get('source') == 'simulation' else data_key
+            st.session_state.analysis_view_key = None
+            st.session_state.city_name = city_name
+            show_messages(data['messages'])
+        if not st.session_state.city_name:
+            st.session_state.city_name = get_city_name(lat, lon)
+
+        # Language, event type and location label only change the cheap presentation step
+        view_key = (data_key, st.session_state.selected_event_type, lang_code, lat, lon, st.session_state.city_name)
+        if st.session_state.get('analysis_view_key') != view_key:
+            analysis_results = present_analysis(st.session_state.analysis_data, lat, lon, st.session_state.city_name, lang_code, today)
+            st.session_state.analysis_results = analysis_results
+            st.session_state.alt_dates = build_alt_dates(analysis_results, today=today)
+            st.session_state.recommendations = get_event_specific_recommendations(
+                st.session_state.selected_event_type,
+                analysis_results,
+                lang=lang_code
+            ) if analysis_results['status'] == 'success' else []
+            # Built only when a download button is pressed, then kept for this result
+            st.session_state.exports = lazy_exports(analysis_results, st.session_state.alt_dates)
+            st.session_state.analysis_view_key = view_key
+        analysis_results = st.session_state.analysis_results
         
         if analysis_results['status'] == 'too_far':
             st.markdown(
@@ -1145,10 +507,7 @@ if st.session_state.get('analyze', False):
                 unsafe_allow_html=True
             )
         else:
-            recommendations = get_event_specific_recommendations(
-                st.session_state.selected_event_type,
-                analysis_results
-            )
+            recommendations = st.session_state.recommendations
             
             selected_date_str = analysis_results['selected_date'].strftime('%d.%m.%Y')
             precip = analysis_results['precipitation']
@@ -1218,86 +577,125 @@ if st.session_state.get('analyze', False):
                     unsafe_allow_html=True
                 )
             
-            # GRAFİK ANALİZ - SADECE ÇİZGİ GRAFİĞİ
-            st.markdown(texts['graphs_title'])
+            if st.session_state.alt_dates:
+                # GRAFİK ANALİZ - SADECE ÇİZGİ GRAFİĞİ
+                st.markdown(texts['graphs_title'])
             
-            # Sadece çizgi grafiği göster
-            alt_df = pd.DataFrame(st.session_state.alt_dates)
-            fig = px.line(alt_df, x='date', y=['precipitation', 'thi', 'wind_speed'], title=texts['comparison_graph'],
-                         markers=True, color_discrete_sequence=['blue', 'red', 'green'])
-            st.plotly_chart(fig, use_container_width=True)
+                # Sadece çizgi grafiği göster
+                alt_df = pd.DataFrame(st.session_state.alt_dates)
+                fig = px.line(alt_df, x='date', y=['precipitation', 'thi', 'wind_speed'], title=texts['comparison_graph'],
+                             markers=True, color_discrete_sequence=['blue', 'red', 'green'])
+                st.plotly_chart(fig, use_container_width=True)
             
-            st.markdown(texts['comparison_title'])
-            cols = st.columns(len(st.session_state.alt_dates))
-            for idx, alt_date in enumerate(st.session_state.alt_dates):
-                with cols[idx]:
-                    date_str = alt_date['date'].strftime('%d.%m')
-                    risk_emoji = "✅" if alt_date['risk_level'] == 'low' else "⚠️" if alt_date['risk_level'] == 'medium' else "❌"
-                    bg_color = "#00b09b" if alt_date['risk_level'] == 'low' else "#f46b45" if alt_date['risk_level'] == 'medium' else "#ff416c"
-                    border = "3px solid gold" if alt_date['is_selected'] else "1px solid #ccc"
+                st.markdown(texts['comparison_title'])
+                cols = st.columns(len(st.session_state.alt_dates))
+                for idx, alt_date in enumerate(st.session_state.alt_dates):
+                    with cols[idx]:
+                        date_str = alt_date['date'].strftime('%d.%m')
+                        risk_emoji = "✅" if alt_date['risk_level'] == 'low' else "⚠️" if alt_date['risk_level'] == 'medium' else "❌"
+                        bg_color = "#00b09b" if alt_date['risk_level'] == 'low' else "#f46b45" if alt_date['risk_level'] == 'medium' else "#ff416c"
+                        border = "3px solid gold" if alt_date['is_selected'] else "1px solid #ccc"
                     
-                    st.markdown(
-                        f"""
-                        <div style="background:{bg_color};color:white;padding:10px;border-radius:8px;text-align:center;border:{border};">
-                            <div><strong>{date_str}</strong></div>
-                            <div>{risk_emoji}</div>
-                            <div>{alt_date['precipitation']:.1f} mm</div>
-                            <div>💨 {alt_date['wind_speed']:.1f} m/s</div>
-                            <div>THI: {alt_date['thi']:.1f}</div>
-                            {'<div><small>SELECTED</small></div>' if alt_date['is_selected'] and lang_code == "en" else '<div><small>SEÇİLEN</small></div>' if alt_date['is_selected'] else ''}
-                        </div>
-                        """,
-                        unsafe_allow_html=True
-                    )
-            
-            def generate_pdf(results, alt_dates):
-                buffer = io.BytesIO()
-                c = canvas.Canvas(buffer, pagesize=letter)
-                c.drawString(100, 750, "NASA POWER Weather Report")
-                c.drawString(100, 730, f"Date: {results['selected_date'].strftime('%d.%m.%Y')}")
-                c.drawString(100, 710, f"Precipitation: {results['precipitation']:.1f} mm/day")
-                c.drawString(100, 690, f"Temperature: {results['temperature']:.1f} °C")
-                c.drawString(100, 670, f"Wind Speed: {results['wind_speed']:.1f} m/s")
-                c.drawString(100, 650, f"THI: {results['thi']:.1f}")
-                c.drawString(100, 630, f"Risk Level: {results['risk_level']}")
-                c.drawString(100, 610, f"Accuracy: {results['accuracy']}")
-                y = 590
-                for alt in alt_dates:
-                    c.drawString(100, y, f"{alt['date'].strftime('%d.%m.%Y')}: {alt['precipitation']:.1f} mm, Wind: {alt['wind_speed']:.1f} m/s, THI: {alt['thi']:.1f}")
-                    y -= 20
-                
-                c.save()
-                buffer.seek(0)
-                return buffer
+                        st.markdown(
+                            f"""
+                            <div style="background:{bg_color};color:white;padding:10px;border-radius:8px;text-align:center;border:{border};">
+                                <div><strong>{date_str}</strong></div>
+                                <div>{risk_emoji}</div>
+                                <div>{alt_date['precipitation']:.1f} mm</div>
+                                <div>💨 {alt_date['wind_speed']:.1f} m/s</div>
+                                <div>THI: {alt_date['thi']:.1f}</div>
+                                {'<div><small>SELECTED</small></div>' if alt_date['is_selected'] and lang_code == "en" else '<div><small>SEÇİLEN</small></div>' if alt_date['is_selected'] else ''}
+                            </div>
+                            """,
+                            unsafe_allow_html=True
+                        )
             
-            pdf_buffer = generate_pdf(analysis_results, st.session_state.alt_dates)
             st.download_button(
                 label=texts['download_pdf'],
-                data=pdf_buffer,
+                data=st.session_state.exports['pdf'],
                 file_name="weather_report.pdf",
                 mime="application/pdf"
             )
             
-            def generate_csv(results, alt_dates):
-                df = pd.DataFrame(alt_dates)
-                df['selected_date'] = results['selected_date'].strftime('%d.%m.%Y')
-                df['temperature'] = results['temperature']
-                df['thi_main'] = results['thi']
-                df['precipitation_main'] = results['precipitation']
-                df['wind_speed_main'] = results['wind_speed']
-                df['accuracy'] = results['accuracy']
-                buffer = io.StringIO()
-                df.to_csv(buffer, index=False)
-                return buffer.getvalue()
-            
-            csv_data = generate_csv(analysis_results, st.session_state.alt_dates)
             st.download_button(
                 label=texts['download_csv'],
-                data=csv_data,
+                data=st.session_state.exports['csv'],
                 file_name="weather_data.csv",
                 mime="text/csv"
             )
 
+            st.download_button(
+                label=texts['download_parquet'],
+                data=st.session_state.exports['parquet'],
+                file_name="weather_data.parquet",
+                mime="application/vnd.apache.parquet"
+            )
+
+            st.download_button(
+                label=texts['download_arrow'],
+                data=st.session_state.exports['arrow'],
+                file_name="weather_data.arrow",
+                mime="application/vnd.apache.arrow.file"
+            )
+
+# Best date finder: scan a whole planning window instead of one date at a time
+st.markdown("---")
+st.markdown(texts['best_dates_title'])
+st.caption(texts['best_dates_help'])
+best_col1, best_col2, best_col3 = st.columns([2, 2, 1])
+with best_col1:
+    best_start = st.date_input(texts['best_dates_start'], value=today + timedelta(days=1), min_value=today, key="best_start")
+with best_col2:
+    best_end = st.date_input(texts['best_dates_end'], value=today + timedelta(days=90), min_value=today, key="best_end")
+with best_col3:
+    best_top_n = st.number_input(texts['best_dates_top_n'], min_value=1, max_value=15, value=5, key="best_top_n")
+
+if st.button(texts['best_dates_btn'], use_container_width=True, key="best_dates_btn"):
+    if best_end < best_start:
+        st.error("❌ Period end must be after its start" if lang_code == "en" else "❌ Dönem sonu başlangıçtan önce olamaz")
+    elif (best_end - best_start).days + 1 > MAX_WINDOW_DAYS:
+        st.error("❌ The period can be at most 6 months" if lang_code == "en" else "❌ Dönem en fazla 6 ay olabilir")
+    else:
+        with st.spinner("Scoring every day of the period..." if lang_code == "en" else "Dönemdeki tüm günler puanlanıyor..."):
+            ranked, scores = find_best_dates(
+                st.session_state.selected_lat,
+                st.session_state.selected_lon,
+                best_start,
+                best_end,
+                st.session_state.selected_event_type,
+                int(best_top_n),
+                today=today,
+                lang=lang_code
+            )
+        if ranked is None:
+            st.warning("⚠️ Climatology data could not be loaded for this location" if lang_code == "en" else "⚠️ Bu konum için klimatoloji verisi alınamadı")
+        st.session_state.best_dates = ranked
+        st.session_state.best_dates_scores = scores
+
+if st.session_state.get('best_dates') is not None:
+    ranked = st.session_state.best_dates
+    scores = st.session_state.best_dates_scores
+    best_cols = st.columns(len(ranked))
+    for idx, row in ranked.iterrows():
+        with best_cols[idx]:
+            bg_color = "#00b09b" if row['risk_level'] == 'low' else "#f46b45" if row['risk_level'] == 'medium' else "#ff416c"
+            st.markdown(
+                f"""
+                <div style="background:{bg_color};color:white;padding:10px;border-radius:8px;text-align:center;">
+                    <div><strong>#{row['rank']} {row['date'].strftime('%d.%m.%Y')}</strong></div>
+                    <div>THI: {row['thi_p50']:.1f}</div>
+                    <div>🌧️ {row['precip_p50']:.1f} mm ({row['p_precip_medium'] * 100:.0f}%)</div>
+                    <div>💨 {row['wind_p50']:.1f} m/s</div>
+                    <div><small>Risk: {row['combined_risk']:.2f}</small></div>
+                    <div><small>{row['recommendations'].replace(chr(10), '<br>')}</small></div>
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+    fig = px.bar(scores, x='date', y='combined_risk', color='risk_level', title=texts['best_dates_graph'],
+                 color_discrete_map={'low': '#00b09b', 'medium': '#f46b45', 'high': '#ff416c'})
+    st.plotly_chart(fig, use_container_width=True)
+
 # Footer with CURRENT DATE
 st.markdown("---")
 today_footer = today.strftime('%d.%m.%Y')
@@ -0,0 +1,952 @@
+"""Micro-benchmarks for the power_weather engine (no network access needed)
+
+    python nasa_weather_bench.py                  # every benchmark
+    python nasa_weather_bench.py recommendations  # only the named ones
+
+Benchmarks also assert that their fast paths give the same results (e.g. the
+columnar exports round-trip every value and type), so this doubles as a check.
+"""
+
+import argparse
+import timeit
+from datetime import date, timedelta
+
+import numpy as np
+
+BENCHMARKS = {}
+
+
+def benchmark(func):
+    BENCHMARKS[func.__name__[len('bench_'):]] = func
+    return func
+
+
+def peak_mb(func):
+    """Peak traced Python allocation of one call in MB"""
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def per_call_us(func, number=2000, repeat=5):
+    """Best-of-repeat cost of one call in microseconds"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def report(name, value, unit='µs'):
+    print(f"  {name:<48} {value:>12.2f} {unit}")
+
+
+def sample_analyses(n, seed=0):
+    """Analysis-result-like dicts covering every risk level and card"""
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            'selected_date': date(2026, 1, 1) + timedelta(days=int(rng.integers(365))),
+            'precipitation': float(rng.uniform(0, 8)),
+            'thi': float(rng.uniform(60, 85)),
+            'wind_speed': float(rng.uniform(0, 13)),
+            'temperature': float(rng.uniform(-5, 38)),
+            'risk_level': str(rng.choice(['low', 'medium', 'high'])),
+            'location': '39.93, 32.86',
+            'analysis_period': '01.07 - 05.07'
+        }
+        for _ in range(n)
+    ]
+
+
+def _recommendations_before(event_type, analysis_data, lang_code='en'):
+    """get_event_specific_recommendations as of the baseline (518fd96), the rule table's reference
+
+    The body is copied verbatim; lang_code was a module global of the app and
+    is a parameter here. Both recommendation tables are rebuilt on every call.
+    """
+    from power_weather.risk import get_precipitation_risk_level, get_wind_risk_level
+
+    recommendations = []
+    selected_date = analysis_data['selected_date']
+    precip = analysis_data['precipitation']
+    thi = analysis_data['thi']
+    wind_speed = analysis_data['wind_speed']
+    temp = analysis_data['temperature']
+    risk_level = analysis_data['risk_level']
+    wind_risk_level = get_wind_risk_level(wind_speed)
+    precip_risk_level = get_precipitation_risk_level(precip)
+    location = analysis_data['location']
+    date_str = selected_date.strftime('%d.%m.%Y')
+    
+    # Main recommendation based on risk level
+    if risk_level == 'low':
+        recommendations.append({
+            'type': 'success',
+            'title': '✅ PERFECT CHOICE!' if lang_code == "en" else '✅ MÜKEMMEL SEÇİM!',
+            'message': f'{date_str} has low heat stress risk for {location}' if lang_code == "en" else f'{date_str} tarihi {location} için düşük ısı stresi riskine sahip',
+            'details': [
+                f'Average THI: {thi:.1f}, Precipitation: {precip:.1f} mm/day, Wind: {wind_speed:.1f} m/s on {date_str}' if lang_code == "en" else f'Ortalama THI: {thi:.1f}, Yağış: {precip:.1f} mm/gün, Rüzgar: {wind_speed:.1f} m/s {date_str} tarihinde',
+                'Ideal conditions for outdoor events' if lang_code == "en" else 'Açık hava etkinliği için ideal koşullar',
+                f'Analysis period: {analysis_data.get("analysis_period", "±2 days")}' if lang_code == "en" else f'Analiz dönemi: {analysis_data.get("analysis_period", "±2 gün")}',
+                'Data reliability: High' if lang_code == "en" else 'Veri güvenilirliği: Yüksek'
+            ]
+        })
+    elif risk_level == 'medium':
+        recommendations.append({
+            'type': 'warning',
+            'title': '⚠️ MEDIUM RISK' if lang_code == "en" else '⚠️ ORTA SEVİYE RİSK',
+            'message': f'{date_str} has moderate heat stress risk' if lang_code == "en" else f'{date_str} tarihi orta ısı stresi riski taşıyor',
+            'details': [
+                f'Average THI: {thi:.1f}, Precipitation: {precip:.1f} mm/day, Wind: {wind_speed:.1f} m/s on {date_str}' if lang_code == "en" else f'Ortalama THI: {thi:.1f}, Yağış: {precip:.1f} mm/gün, Rüzgar: {wind_speed:.1f} m/s {date_str} tarihinde',
+                'Prepare for moderate heat and humidity' if lang_code == "en" else 'Orta seviye ısı ve nem için hazırlıklı olun',
+                'Plan hydration and shaded areas' if lang_code == "en" else 'Hidrasyon ve gölgeli alanlar planlayın',
+                'Inform guests about weather conditions' if lang_code == "en" else 'Misafirleri hava durumu konusunda bilgilendirin'
+            ]
+        })
+    else:
+        recommendations.append({
+            'type': 'danger',
+            'title': '🌡️ HIGH RISK' if lang_code == "en" else '🌡️ YÜKSEK RİSK',
+            'message': f'{date_str} has high heat stress risk' if lang_code == "en" else f'{date_str} tarihi yüksek ısı stresi riski taşıyor',
+            'details': [
+                f'Average THI: {thi:.1f}, Precipitation: {precip:.1f} mm/day, Wind: {wind_speed:.1f} m/s on {date_str}' if lang_code == "en" else f'Ortalama THI: {thi:.1f}, Yağış: {precip:.1f} mm/gün, Rüzgar: {wind_speed:.1f} m/s {date_str} tarihinde',
+                'Not suitable for prolonged outdoor activities' if lang_code == "en" else 'Uzun süreli açık hava etkinlikleri için uygun değil',
+                'Consider indoor alternatives or rescheduling' if lang_code == "en" else 'Kapalı mekan alternatifi veya erteleme düşünün',
+                'High risk of heat-related issues' if lang_code == "en" else 'Isı kaynaklı sorunlar için yüksek risk'
+            ]
+        })
+    
+    # Wind-specific recommendations
+    if wind_risk_level == 'high':
+        recommendations.append({
+            'type': 'warning',
+            'title': '💨 HIGH WIND WARNING' if lang_code == "en" else '💨 YÜKSEK RÜZGAR UYARISI',
+            'message': f'High wind speed expected: {wind_speed:.1f} m/s' if lang_code == "en" else f'Yüksek rüzgar hızı bekleniyor: {wind_speed:.1f} m/s',
+            'details': [
+                'Secure loose items and decorations' if lang_code == "en" else 'Gevşek eşyaları ve dekorasyonları sabitleyin',
+                'Consider wind protection for outdoor setups' if lang_code == "en" else 'Açık hava düzenlemeleri için rüzgar koruması düşünün',
+                'Monitor weather updates for wind gusts' if lang_code == "en" else 'Rüzgar sağanakları için hava durumu güncellemelerini takip edin',
+                'Postpone activities requiring stable conditions' if lang_code == "en" else 'Sabit koşullar gerektiren aktiviteleri erteleyin'
+            ]
+        })
+    elif wind_risk_level == 'medium':
+        recommendations.append({
+            'type': 'info',
+            'title': '💨 MODERATE WIND' if lang_code == "en" else '💨 ORTA SEVİYE RÜZGAR',
+            'message': f'Moderate wind speed: {wind_speed:.1f} m/s' if lang_code == "en" else f'Orta seviye rüzgar hızı: {wind_speed:.1f} m/s',
+            'details': [
+                'Light items may be affected by wind' if lang_code == "en" else 'Hafif eşyalar rüzgardan etkilenebilir',
+                'Consider securing paper materials and light decorations' if lang_code == "en" else 'Kağıt malzemeleri ve hafif dekorasyonları sabitlemeyi düşünün',
+                'Wind may affect sound quality for outdoor speeches' if lang_code == "en" else 'Rüzgar açık hava konuşmalarında ses kalitesini etkileyebilir'
+            ]
+        })
+    
+    # Precipitation-specific recommendations
+    if precip_risk_level == 'high':
+        recommendations.append({
+            'type': 'danger',
+            'title': '🌧️ HEAVY RAIN WARNING' if lang_code == "en" else '🌧️ ŞİDDETLİ YAĞMUR UYARISI',
+            'message': f'High precipitation expected: {precip:.1f} mm/day' if lang_code == "en" else f'Yüksek yağış bekleniyor: {precip:.1f} mm/gün',
+            'details': [
+                'Postpone outdoor activities or move indoors' if lang_code == "en" else 'Açık hava aktivitelerini erteleyin veya iç mekana taşıyın',
+                'Ensure proper drainage at venue' if lang_code == "en" else 'Mekanda uygun drenaj olduğundan emin olun',
+                'Prepare for potential flooding in low areas' if lang_code == "en" else 'Alçak bölgelerde olası su baskınlarına hazırlıklı olun',
+                'Have emergency shelters ready' if lang_code == "en" else 'Acil barınaklar hazır bulundurun'
+            ]
+        })
+    elif precip_risk_level == 'medium':
+        recommendations.append({
+            'type': 'warning',
+            'title': '🌦️ LIGHT RAIN POSSIBLE' if lang_code == "en" else '🌦️ HAFİF YAĞMUR OLABİLİR',
+            'message': f'Light to moderate precipitation: {precip:.1f} mm/day' if lang_code == "en" else f'Hafif-orta şiddette yağış: {precip:.1f} mm/gün',
+            'details': [
+                'Have umbrellas and rain covers ready' if lang_code == "en" else 'Şemsiye ve yağmur örtüleri hazır bulundurun',
+                'Protect electronic equipment from moisture' if lang_code == "en" else 'Elektronik ekipmanları nemden koruyun',
+                'Consider temporary shelters or tents' if lang_code == "en" else 'Geçici barınaklar veya çadırlar düşünün',
+                'Prepare for potential schedule adjustments' if lang_code == "en" else 'Olası program değişikliklerine hazırlıklı olun'
+            ]
+        })
+    
+    # Temperature-specific recommendations
+    if temp < 10:
+        recommendations.append({
+            'type': 'warning',
+            'title': '🥶 COLD WEATHER ALERT' if lang_code == "en" else '🥶 SOĞUK HAVA UYARISI',
+            'message': f'Cold temperature expected: {temp:.1f}°C' if lang_code == "en" else f'Soğuk sıcaklık bekleniyor: {temp:.1f}°C',
+            'details': [
+                'Provide heating solutions for outdoor areas' if lang_code == "en" else 'Açık alanlar için ısıtma çözümleri sağlayın',
+                'Warm beverages and indoor warming areas recommended' if lang_code == "en" else 'Sıcak içecekler ve kapalı ısınma alanları önerilir',
+                'Inform guests to dress warmly' if lang_code == "en" else 'Misafirlere sıcak giyinmeleri konusunda bilgi verin',
+                'Consider shorter duration for outdoor activities' if lang_code == "en" else 'Açık hava aktiviteleri için daha kısa süre düşünün'
+            ]
+        })
+    elif temp > 30:
+        recommendations.append({
+            'type': 'warning',
+            'title': '🥵 HOT WEATHER ALERT' if lang_code == "en" else '🥵 SICAK HAVA UYARISI',
+            'message': f'Hot temperature expected: {temp:.1f}°C' if lang_code == "en" else f'Sıcak hava bekleniyor: {temp:.1f}°C',
+            'details': [
+                'Provide ample shaded areas and cooling stations' if lang_code == "en" else 'Bol gölgeli alanlar ve serinleme istasyonları sağlayın',
+                'Ensure proper hydration with water stations' if lang_code == "en" else 'Su istasyonları ile uygun hidrasyon sağlayın',
+                'Schedule activities during cooler morning/evening hours' if lang_code == "en" else 'Aktiviteleri daha serin sabah/akşam saatlerine planlayın',
+                'Have medical support for heat-related issues' if lang_code == "en" else 'Isı kaynaklı sorunlar için tıbbi destek hazır bulundurun'
+            ]
+        })
+
+    # GENİŞLETİLMİŞ ETKİNLİK BAZLI ÖNERİLER - EXPANDED EVENT-SPECIFIC RECOMMENDATIONS
+    event_recommendations_tr = {
+        "Düğün": {
+            "low": [
+                "Mükemmel düğün havası! Açık alanda tören için ideal koşullar",
+                "Dış mekan fotoğraf çekimi için harika fırsat",
+                "Misafirler için konforlu bir ortam sağlanacak",
+                "Açık hava resepsiyonu için yeşil ışık"
+            ],
+            "medium": [
+                "Yedek iç mekan planı yapın, hava değişebilir",
+                "Gelinlik ve takım elbise seçimlerinde hava koşullarını dikkate alın",
+                "Misafirler için şemsiye ve hafif yelek bulundurun",
+                "Fotoğraf çekimi için hem iç hem dış mekan planlayın"
+            ],
+            "high": [
+                "KESİNLİKLE iç mekan yedek planı uygulayın",
+                "Düğün programını kısaltmayı düşünün",
+                "Misafir konforu için klima/ısıtma önlemleri alın",
+                "Ulaşımda hava koşullarını dikkate alın"
+            ]
+        },
+        "Konser": {
+            "low": [
+                "Harika konser havası! Açık hava sahnesi için mükemmel",
+                "Ses kalitesi için ideal rüzgar koşulları",
+                "Seyirci konforu üst düzeyde",
+                "Uzun süreli performanslar için uygun"
+            ],
+            "medium": [
+                "Sahne ekipmanlarını koruyucu örtülerle koruyun",
+                "Ses sistemini rüzgar yönüne göre optimize edin",
+                "Seyirci alanında gölgelikler düşünün",
+                "Elektrik güvenliği için ek önlemler alın"
+            ],
+            "high": [
+                "Konseri iptal etmeyi veya kapalı mekana taşımayı düşünün",
+                "Elektrikli ekipmanları yağmurdan koruyun",
+                "Seyirci güvenliği için acil tahliye planı hazırlayın",
+                "Kısa program ve erken bitiş planlayın"
+            ]
+        },
+        "Festival": {
+            "low": [
+                "Festival için mükemmel hava koşulları!",
+                "Tüm gün açık hava etkinlikleri için uygun",
+                "Yiyecek-içecek stantları için ideal",
+                "Katılımın yüksek olması beklenir"
+            ],
+            "medium": [
+                "Çadır alanları için su geçirmez zemin hazırlayın",
+                "Acil yağmur planı oluşturun",
+                "Elektrik hatlarını yalıtımlı koruyun",
+                "İlk yardım istasyonlarını artırın"
+            ],
+            "high": [
+                "Festivali ertelemeyi ciddi olarak düşünün",
+                "Tüm açık hava aktivitelerini iptal edin",
+                "Güvenlik ekibini artırın",
+                "Acildurum iletişim planını devreye alın"
+            ]
+        },
+        "Spor Etkinliği": {
+            "low": [
+                "Spor müsabakaları için ideal koşullar",
+                "Atlet performansı maksimum düzeyde",
+                "Seyirci konforu üst düzeyde",
+                "Uzun süreli müsabakalar için uygun"
+            ],
+            "medium": [
+                "Saha durumunu sürekli kontrol edin",
+                "Molaları sıklaştırın",
+                "Seyirciler için ek su istasyonları kurun",
+                "Hava durumuna göre program esnekliği sağlayın"
+            ],
+            "high": [
+                "Müsabakayı erteleyin veya iptal edin",
+                "Atlet sağlığını ön planda tutun",
+                "Seyirci güvenliği için önlemleri artırın",
+                "Alternatif kapalı mekan planı uygulayın"
+            ]
+        },
+        "Açık Hava Partisi": {
+            "low": [
+                "Parti için mükemmel hava! Tüm planlar uygulanabilir",
+                "Dış mekan dekorasyonları için ideal",
+                "Misafirler rahatça sosyalleşebilir",
+                "Gece saatlerine kadar parti devam edebilir"
+            ],
+            "medium": [
+                "Yedek çadır veya şemsiye bulundurun",
+                "Müzik ekipmanlarını koruyucu örtülerle koruyun",
+                "Hafif yiyecekler tercih edin",
+                "Misafir sayısını sınırlamayı düşünün"
+            ],
+            "high": [
+                "Partiyi kapalı mekana taşıyın",
+                "Kısa süreli bir program planlayın",
+                "Misafirleri önceden bilgilendirin",
+                "Alternatif tarih önerin"
+            ]
+        },
+        "Piknik": {
+            "low": [
+                "Harika piknik havası! Doğayla iç içe keyifli vakit",
+                "Açık ateş için uygun koşullar",
+                "Uzun süreli açık hava aktiviteleri mümkün",
+                "Fotoğraf çekimi için mükemmel ışık"
+            ],
+            "medium": [
+                "Piknik alanı seçerken yüksek ve korunaklı yerleri tercih edin",
+                "Yiyecekleri kapalı kaplarda saklayın",
+                "Acil durum çadırı bulundurun",
+                "Programı esnek tutun"
+            ],
+            "high": [
+                "Pikniği iptal edin veya kapalı mekana taşıyın",
+                "Açık ateş kesinlikle yakmayın",
+                "Islak zeminde kayma riskine karşı dikkatli olun",
+                "Alternatif aktivite planlayın"
+            ]
+        },
+        "İş Toplantısı": {
+            "low": [
+                "Verimli bir açık hava toplantısı için ideal koşullar",
+                "Doğal ortamda yaratıcı fikirler geliştirme fırsatı",
+                "Katılımcı motivasyonu yüksek olacak",
+                "Uzun süreli oturumlar için uygun"
+            ],
+            "medium": [
+                "Yedek kapalı mekan ayarlayın",
+                "Elektronik cihazları koruyucu önlemler alın",
+                "Sunum ekipmanlarını yedekleyin",
+                "Toplantı süresini optimize edin"
+            ],
+            "high": [
+                "Toplantıyı kesinlikle kapalı mekana alın",
+                "Video konferans alternatifi sunun",
+                "Katılımcı ulaşımını yeniden planlayın",
+                "Toplantıyı ertelemeyi düşünün"
+            ]
+        },
+        "Diğer": {
+            "low": ["Mükemmel koşullar - planlarınızı güvenle uygulayın"],
+            "medium": ["Dikkatli olun - yedek planlar yapın"],
+            "high": ["Riskli koşullar - alternatif plan uygulayın"]
+        }
+    }
+
+    event_recommendations_en = {
+        "Wedding": {
+            "low": [
+                "Perfect wedding weather! Ideal conditions for outdoor ceremony",
+                "Great opportunity for outdoor photography",
+                "Comfortable environment for guests",
+                "Green light for outdoor reception"
+            ],
+            "medium": [
+                "Have an indoor backup plan, weather may change",
+                "Consider weather conditions for dress and suit selections",
+                "Have umbrellas and light jackets available for guests",
+                "Plan both indoor and outdoor photography options"
+            ],
+            "high": [
+                "DEFINITELY implement indoor backup plan",
+                "Consider shortening the wedding program",
+                "Take air conditioning/heating measures for guest comfort",
+                "Consider transportation weather conditions"
+            ]
+        },
+        "Concert": {
+            "low": [
+                "Great concert weather! Perfect for outdoor stage",
+                "Ideal wind conditions for sound quality",
+                "Maximum audience comfort",
+                "Suitable for long performances"
+            ],
+            "medium": [
+                "Protect stage equipment with protective covers",
+                "Optimize sound system according to wind direction",
+                "Consider shades in audience area",
+                "Take extra electrical safety measures"
+            ],
+            "high": [
+                "Consider canceling concert or moving indoors",
+                "Protect electrical equipment from rain",
+                "Prepare emergency evacuation plan for audience safety",
+                "Plan shorter program and early ending"
+            ]
+        },
+        "Festival": {
+            "low": [
+                "Perfect weather conditions for festival!",
+                "Suitable for all-day outdoor activities",
+                "Ideal for food and beverage stands",
+                "High attendance expected"
+            ],
+            "medium": [
+                "Prepare waterproof flooring for tent areas",
+                "Create emergency rain plan",
+                "Protect electrical lines with insulation",
+                "Increase first aid stations"
+            ],
+            "high": [
+                "Seriously consider postponing the festival",
+                "Cancel all outdoor activities",
+                "Increase security team",
+                "Activate emergency communication plan"
+            ]
+        },
+        "Sports Event": {
+            "low": [
+                "Ideal conditions for sports competitions",
+                "Maximum athlete performance",
+                "Maximum spectator comfort",
+                "Suitable for long competitions"
+            ],
+            "medium": [
+                "Continuously monitor field conditions",
+                "Increase break frequency",
+                "Set up additional water stations for spectators",
+                "Provide schedule flexibility based on weather"
+            ],
+            "high": [
+                "Postpone or cancel the competition",
+                "Prioritize athlete health",
+                "Increase spectator safety measures",
+                "Implement alternative indoor venue plan"
+            ]
+        },
+        "Outdoor Party": {
+            "low": [
+                "Perfect party weather! All plans can be implemented",
+                "Ideal for outdoor decorations",
+                "Guests can socialize comfortably",
+                "Party can continue until night hours"
+            ],
+            "medium": [
+                "Have backup tents or umbrellas",
+                "Protect music equipment with covers",
+                "Prefer light foods",
+                "Consider limiting number of guests"
+            ],
+            "high": [
+                "Move party indoors",
+                "Plan short-term program",
+                "Inform guests in advance",
+                "Suggest alternative date"
+            ]
+        },
+        "Picnic": {
+            "low": [
+                "Great picnic weather! Enjoyable time in nature",
+                "Suitable conditions for open fire",
+                "Long-term outdoor activities possible",
+                "Perfect lighting for photography"
+            ],
+            "medium": [
+                "Choose high and protected areas for picnic location",
+                "Store food in closed containers",
+                "Have emergency tent available",
+                "Keep schedule flexible"
+            ],
+            "high": [
+                "Cancel picnic or move indoors",
+                "Absolutely no open fire",
+                "Be careful of slipping risk on wet ground",
+                "Plan alternative activity"
+            ]
+        },
+        "Business Meeting": {
+            "low": [
+                "Ideal conditions for productive outdoor meeting",
+                "Opportunity to develop creative ideas in natural environment",
+                "High participant motivation",
+                "Suitable for long sessions"
+            ],
+            "medium": [
+                "Arrange backup indoor venue",
+                "Take protective measures for electronic devices",
+                "Backup presentation equipment",
+                "Optimize meeting duration"
+            ],
+            "high": [
+                "Definitely move meeting indoors",
+                "Offer video conference alternative",
+                "Replan participant transportation",
+                "Consider postponing meeting"
+            ]
+        },
+        "Other": {
+            "low": ["Perfect conditions - implement your plans with confidence"],
+            "medium": ["Be careful - make backup plans"],
+            "high": ["Risky conditions - implement alternative plan"]
+        }
+    }
+
+    # Add event-specific recommendations based on language
+    event_recommendations = event_recommendations_tr if lang_code == "tr" else event_recommendations_en
+    
+    # Map event type names between languages
+    event_type_mapping = {
+        "tr": {
+            "Düğün": "Düğün", "Konser": "Konser", "Spor Etkinliği": "Spor Etkinliği",
+            "Festival": "Festival", "Açık Hava Partisi": "Açık Hava Partisi",
+            "Piknik": "Piknik", "İş Toplantısı": "İş Toplantısı", "Diğer": "Diğer"
+        },
+        "en": {
+            "Wedding": "Wedding", "Concert": "Concert", "Sports Event": "Sports Event",
+            "Festival": "Festival", "Outdoor Party": "Outdoor Party",
+            "Picnic": "Picnic", "Business Meeting": "Business Meeting", "Other": "Other"
+        }
+    }
+    
+    current_event_type = event_type_mapping[lang_code].get(event_type, "Other")
+    
+    if current_event_type in event_recommendations:
+        event_recs = event_recommendations[current_event_type][risk_level]
+        recommendations.append({
+            'type': 'info',
+            'title': f'🎪 {current_event_type.upper()} { "ÖZEL ÖNERİLER" if lang_code == "tr" else "SPECIFIC RECOMMENDATIONS"}',
+            'message': f'{current_event_type} için {risk_level} risk seviyesine göre öneriler:' if lang_code == "tr" else f'Recommendations for {current_event_type} at {risk_level} risk level:',
+            'details': event_recs
+        })
+    
+    return recommendations
+
+
+@benchmark
+def bench_recommendations():
+    from power_weather.recommendations import EVENT_TYPES, get_event_specific_recommendations, recommendation_titles
+
+    analyses = sample_analyses(1000)
+    for lang in ('en', 'tr'):
+        # The baseline only knew the labels of the current language
+        events = [EVENT_TYPES[lang][i % len(EVENT_TYPES[lang])] for i in range(len(analyses))]
+        before = per_call_us(
+            lambda: [_recommendations_before(e, a, lang_code=lang) for e, a in zip(events, analyses)],
+            number=5
+        ) / len(analyses)
+        after = per_call_us(
+            lambda: [get_event_specific_recommendations(e, a, lang=lang) for e, a in zip(events, analyses)],
+            number=5
+        ) / len(analyses)
+        report(f"get_event_specific_recommendations ({lang}) per call, before", before)
+        report(f"get_event_specific_recommendations ({lang}) per call, after", after)
+        for e, a in zip(events, analyses):
+            assert get_event_specific_recommendations(e, a, lang=lang) == _recommendations_before(e, a, lang_code=lang), \
+                "rule table output differs from the original builder"
+
+    n_rows = 100_000
+    index = np.arange(n_rows) % len(analyses)
+    columns = {
+        key: np.array([a[key] for a in analyses], dtype=object if key == 'risk_level' else float)[index]
+        for key in ('risk_level', 'wind_speed', 'precipitation', 'temperature')
+    }
+    row_events = np.array(events, dtype=object)[index]
+    recommendation_titles(columns['risk_level'][:1], columns['wind_speed'][:1], columns['precipitation'][:1])
+    cost = per_call_us(
+        lambda: recommendation_titles(columns['risk_level'], columns['wind_speed'], columns['precipitation'],
+                                      columns['temperature'], row_events),
+        number=1, repeat=3
+    ) / n_rows
+    report(f"recommendation_titles per row ({n_rows} rows)", cost)
+
+
+def sample_series(n_years=20, seed=0):
+    """Synthetic DailySeries with NaN gaps, shaped like a POWER download"""
+    from power_weather.climatology import CLIMATOLOGY_PARAMETERS, DailySeries
+
+    rng = np.random.default_rng(seed)
+    n_days = int((np.datetime64(f'{2000 + n_years}-01-01') - np.datetime64('2000-01-01')).astype(np.int64))
+    values = np.vstack([
+        rng.gamma(0.6, 4.0, n_days),
+        rng.normal(14, 8, n_days),
+        rng.uniform(30, 95, n_days),
+        rng.gamma(2.0, 1.6, n_days),
+    ]).astype(np.float32)
+    values[:, rng.integers(n_days, size=n_days // 200)] = np.nan
+    return DailySeries.with_derived(CLIMATOLOGY_PARAMETERS, values, '2000-01-01')
+
+
+def sample_power_json(n_years=20, parameters=('T2M', 'T2M_MAX', 'T2M_MIN', 'PRECTOTCORR', 'RH2M', 'WS2M', 'ALLSKY_SFC_SW_DWN'),
+                      seed=0):
+    """POWER daily point response over n_years with a few -999 fill values"""
+    rng = np.random.default_rng(seed)
+    dates = np.arange(np.datetime64('2000-01-01'), np.datetime64(f'{2000 + n_years}-01-01'))
+    keys = [str(d).replace('-', '') for d in dates]
+    columns = {}
+    for name in parameters:
+        values = np.round(rng.normal(15, 8, len(keys)), 2)
+        values[rng.integers(len(keys), size=len(keys) // 500)] = -999.0
+        columns[name] = dict(zip(keys, values.tolist()))
+    return {'properties': {'parameter': columns}}
+
+
+def _parse_daily_loop(raw_data):
+    """The per-value strptime parser daily_frame replaced, kept as the baseline"""
+    from datetime import datetime
+
+    import pandas as pd
+
+    dfs = []
+    for param_name, param_data in raw_data['properties']['parameter'].items():
+        dates = []
+        values = []
+        for date_str, value in param_data.items():
+            dates.append(datetime.strptime(date_str, '%Y%m%d'))
+            values.append(value)
+        dfs.append(pd.DataFrame({'date': dates, 'parameter': param_name, 'value': values}))
+    return pd.concat(dfs, ignore_index=True)
+
+
+@benchmark
+def bench_parse_daily():
+    from power_weather.power import daily_frame, long_frame
+
+    data = sample_power_json(20)
+    n_values = sum(len(column) for column in data['properties']['parameter'].values())
+    loop = per_call_us(lambda: _parse_daily_loop(data), number=1, repeat=3)
+    wide = per_call_us(lambda: daily_frame(data), number=3, repeat=5)
+    frame = daily_frame(data)
+    to_long = per_call_us(lambda: long_frame(frame), number=3, repeat=5)
+    report(f"strptime loop, long format ({n_values} values)", loop / 1e3, 'ms')
+    report("daily_frame, wide format", wide / 1e3, 'ms')
+    report("long_frame on demand", to_long / 1e3, 'ms')
+    report("speedup (wide)", loop / wide, 'x')
+
+    # Same values, with the -999 fill values turned into NaN
+    expected = _parse_daily_loop(data).pivot(index='date', columns='parameter', values='value')
+    expected = expected.where(expected > -999)[list(frame.columns)]
+    assert np.allclose(frame.to_numpy(), expected.to_numpy(), equal_nan=True)
+    assert (frame.index == expected.index).all()
+
+
+def power_csv_text(data):
+    """The same values in POWER's CSV output layout"""
+    columns = data['properties']['parameter']
+    names = list(columns)
+    keys = list(columns[names[0]])
+    lines = ['-BEGIN HEADER-', 'NASA/POWER Daily Data (benchmark fixture)', '-END HEADER-',
+             ','.join(['YEAR', 'MO', 'DY'] + names)]
+    lines += [
+        ','.join([key[:4], str(int(key[4:6])), str(int(key[6:]))] + [str(columns[name][key]) for name in names])
+        for key in keys
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+@benchmark
+def bench_decode():
+    import json
+
+    from power_weather import decode
+
+    data = sample_power_json(20)
+    payload = json.dumps(data).encode('utf-8')
+    csv_payload = power_csv_text(data).encode('utf-8')
+    report(f"JSON payload ({len(data['properties']['parameter'])} parameters, 20 years)", len(payload) / 2**20, 'MB')
+    report("CSV payload", len(csv_payload) / 2**20, 'MB')
+
+    paths = [
+        ("stdlib json.loads", lambda: json.loads(payload.decode('utf-8'))),
+        ("stdlib json + power_arrays", lambda: decode.power_arrays(json.loads(payload))),
+    ]
+    if decode.orjson is not None:
+        paths += [
+            ("orjson.loads", lambda: decode.orjson.loads(payload)),
+            ("orjson + power_arrays", lambda: decode.power_arrays(decode.orjson.loads(payload))),
+        ]
+    else:
+        print("  (orjson not installed, fast JSON path skipped)")
+    paths.append(("CSV power_csv_arrays", lambda: decode.power_csv_arrays(csv_payload)))
+    for name, func in paths:
+        report(f"{name} time", per_call_us(func, number=1, repeat=5) / 1e3, 'ms')
+        report(f"{name} peak memory", peak_mb(func), 'MB')
+
+    # Both formats decode to the same arrays
+    json_dates, json_columns = decode.power_arrays(json.loads(payload))
+    csv_dates, csv_columns = decode.power_csv_arrays(csv_payload)
+    assert (json_dates == csv_dates).all()
+    assert all(np.allclose(json_columns[k], csv_columns[k], equal_nan=True) for k in json_columns)
+
+
+@benchmark
+def bench_downsample():
+    import plotly.graph_objects as go
+
+    from power_weather.downsample import MAX_POINTS, METHODS, downsample
+    from power_weather.power import daily_frame
+
+    frame = daily_frame(sample_power_json(40))
+    columns = list(frame.columns)
+    for method in METHODS:
+        cost = per_call_us(lambda: downsample(frame.index.values, frame[columns[0]].to_numpy(), MAX_POINTS, method),
+                           number=3, repeat=5)
+        report(f"{method}, {len(frame)} days -> {MAX_POINTS} points", cost / 1e3, 'ms')
+
+    # What the browser receives and has to draw, full resolution vs downsampled
+    def figure_json(days, reduce):
+        visible = frame.iloc[-days:]
+        fig = go.Figure()
+        for name in columns:
+            x, y = visible.index.values, visible[name].to_numpy()
+            if reduce:
+                x, y = downsample(x, y, MAX_POINTS)
+            fig.add_trace(go.Scattergl(x=x, y=y, mode='lines', name=name))
+        return fig.to_json()
+
+    for years in (1, 10, 40):
+        days = min(years * 365, len(frame))
+        full = per_call_us(lambda: figure_json(days, False), number=1, repeat=5)
+        reduced = per_call_us(lambda: figure_json(days, True), number=1, repeat=5)
+        report(f"{years:>2} years x {len(columns)} params, full figure build", full / 1e3, 'ms')
+        report(f"{years:>2} years x {len(columns)} params, downsampled build", reduced / 1e3, 'ms')
+        report(f"{years:>2} years payload full / downsampled",
+               len(figure_json(days, False)) / max(len(figure_json(days, True)), 1), 'x')
+        # Downsampling must never cost more than drawing everything (10% allowed for timing noise)
+        if days > MAX_POINTS:
+            assert reduced <= 1.1 * full, f"downsampled {years}-year figure builds slower than the full one"
+
+    # Extremes survive min/max bucketing
+    y = frame[columns[0]].to_numpy()
+    _, reduced = downsample(frame.index.values, y, MAX_POINTS, 'minmax')
+    assert np.nanmax(y) == reduced.max() and np.nanmin(y) == reduced.min()
+
+
+@benchmark
+def bench_archive():
+    import json
+    import os
+    import tempfile
+    from datetime import date
+
+    from power_weather.archive import SeriesArchive
+    from power_weather.climatology import CLIMATOLOGY_PARAMETERS, DailySeries
+
+    series = sample_series(n_years=20)
+    payload = json.dumps(sample_power_json(20, CLIMATOLOGY_PARAMETERS)).encode('utf-8')
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = SeriesArchive(tmp)
+        cell_id = 'r260c341'
+        columns = {name: series[name] for name in CLIMATOLOGY_PARAMETERS}
+        write = per_call_us(lambda: archive.write(cell_id, series.start, columns), number=3, repeat=3)
+        report("write 20 years x 4 parameters", write / 1e3, 'ms')
+        npz_path = os.path.join(tmp, 'series.npz')
+        series.to_npz(npz_path)
+
+        report("value(T2M, 2015-06-03)", per_call_us(lambda: archive.value(cell_id, 'T2M', '2015-06-03')))
+        report("read(T2M, 7-day window)", per_call_us(lambda: archive.read(cell_id, 'T2M', '2015-06-01', '2015-06-07')))
+        report("value() peak allocation", peak_mb(lambda: archive.value(cell_id, 'T2M', '2015-06-03')) * 2**10, 'KB')
+
+        start, end = date(2000, 1, 1), date(2019, 12, 31)
+        from_archive = per_call_us(lambda: DailySeries.with_derived(
+            CLIMATOLOGY_PARAMETERS,
+            np.vstack(list(archive.read_columns(cell_id, CLIMATOLOGY_PARAMETERS, start, end).values())), start
+        ), number=20, repeat=5)
+        report("full series from archive", from_archive / 1e3, 'ms')
+        report("full series from .npz", per_call_us(lambda: DailySeries.from_npz(npz_path), number=20, repeat=5) / 1e3, 'ms')
+        report("full series from POWER JSON", per_call_us(lambda: DailySeries.from_power_json(payload), number=3, repeat=5) / 1e3, 'ms')
+
+        # Out-of-order append: the gap stays unarchived, the index tells it apart
+        archive.write(cell_id, np.datetime64('1985-01-01'), {'T2M': np.ones(10)})
+        assert archive.covers(cell_id, ['T2M'], date(1985, 1, 1), date(1985, 1, 10))
+        assert not archive.covers(cell_id, ['T2M'], date(1985, 1, 1), date(1985, 1, 11))
+        assert np.isnan(archive.value(cell_id, 'T2M', '1990-01-01'))
+        assert archive.value(cell_id, 'T2M', '2015-06-03') == series['T2M'][(np.datetime64('2015-06-03') - series.start).astype(np.int64)]
+
+
+@benchmark
+def bench_bulk_report():
+    import os
+    import tempfile
+
+    from power_weather.bulk_report import write_bulk_report
+
+    def rows(n):
+        return [
+            {'venue': f"Venue {i}", 'date': analysis['selected_date'], 'event_type': 'Wedding', **analysis}
+            for i, analysis in enumerate(sample_analyses(n))
+        ]
+
+    peaks = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in (200, 800):
+            for pages_per_file in (None, 20):
+                source = rows(n)
+                output = os.path.join(tmp, f"report-{n}-{pages_per_file}.pdf")
+                peaks[n, pages_per_file] = peak_mb(lambda: write_bulk_report(source, output, charts=True, pages_per_file=pages_per_file))
+                report(f"peak, {n} rows with charts, " + (f"{pages_per_file} pages/file" if pages_per_file else "one file"),
+                       peaks[n, pages_per_file], 'MB')
+    # One canvas keeps every page until save(); split files keep memory flat
+    assert peaks[800, 20] < 1.5 * peaks[200, 20], "split report memory grows with the row count"
+
+
+@benchmark
+def bench_columnar():
+    import os
+    import tempfile
+
+    import pandas as pd
+    import pyarrow as pa
+
+    from power_weather.columnar import FORMATS, read_series_dataset, series_batch, write_series_dataset
+
+    cells = [(f"r{200 + i:03d}c{300 + i:03d}", sample_series(seed=i)) for i in range(20)]
+    expected = pa.Table.from_batches([series_batch(series, cell_id) for cell_id, series in cells])
+    expected = expected.sort_by([('cell_id', 'ascending'), ('date', 'ascending')])
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'series.csv')
+        started = timeit.default_timer()
+        expected.to_pandas().to_csv(csv_path, index=False)
+        report(f"CSV write ({expected.num_rows} rows)", (timeit.default_timer() - started) * 1e3, 'ms')
+        started = timeit.default_timer()
+        pd.read_csv(csv_path, parse_dates=['date'])
+        report("CSV read", (timeit.default_timer() - started) * 1e3, 'ms')
+        report("CSV size", os.path.getsize(csv_path) / 2**20, 'MB')
+
+        for fmt in FORMATS:
+            directory = os.path.join(tmp, fmt)
+            started = timeit.default_timer()
+            write_series_dataset(cells, directory, fmt)
+            report(f"{fmt} dataset write", (timeit.default_timer() - started) * 1e3, 'ms')
+            started = timeit.default_timer()
+            read_series_dataset(directory, fmt)
+            report(f"{fmt} dataset read", (timeit.default_timer() - started) * 1e3, 'ms')
+            size = sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(directory) for f in files)
+            report(f"{fmt} dataset size", size / 2**20, 'MB')
+
+            started = timeit.default_timer()
+            read_series_dataset(directory, fmt, cell_ids=[cells[0][0]], start=date(2010, 3, 1), end=date(2011, 2, 28))
+            report(f"{fmt} one cell, one year", (timeit.default_timer() - started) * 1e3, 'ms')
+
+
+@benchmark
+def bench_ingest():
+    import json
+    import tempfile
+    from datetime import date
+
+    from power_weather.archive import SeriesArchive
+    from power_weather.decode import power_arrays, regional_arrays
+    from power_weather.grid import grid_cell
+    from power_weather.ingest import archive_regional
+
+    # One 10° x 10° tile (21 x 17 grid cells), one parameter, one year: a single regional request
+    features = [
+        {'type': 'Feature', 'geometry': {'type': 'Point', 'coordinates': [26.25 + 0.625 * j, 35.5 + 0.5 * i, 0.0]},
+         'properties': sample_power_json(1, ('T2M',), seed=i * 17 + j)['properties']}
+        for i in range(21) for j in range(17)
+    ]
+    payload = json.dumps({'type': 'FeatureCollection', 'features': features}).encode('utf-8')
+    report(f"regional_arrays ({len(features)} cells)", per_call_us(lambda: regional_arrays(payload), number=3, repeat=3) / 1e3, 'ms')
+    report("power_arrays per cell", per_call_us(lambda: [power_arrays(f) for f in features], number=3, repeat=3) / 1e3, 'ms')
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = SeriesArchive(tmp)
+        report("decode + archive tile", per_call_us(lambda: archive_regional(payload, archive), number=3, repeat=3) / 1e3, 'ms')
+        feature = features[-1]
+        lon, lat = feature['geometry']['coordinates'][:2]
+        _, expected = power_arrays(feature)
+        stored = archive.read_filled(grid_cell(lat, lon).cell_id, 'T2M', date(2000, 1, 1), date(2000, 12, 31))
+        assert np.array_equal(stored, expected['T2M'].astype(np.float32), equal_nan=True), "regional ingest differs"
+
+
+@benchmark
+def bench_heatmap():
+    import os
+    import tempfile
+
+    from power_weather.archive import SeriesArchive
+    from power_weather.climatology import CLIMATOLOGY_PARAMETERS, day_of_year_means
+    import folium
+
+    from power_weather.heatmap import LAYERS, build_heatmap, heatmap_overlays, overlay_codes, overlay_colour, risk_layers
+    from power_weather.risk import thi_risk_codes
+
+    series = [sample_series(n_years=10, seed=seed) for seed in range(4)]
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = SeriesArchive(os.path.join(tmp, 'archive'))
+        # Every grid cell of the Türkiye box (15 x 32), four distinct series repeated
+        for row in range(251, 266):
+            for col in range(329, 361):
+                cell = series[(row + col) % 4]
+                archive.write(f"r{row:03d}c{col:03d}", cell.start, {name: cell[name] for name in CLIMATOLOGY_PARAMETERS})
+        output = os.path.join(tmp, 'heatmap')
+        started = timeit.default_timer()
+        metadata = build_heatmap(directory=output, archive=archive, start=date(2000, 1, 1), end=date(2009, 12, 31))
+        report(f"build ({metadata['cells']} cells, {len(LAYERS)} layers x 365 days)", timeit.default_timer() - started, 's')
+        size = sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(output) for f in files)
+        report("heatmap size", size / 2**10, 'KB')
+
+        # What the app pays per map draw: one Mercator-projected overlay per layer
+        _, paths = heatmap_overlays(date(2026, 6, 1), output)
+        overlays = per_call_us(lambda: [
+            folium.raster_layers.ImageOverlay(overlay_codes(path), bounds=metadata['bounds'], colormap=overlay_colour,
+                                              mercator_project=True, pixelated=True)
+            for path in paths.values()
+        ], number=5, repeat=3)
+        report(f"map overlays ({len(paths)} layers, Mercator projected)", overlays / 1e3, 'ms')
+
+    # The batched kernel gives the same codes as per-cell day_of_year_means
+    target_days = np.arange(np.datetime64('2001-01-01'), np.datetime64('2002-01-01'))
+    codes = risk_layers(np.stack([s.values for s in series]), series[0].doy)['thi']
+    for i, s in enumerate(series):
+        expected = thi_risk_codes(day_of_year_means(s, target_days)[s.parameters.index('THI')])
+        assert np.array_equal(codes[i], expected), "heatmap THI codes differ"
+
+
+@benchmark
+def bench_best_dates():
+    from power_weather.best_dates import RISK_DIMENSIONS, day_of_year_table, rank_event_days
+    from power_weather.climatology import day_of_year, day_of_year_climatology
+
+    series = sample_series(n_years=10)
+    start = date(2026, 3, 1)
+    end = start + timedelta(days=179)
+    days = [start + timedelta(days=i) for i in range(180)]
+
+    # The per-day alternative: one day_of_year_climatology call for each day of the window
+    per_day = per_call_us(lambda: [day_of_year_climatology(series, day) for day in days], number=1, repeat=3)
+    report("180 days, day_of_year_climatology per day", per_day / 1e3, 'ms')
+
+    def cold():
+        series.__dict__.pop('_doy_tables', None)
+        return rank_event_days(series, start, end, 'Wedding')
+
+    cold_scan = per_call_us(cold, number=1, repeat=5)
+    warm_scan = per_call_us(lambda: rank_event_days(series, start, end, 'Wedding'), number=20, repeat=5)
+    report("180-day scan, day-of-year table built", cold_scan / 1e3, 'ms')
+    report("180-day scan, table cached", warm_scan / 1e3, 'ms')
+    assert warm_scan < per_day, "cached 180-day scan is slower than per-day climatology"
+
+    # The table holds the same medians as the per-day climatology
+    table = day_of_year_table(series)
+    for day in days[::30]:
+        stats = day_of_year_climatology(series, day, percentiles=(50,))['parameters']
+        doy = int(day_of_year(np.datetime64(day, 'D')))
+        for dimension, (parameter, _) in RISK_DIMENSIONS.items():
+            assert np.isclose(table[f'{dimension}_p50'][doy], stats[parameter]['percentiles'][50], rtol=1e-6)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('names', nargs='*', help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark: {', '.join(unknown)}")
+    for name in args.names or BENCHMARKS:
+        print(name)
+        BENCHMARKS[name]()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,20 @@
+import functools
 import streamlit as st
 import pandas as pd
-import requests
 from datetime import datetime, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
+from power_weather.cache import get_response_cache
+from power_weather.client import http_get
+from power_weather.columnar import frame_bytes
+from power_weather.decode import decode_json
+from power_weather.downsample import MAX_POINTS, METHODS, downsample
+from power_weather.grid import grid_cell
+from power_weather.power import DAILY_URL, daily_frame, fetch_nasa_power_daily, long_frame
+from power_weather.ranges import fetch_chunks, merge_power_json, split_range
+
+# Uzun günlük aralıklar yıllık parçalara bölünüp bu kadar paralel istekle çekilir
+RANGE_WORKERS = 4
 
 st.set_page_config(
     page_title="NASA POWER API Test",
@@ -81,31 +92,82 @@ st.markdown("""
 st.markdown('<div class="main-header"><h1>🔬 NASA POWER API TEST UYGULAMASI</h1><p>Enlem-Boylam ile Gerçek Hava Verilerini Çekin</p></div>', unsafe_allow_html=True)
 
 # NASA POWER API fonksiyonları
+DAILY_PARAMETERS = 'T2M,T2M_MAX,T2M_MIN,PRECTOTCORR,RH2M,WS2M,ALLSKY_SFC_SW_DWN'
+
+def get_nasa_power_daily_range(lat, lon, start_date, end_date):
+    """Günlük veriyi yıllık parçalar halinde paralel çeker, ilerlemeyi gösterir ve sırayla birleştirir"""
+    cell = grid_cell(lat, lon)
+    chunks = split_range(start_date, end_date)
+    st.info(f"🌍 NASA POWER API'ye {len(chunks)} parça halinde istek gönderiliyor...")
+    
+    with st.expander("🔧 API İstek Detayları"):
+        st.write(f"**URL:** `{DAILY_URL}`")
+        st.write(f"**Izgara Hücresi:** `{cell.cell_id}` ({cell.lat:.3f}°, {cell.lon:.3f}°)")
+        st.write(f"**Parametreler:** `{DAILY_PARAMETERS}`")
+        st.write(f"**Parçalar:** {len(chunks)} (en fazla {RANGE_WORKERS} paralel istek)")
+    
+    progress_bar = st.progress(0.0, text="Parçalar çekiliyor...")
+    
+    def show_progress(done, total, chunk, part):
+        mark = "✅" if part else "❌"
+        progress_bar.progress(
+            done / total,
+            text=f"{mark} {chunk[0].strftime('%d.%m.%Y')} - {chunk[1].strftime('%d.%m.%Y')} ({done}/{total})"
+        )
+    
+    # Parçalar ana uygulamayla aynı yoldan gelir (arşiv -> önbellek -> API) ve aynı önbellek anahtarını kullanır
+    parts = fetch_chunks(functools.partial(fetch_nasa_power_daily, lat, lon, parameters=DAILY_PARAMETERS), chunks,
+                         max_workers=RANGE_WORKERS, progress=show_progress)
+    data = merge_power_json([part['data'] for part in parts if part])
+    if data is None:
+        return {
+            'status': 'error',
+            'data': None,
+            'message': 'Hiçbir tarih parçası alınamadı (bağlantı veya API hatası)'
+        }
+    
+    failed = [chunk for chunk, part in zip(chunks, parts) if part is None]
+    from_cache = sum(1 for part in parts if part and part['cached'])
+    message = f"{len(chunks) - len(failed)}/{len(chunks)} parça çekildi ({from_cache} önbellekten)"
+    if failed:
+        missing = ', '.join(f"{a.strftime('%d.%m.%Y')}-{b.strftime('%d.%m.%Y')}" for a, b in failed)
+        st.warning(f"⚠️ Alınamayan parçalar: {missing}")
+        message += f"; eksik: {missing}"
+    return {
+        'status': 'success',
+        'data': data,
+        'message': message
+    }
+
 def get_nasa_power_data(lat, lon, start_date, end_date, data_type="daily"):
     """
     NASA POWER API'den veri çeker
     """
     if data_type == "daily":
-        url = "https://power.larc.nasa.gov/api/temporal/daily/point"
-        params = {
-            'parameters': 'T2M,T2M_MAX,T2M_MIN,PRECTOTCORR,RH2M,WS2M,ALLSKY_SFC_SW_DWN',
-            'community': 'RE',
-            'longitude': lon,
-            'latitude': lat,
-            'start': start_date.strftime("%Y%m%d"),
-            'end': end_date.strftime("%Y%m%d"),
-            'format': 'JSON'
-        }
-    else:
-        url = "https://power.larc.nasa.gov/api/temporal/climatology/point"
-        params = {
-            'parameters': 'T2M,PRECTOTCORR,RH2M,WS2M',
-            'community': 'RE',
-            'longitude': lon,
-            'latitude': lat,
-            'start': start_date,
-            'end': end_date,
-            'format': 'JSON'
+        return get_nasa_power_daily_range(lat, lon, start_date, end_date)
+    
+    # Koordinatı POWER ızgara hücresine oturt; aynı hücredeki tüm noktalar aynı veriyi paylaşır
+    cell = grid_cell(lat, lon)
+    url = "https://power.larc.nasa.gov/api/temporal/climatology/point"
+    params = {
+        'parameters': 'T2M,PRECTOTCORR,RH2M,WS2M',
+        'community': 'RE',
+        'longitude': cell.lon,
+        'latitude': cell.lat,
+        'start': start_date,
+        'end': end_date,
+        'format': 'JSON'
+    }
+    
+    cache = get_response_cache()
+    cache_key = cache.make_key(data_type, lat, lon, params['parameters'], params['start'], params['end'])
+    cached = cache.get(cache_key)
+    if cached is not None:
+        st.success(f"⚡ Veriler önbellekten alındı (hücre {cell.cell_id})")
+        return {
+            'status': 'success',
+            'data': cached,
+            'message': 'Veri önbellekten yüklendi'
         }
     
     try:
@@ -113,15 +175,17 @@ def get_nasa_power_data(lat, lon, start_date, end_date, data_type="daily"):
         
         with st.expander("🔧 API İstek Detayları"):
             st.write(f"**URL:** `{url}`")
+            st.write(f"**Izgara Hücresi:** `{cell.cell_id}` ({cell.lat:.3f}°, {cell.lon:.3f}°)")
             st.write(f"**Parametreler:**")
             st.json(params)
         
-        response = requests.get(url, params=params, timeout=30)
+        response = http_get(url, params=params, endpoint='power_climatology')
         
         if response.status_code == 200:
-            data = response.json()
+            data = decode_json(response)
             if 'properties' in data and 'parameter' in data['properties']:
                 st.success("✅ Veriler başarıyla alındı!")
+                cache.set(cache_key, data)
                 return {
                     'status': 'success',
                     'data': data,
@@ -147,44 +211,32 @@ def get_nasa_power_data(lat, lon, start_date, end_date, data_type="daily"):
             'message': f'Bağlantı hatası: {str(e)}'
         }
 
+# Günlük parametre kodlarının görünen adları
+DAILY_PARAMETER_NAMES = {
+    'T2M': 'Sıcaklık (°C)',
+    'T2M_MAX': 'Max Sıcaklık (°C)',
+    'T2M_MIN': 'Min Sıcaklık (°C)',
+    'PRECTOTCORR': 'Yağış (mm/gün)',
+    'RH2M': 'Nem (%)',
+    'WS2M': 'Rüzgar Hızı (m/s)',
+    'ALLSKY_SFC_SW_DWN': 'Güneş Radyasyonu (kW-h/m²/gün)'
+}
+
 def parse_nasa_data(raw_data, data_type="daily"):
-    """NASA verilerini işle ve DataFrame'e dönüştür"""
+    """NASA verilerini işle ve DataFrame'e dönüştür
+
+    Günlük veri geniş tablo olarak döner (tarih indeksi × parametre adı, -999 → NaN);
+    uzun format gerektiğinde long_frame ile üretilir.
+    """
     if not raw_data or 'properties' not in raw_data:
         return None
     
     parameters = raw_data['properties']['parameter']
     
     if data_type == "daily":
-        dfs = []
-        for param_name, param_data in parameters.items():
-            dates = []
-            values = []
-            for date_str, value in param_data.items():
-                date_obj = datetime.strptime(date_str, '%Y%m%d')
-                dates.append(date_obj)
-                values.append(value)
-            
-            df_param = pd.DataFrame({
-                'date': dates,
-                'parameter': param_name,
-                'value': values
-            })
-            dfs.append(df_param)
-        
-        if dfs:
-            final_df = pd.concat(dfs, ignore_index=True)
-            param_names = {
-                'T2M': 'Sıcaklık (°C)',
-                'T2M_MAX': 'Max Sıcaklık (°C)',
-                'T2M_MIN': 'Min Sıcaklık (°C)',
-                'PRECTOTCORR': 'Yağış (mm/gün)',
-                'RH2M': 'Nem (%)',
-                'WS2M': 'Rüzgar Hızı (m/s)',
-                'ALLSKY_SFC_SW_DWN': 'Güneş Radyasyonu (kW-h/m²/gün)'
-            }
-            final_df['parameter_name'] = final_df['parameter'].map(param_names)
-            final_df['parameter_name'] = final_df['parameter_name'].fillna(final_df['parameter'])
-            return final_df
+        wide_df = daily_frame(raw_data)
+        if wide_df is not None:
+            return wide_df.rename(columns=DAILY_PARAMETER_NAMES)
     else:
         climate_data = []
         months = ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
@@ -301,6 +353,7 @@ with col2:
         start_date = st.date_input(
             "Başlangıç Tarihi", 
             value=today - timedelta(days=30),
+            min_value=datetime(1981, 1, 1).date(),
             max_value=today
         )
         end_date = st.date_input(
@@ -312,7 +365,7 @@ with col2:
         if start_date > end_date:
             st.error("❌ Başlangıç tarihi bitiş tarihinden sonra olamaz!")
         elif (end_date - start_date).days > 365:
-            st.warning("⚠️ 1 yıldan uzun süreler için İklim Verisi kullanmanız önerilir")
+            st.info(f"ℹ️ Uzun aralık {len(split_range(start_date, end_date))} yıllık parça halinde paralel çekilecek")
         
     else:
         col_year1, col_year2 = st.columns(2)
@@ -423,7 +476,7 @@ if 'nasa_data' in st.session_state and st.session_state.nasa_data is not None:
         # Günlük veri analizi
         st.markdown("### 📈 Zaman Serisi Grafikleri")
         
-        parameters = df['parameter_name'].unique()
+        parameters = list(df.columns)
         selected_params = st.multiselect(
             "Grafikte Gösterilecek Parametreler", 
             parameters, 
@@ -431,37 +484,74 @@ if 'nasa_data' in st.session_state and st.session_state.nasa_data is not None:
         )
         
         if selected_params:
-            filtered_df = df[df['parameter_name'].isin(selected_params)]
+            # Görünen aralık kaydırıcıyla seçilir; uzun aralıklar sunucuda seyreltilir,
+            # tam çözünürlük yalnızca aralık yeterince daraldığında gönderilir
+            first_day, last_day = df.index[0].date(), df.index[-1].date()
+            if first_day < last_day:
+                visible_start, visible_end = st.slider(
+                    "Görünen Aralık", min_value=first_day, max_value=last_day,
+                    value=(first_day, last_day), format="DD.MM.YYYY"
+                )
+            else:
+                visible_start, visible_end = first_day, last_day
+            col_method, col_points = st.columns(2)
+            with col_method:
+                method = st.radio("Seyreltme", list(METHODS), horizontal=True,
+                                  help="min/max her aralığın uç değerlerini korur (hızlı), LTTB çizginin şeklini (daha yavaş)")
+            with col_points:
+                max_points = st.select_slider("Seri başına en fazla nokta", [500, 1000, 2000, 5000], value=MAX_POINTS)
             
-            # Çizgi grafiği
-            fig = px.line(
-                filtered_df, 
-                x='date', 
-                y='value', 
-                color='parameter_name',
-                title=f'NASA POWER - {st.session_state.selected_city} Zaman Serisi Verileri',
-                labels={'value': 'Değer', 'date': 'Tarih', 'parameter_name': 'Parametre'}
-            )
+            visible = df.loc[str(visible_start):str(visible_end), selected_params]
+            fig = go.Figure()
+            shown = 0
+            for param in selected_params:
+                x, y = downsample(visible.index.values, visible[param].to_numpy(), max_points, method)
+                shown += len(x)
+                fig.add_trace(go.Scattergl(x=x, y=y, mode='lines', name=param))
             fig.update_layout(
+                title=f'NASA POWER - {st.session_state.selected_city} Zaman Serisi Verileri',
+                xaxis_title='Tarih',
+                yaxis_title='Değer',
+                legend_title='Parametre',
                 height=500,
                 hovermode='x unified',
                 title_x=0.5
             )
             st.plotly_chart(fig, use_container_width=True)
+            total = int(visible.count().sum())
+            st.caption(
+                f"{shown:,} / {total:,} nokta gösteriliyor" + (" (tam çözünürlük)" if shown == total else f" ({method} ile seyreltildi)")
+            )
         
         # Veri tablosu
         st.markdown("### 📋 HAM VERİ TABLOSU")
-        pivot_df = df.pivot_table(
-            index='date', 
-            columns='parameter_name', 
-            values='value'
-        ).reset_index()
+        pivot_df = df.reset_index()
         
         st.dataframe(pivot_df, use_container_width=True)
+
+        # Tipleri koruyan sütunsal formatlar (tarih date32, değerler float)
+        export_cols = st.columns(4)
+        export_cols[0].download_button(
+            "📊 CSV İndir", data=lambda: pivot_df.to_csv(index=False),
+            file_name="nasa_power_gunluk.csv", mime="text/csv"
+        )
+        export_cols[1].download_button(
+            "🧱 Parquet İndir", data=lambda: frame_bytes(pivot_df, 'parquet'),
+            file_name="nasa_power_gunluk.parquet", mime="application/vnd.apache.parquet"
+        )
+        export_cols[2].download_button(
+            "🪶 Feather İndir", data=lambda: frame_bytes(pivot_df, 'feather'),
+            file_name="nasa_power_gunluk.feather", mime="application/vnd.apache.arrow.file"
+        )
+        # Uzun format yalnızca indirilirken üretilir
+        export_cols[3].download_button(
+            "📜 Uzun Format CSV", data=lambda: long_frame(df).to_csv(index=False),
+            file_name="nasa_power_gunluk_uzun.csv", mime="text/csv"
+        )
         
         # İstatistikler
         st.markdown("### 📊 İSTATİSTİKSEL ÖZET")
-        stats_df = df.groupby('parameter_name')['value'].describe()
+        stats_df = df.describe().T
         st.dataframe(stats_df.style.format("{:.2f}"), use_container_width=True)
         
     else:
@@ -518,7 +608,7 @@ with col_info2:
     with st.expander("🔧 NASA POWER API BİLGİSİ"):
         st.markdown("""
         **NASA POWER API Özellikleri:**
-        - **Çözünürlük:** 1° x 1° (≈111km)
+        - **Çözünürlük:** 0.5° x 0.625° (MERRA-2 ızgarası)
         - **Veri Kaynağı:** Satellite + Yer istasyonları
         - **Kapsam:** Global, 1984'ten günümüze
         - **Güncelleme:** Gerçek zamanlı
@@ -0,0 +1,31 @@
+"""NASA POWER event-weather analysis engine, independent of any UI
+
+The Streamlit apps, the batch runner and background jobs all import from here;
+nothing in the package calls Streamlit. Status messages are returned as data
+(see power_weather.messages) and texts are selected with an explicit lang.
+"""
+
+from power_weather.analysis import analyze_selected_date, build_alt_dates, get_date_limits
+from power_weather.best_dates import find_best_dates, rank_event_days, score_date_window
+from power_weather.cache import ResponseCache, get_response_cache
+from power_weather.messages import format_message
+from power_weather.recommendations import get_canonical_event_type, get_event_specific_recommendations
+from power_weather.risk import calculate_thi, get_thi_risk_level, score_frame, score_weather
+
+__all__ = [
+    'ResponseCache',
+    'analyze_selected_date',
+    'build_alt_dates',
+    'calculate_thi',
+    'find_best_dates',
+    'format_message',
+    'get_canonical_event_type',
+    'get_date_limits',
+    'get_event_specific_recommendations',
+    'get_response_cache',
+    'get_thi_risk_level',
+    'rank_event_days',
+    'score_date_window',
+    'score_frame',
+    'score_weather',
+]
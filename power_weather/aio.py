@@ -0,0 +1,52 @@
+"""Concurrent data access for the analysis flow
+
+Independent blocking fetches (reverse geocode, POWER daily, climatology) are
+started together on an asyncio loop and awaited under one overall deadline,
+so an analysis takes as long as its slowest request instead of their sum.
+The fetchers themselves stay synchronous and share the pooled HTTP client;
+they run on a dedicated thread pool so a missed deadline never blocks the caller.
+Callers that already run an event loop get a fresh loop on a second pool, so
+the loop never waits for a worker of the pool it is itself occupying.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_WORKERS = 16
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='power-fetch')
+# Only runs event loops for fetch_concurrently calls made inside a running loop
+_loop_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='power-loop')
+
+
+async def gather_calls(calls, deadline=None):
+    """Run {name: (func, *args)} concurrently; failed or late calls yield None"""
+    loop = asyncio.get_running_loop()
+    futures = {
+        name: loop.run_in_executor(_executor, functools.partial(func, *args))
+        for name, (func, *args) in calls.items()
+    }
+    if not futures:
+        return {}
+    done, pending = await asyncio.wait(futures.values(), timeout=deadline)
+    for future in pending:
+        future.cancel()
+
+    results = {}
+    for name, future in futures.items():
+        if future in done and future.exception() is None:
+            results[name] = future.result()
+        else:
+            results[name] = None
+    return results
+
+
+def fetch_concurrently(calls, deadline=None):
+    """Synchronous facade over gather_calls for Streamlit scripts and the CLI"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(gather_calls(calls, deadline))
+    # Already inside an event loop (e.g. a notebook): run a new loop on a helper thread instead
+    return _loop_executor.submit(asyncio.run, gather_calls(calls, deadline)).result()
@@ -0,0 +1,299 @@
+"""Headless single-date analysis shared by the Streamlit app and the batch runner"""
+
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+
+import numpy as np
+
+from power_weather.aio import fetch_concurrently
+from power_weather.geocode import format_coordinates, get_city_name
+from power_weather.grid import grid_cell
+from power_weather.messages import add_message
+from power_weather.power import (
+    get_nasa_power_climatology_for_date_range,
+    get_nasa_power_daily,
+    get_simulated_weather,
+)
+from power_weather.risk import calculate_thi, get_thi_risk_level, thi_risk_levels
+
+FORECAST_HORIZON_DAYS = 90
+HISTORY_YEARS = 10
+
+# The app opens on this many days from today
+DEFAULT_ANALYSIS_OFFSET_DAYS = 30
+
+# Overall wall-clock budget for the concurrent fetches of one analysis
+ANALYSIS_DEADLINE_SECONDS = 60
+
+# Analysis data kept in memory, per grid cell and date
+ANALYSIS_MEMO_SIZE = 512
+
+# Day offsets shown in the "nearby dates" strip around the selected date
+ALT_DATE_OFFSETS = [-3, -2, -1, 0, 1, 2, 3]
+
+
+def get_date_limits(today=None):
+    """(today, ten_years_ago, three_months_later) used to validate analysis dates"""
+    today = today or date.today()
+    return today, today - timedelta(days=365 * HISTORY_YEARS), today + timedelta(days=FORECAST_HORIZON_DAYS)
+
+
+def get_alt_window_dates(selected_date):
+    return [selected_date + timedelta(days=days) for days in ALT_DATE_OFFSETS]
+
+
+def window_from_daily(data, dates):
+    """Per-day values for the alternative-dates strip from a POWER daily response (-999 -> NaN)"""
+    params = data['properties']['parameter']
+    keys = [d.strftime("%Y%m%d") for d in dates]
+
+    def column(name):
+        values = np.array([params.get(name, {}).get(k, np.nan) for k in keys], dtype=float)
+        values[values <= -999] = np.nan
+        return values.tolist()
+
+    return {
+        'dates': list(dates),
+        'precipitation': column('PRECTOTCORR'),
+        'temperature': column('T2M'),
+        'rh': column('RH2M'),
+        'wind_speed': column('WS2M')
+    }
+
+
+class AnalysisMemo:
+    """Bounded LRU of language-independent analysis data, shared by all sessions"""
+
+    def __init__(self, max_entries=ANALYSIS_MEMO_SIZE):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+        return None
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_memo = AnalysisMemo()
+
+
+def analysis_data_key(lat, lon, selected_date, today=None):
+    """Analysis data depends only on the grid cell, the date and what counts as today"""
+    return grid_cell(lat, lon).cell_id, selected_date, today or date.today()
+
+
+def get_analysis_data(lat, lon, selected_date, today=None):
+    """Weather numbers for an analysis: the network-bound half, independent of language and event type
+
+    Memoized per grid cell and date. Simulated fallbacks are not memoized, so a
+    later call retries NASA POWER. Status messages are returned under 'messages'
+    (only on the call that actually fetched).
+    """
+    today, ten_years_ago, three_months_later = get_date_limits(today)
+    key = analysis_data_key(lat, lon, selected_date, today)
+    cached = _memo.get(key)
+    if cached is not None:
+        return cached
+
+    messages = []
+    if selected_date > three_months_later:
+        return {'status': 'too_far', 'selected_date': selected_date, 'messages': messages}
+
+    start_year = today.year - HISTORY_YEARS
+    end_year = today.year - 1
+    # One request covers the whole ±3 day strip, not only the selected day
+    window_dates = get_alt_window_dates(selected_date)
+    data = None
+
+    if selected_date < today:
+        # Use historical daily data for past dates; POWER has no observations for today or later
+        window_end = min(window_dates[-1], today - timedelta(days=1))
+        daily = get_nasa_power_daily(lat, lon, window_dates[0], window_end, messages)
+        if daily:
+            params = daily['properties']['parameter']
+            date_key = selected_date.strftime("%Y%m%d")
+            data = {
+                'source': 'historical',
+                'precipitation': params['PRECTOTCORR'].get(date_key, 2.0),
+                'temperature': params['T2M'].get(date_key, 22.0),
+                'rh': params['RH2M'].get(date_key, 60.0),
+                'wind_speed': params['WS2M'].get(date_key, 3.0),
+                'confidence': 'high',
+                'historical_period': f"{selected_date.year}",
+                'window': window_from_daily(daily, window_dates)
+            }
+    else:
+        # For future dates, use the day-of-year climatology of the last 10 years
+        climate_data = get_nasa_power_climatology_for_date_range(
+            lat, lon, selected_date.month, selected_date.day, start_year, end_year, window_dates
+        )
+        if climate_data:
+            data = {
+                'source': 'climatology',
+                'precipitation': climate_data.get('precipitation', 2.0),
+                'temperature': climate_data.get('temperature', 22.0),
+                'rh': climate_data.get('rh', 60.0),
+                'wind_speed': climate_data.get('wind_speed', 3.0),
+                'confidence': climate_data.get('confidence', 'medium'),
+                'historical_period': f"{start_year}-{end_year}",
+                'window': climate_data.get('window')
+            }
+
+    if data is None:
+        return get_simulated_data(selected_date, messages)
+
+    data['thi'] = calculate_thi(data['temperature'], data['rh'])
+    data['risk_level'] = get_thi_risk_level(data['thi'])
+    data.update(status='success', selected_date=selected_date)
+    _memo.set(key, dict(data, messages=[]))
+    data['messages'] = messages
+    return data
+
+
+def get_simulated_data(selected_date, messages=None):
+    """Use simulation if NASA data is unavailable, incorporating THI and wind speed"""
+    messages = [] if messages is None else messages
+    add_message(messages, 'info', 'simulation')
+
+    precip, temp, rh, wind_speed = get_simulated_weather(selected_date)
+    thi = calculate_thi(temp, rh)
+
+    window_dates = get_alt_window_dates(selected_date)
+    simulated = np.array([get_simulated_weather(d) for d in window_dates])
+    window = {
+        'dates': window_dates,
+        'precipitation': simulated[:, 0].tolist(),
+        'temperature': simulated[:, 1].tolist(),
+        'rh': simulated[:, 2].tolist(),
+        'wind_speed': simulated[:, 3].tolist()
+    }
+
+    return {
+        'status': 'success',
+        'source': 'simulation',
+        'selected_date': selected_date,
+        'precipitation': precip,
+        'temperature': temp,
+        'rh': rh,
+        'wind_speed': wind_speed,
+        'thi': thi,
+        'risk_level': get_thi_risk_level(thi),
+        'confidence': 'medium',
+        'historical_period': None,
+        'window': window,
+        'messages': messages
+    }
+
+
+def present_analysis(data, lat, lon, city_name=None, lang='en', today=None):
+    """Analysis result in the given language from get_analysis_data output (no network access)"""
+    selected_date = data['selected_date']
+    if data['status'] == 'too_far':
+        _, ten_years_ago, three_months_later = get_date_limits(today)
+        return {
+            'status': 'too_far',
+            'selected_date': selected_date,
+            'message': f"Selected date ({selected_date.strftime('%d.%m.%Y')}) is beyond 3 months. NASA POWER data cannot provide reliable forecasts." if lang == "en" else f"Seçtiğiniz tarih ({selected_date.strftime('%d.%m.%Y')}) 3 aydan daha ileride. NASA POWER verileri bu tarih için güvenilir tahmin sağlayamaz.",
+            'recommendation': f"Please select a date between {ten_years_ago.strftime('%d.%m.%Y')} and {three_months_later.strftime('%d.%m.%Y')}." if lang == "en" else f"Lütfen {ten_years_ago.strftime('%d.%m.%Y')} - {three_months_later.strftime('%d.%m.%Y')} aralığında bir tarih seçin.",
+            'messages': data['messages']
+        }
+
+    result = {
+        key: data[key]
+        for key in ('status', 'selected_date', 'precipitation', 'temperature', 'rh', 'wind_speed', 'thi',
+                    'risk_level', 'confidence', 'window', 'messages')
+    }
+    result['location'] = format_coordinates(lat, lon)
+    result['city_name'] = city_name or format_coordinates(lat, lon)
+
+    if data['source'] == 'simulation':
+        result.update({
+            'historical_period': "2013-2023 (Simulation)" if lang == "en" else "2013-2023 (Simülasyon)",
+            'data_source': 'Simulation' if lang == "en" else 'Simülasyon',
+            'analysis_period': "±2 days window" if lang == "en" else "±2 günlük pencere",
+            'accuracy': 'Estimated 70-80% based on historical climatology data' if lang == "en" else 'Tarihi klimatoloji verilerine dayalı tahmini %70-80 doğruluk'
+        })
+    else:
+        analysis_start = selected_date - timedelta(days=2)
+        analysis_end = selected_date + timedelta(days=2)
+        if data['source'] == 'historical':
+            data_source = 'NASA POWER Historical'
+            accuracy = 'Based on actual historical data (high accuracy)'
+        else:
+            data_source = 'NASA POWER Climatology'
+            accuracy = 'Prediction based on historical climatology data'
+        result.update({
+            'historical_period': data['historical_period'],
+            'data_source': data_source,
+            'analysis_period': f"{analysis_start.strftime('%d.%m')} - {analysis_end.strftime('%d.%m')}",
+            'accuracy': accuracy if lang == "en" else 'Tarihi klimatoloji verilerine dayalı tahminidir'
+        })
+    return result
+
+
+def fetch_analysis_inputs(lat, lon, selected_date, city_name=None, today=None):
+    """(analysis data, place name), with the POWER fetch and the reverse geocode run concurrently
+
+    Both run under one deadline, so a cold analysis waits for the slower of
+    the two instead of their sum. The place name is only looked up when
+    city_name is not given; simulated data stands in for a failed fetch.
+    """
+    calls = {'data': (get_analysis_data, lat, lon, selected_date, today)}
+    if not city_name:
+        calls['city_name'] = (get_city_name, lat, lon)
+    fetched = fetch_concurrently(calls, deadline=ANALYSIS_DEADLINE_SECONDS)
+    return fetched['data'] or get_simulated_data(selected_date), city_name or fetched.get('city_name')
+
+
+def analyze_selected_date(lat, lon, selected_date, event_type, city_name=None, lang='en', today=None):
+    """Analyze weather for the selected date, adapted to THI-based risk assessment from the research
+
+    Status messages are returned under 'messages' instead of being shown.
+    """
+    data, city_name = fetch_analysis_inputs(lat, lon, selected_date, city_name, today)
+    return present_analysis(data, lat, lon, city_name, lang, today)
+
+
+def build_alt_dates(analysis_results, today=None):
+    """THI and risk for the whole ±3 day strip in one vectorized pass over the fetched window"""
+    window = analysis_results.get('window')
+    if analysis_results.get('status') != 'success' or not window:
+        return []
+    today, ten_years_ago, _ = get_date_limits(today)
+    dates = window['dates']
+    precip = np.asarray(window['precipitation'], dtype=float)
+    wind = np.asarray(window['wind_speed'], dtype=float)
+    temperature = np.asarray(window['temperature'], dtype=float)
+    rh = np.asarray(window['rh'], dtype=float)
+    thi = calculate_thi(temperature, rh)
+    risk = thi_risk_levels(thi)
+    in_range = np.array([ten_years_ago <= d <= today + timedelta(days=365) for d in dates])
+    keep = np.flatnonzero(in_range & ~np.isnan(thi) & ~np.isnan(precip) & ~np.isnan(wind))
+    return [
+        {
+            'date': dates[i],
+            'precipitation': float(precip[i]),
+            'temperature': float(temperature[i]),
+            'rh': float(rh[i]),
+            'thi': float(thi[i]),
+            'wind_speed': float(wind[i]),
+            'risk_level': str(risk[i]),
+            'is_selected': dates[i] == analysis_results['selected_date']
+        }
+        for i in keep
+    ]
@@ -0,0 +1,316 @@
+"""Memory-mapped local archive of POWER daily series, one file per grid cell and parameter
+
+    <POWER_ARCHIVE_DIR>/r260c341/T2M.f32      little-endian float32, value i is day EPOCH + i
+    <POWER_ARCHIVE_DIR>/r260c341/index.json   archived day ranges per parameter
+
+The layout is fixed, so "T2M on 2015-06-03 in cell X" is a seek to
+(day - 1981-01-01) * 4 bytes: reads go through np.memmap and return views
+without copying, and every Streamlit worker process shares the same pages via
+the OS page cache. Writing a range only touches its own bytes (a gap before it
+becomes a sparse hole) and then records the range in the cell's index, so
+concurrent writers never clobber each other's days. Responses fetched by the
+apps only archive settled days that have a value (store_power_json), so
+preliminary days and -999 fills are downloaded again; regional ingests of
+settled years store missing values as NaN. Days never written are told apart
+through the index, not the values. Losing an index update to a concurrent writer only means that range
+is downloaded again.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+
+import numpy as np
+
+from power_weather.cache import DEFAULT_CACHE_DIR, RECENT_DAYS
+from power_weather.decode import power_arrays, to_power_json
+from power_weather.grid import grid_cell
+
+EPOCH = np.datetime64('1981-01-01', 'D')
+DTYPE = np.dtype('<f4')
+DEFAULT_ARCHIVE_DIR = os.environ.get('POWER_ARCHIVE_DIR', os.path.join(DEFAULT_CACHE_DIR, 'archive'))
+MAX_OPEN_MAPS = 256
+INDEX_FILE = 'index.json'
+
+
+def day_number(day):
+    """Days since EPOCH for a date / datetime64 (scalar or array)"""
+    return (np.asarray(day, dtype='datetime64[D]') - EPOCH).astype(np.int64)
+
+
+def _merge_ranges(ranges):
+    merged = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], last)
+        else:
+            merged.append([first, last])
+    return merged
+
+
+class SeriesArchive:
+    """Per-cell, per-parameter float32 day arrays read through shared memory maps"""
+
+    def __init__(self, directory=None, max_open_maps=MAX_OPEN_MAPS):
+        self.directory = directory or DEFAULT_ARCHIVE_DIR
+        os.makedirs(self.directory, exist_ok=True)
+        self.max_open_maps = max_open_maps
+        self._maps = OrderedDict()
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def path(self, cell_id, parameter):
+        return os.path.join(self.directory, cell_id, f"{parameter}.f32")
+
+    def cells(self):
+        return sorted(
+            name for name in os.listdir(self.directory)
+            if os.path.exists(os.path.join(self.directory, name, INDEX_FILE))
+        )
+
+    def index(self, cell_id):
+        """{parameter: [[first_day, last_day], ...]} of archived day numbers (inclusive)"""
+        path = os.path.join(self.directory, cell_id, INDEX_FILE)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        with self._lock:
+            cached = self._indexes.get(cell_id)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+        index = self._read_index(cell_id)
+        with self._lock:
+            self._indexes[cell_id] = (mtime, index)
+        return index
+
+    def covers(self, cell_id, parameters, start, end):
+        """True when every parameter is archived for every day of start..end"""
+        index = self.index(cell_id)
+        first, last = int(day_number(start)), int(day_number(end))
+        return all(
+            any(a <= first and last <= b for a, b in index.get(parameter, []))
+            for parameter in parameters
+        )
+
+    def _map(self, cell_id, parameter):
+        path = self.path(cell_id, parameter)
+        try:
+            size = os.stat(path).st_size
+        except FileNotFoundError:
+            return None
+        key = (cell_id, parameter)
+        with self._lock:
+            cached = self._maps.get(key)
+            if cached is not None and cached[0] == size:
+                self._maps.move_to_end(key)
+                return cached[1]
+        values = np.memmap(path, dtype=DTYPE, mode='r') if size else np.empty(0, dtype=DTYPE)
+        with self._lock:
+            # A file that grew since it was mapped gets a fresh map covering the new days
+            self._maps[key] = (size, values)
+            self._maps.move_to_end(key)
+            while len(self._maps) > self.max_open_maps:
+                self._maps.popitem(last=False)
+        return values
+
+    def read(self, cell_id, parameter, start, end):
+        """Values for start..end as a read-only view of the map (NaN-padded copy past the file end)
+
+        Days that were never archived read as arbitrary values; read_columns
+        checks the index first.
+        """
+        values = self._map(cell_id, parameter)
+        first, last = int(day_number(start)), int(day_number(end))
+        if values is not None and first >= 0 and last < len(values):
+            return values[first:last + 1]
+        result = np.full(last - first + 1, np.nan, dtype=DTYPE)
+        if values is not None:
+            lo, hi = max(first, 0), min(last, len(values) - 1)
+            if lo <= hi:
+                result[lo - first:hi - first + 1] = values[lo:hi + 1]
+        return result
+
+    def value(self, cell_id, parameter, day):
+        """One day's value (NaN when missing or not archived)"""
+        i = int(day_number(day))
+        if not any(a <= i <= b for a, b in self.index(cell_id).get(parameter, [])):
+            return float('nan')
+        return float(self._map(cell_id, parameter)[i])
+
+    def write(self, cell_id, start, columns):
+        """Store {parameter: daily values from start} and record the ranges; existing days are overwritten"""
+        first = int(day_number(start))
+        if first < 0:
+            raise ValueError(f"archive starts at {EPOCH}")
+        written = {}
+        for parameter, values in columns.items():
+            values = np.asarray(values, dtype=DTYPE)
+            if len(values):
+                self._write_file(cell_id, parameter, first, values)
+                written[parameter] = [[first, first + len(values) - 1]]
+        if written:
+            self._update_index(cell_id, written)
+
+    def write_valid(self, cell_id, dates, columns, last_day=None):
+        """Store only the days that have a value (and are not after last_day); returns the days written
+
+        NaN days and days past last_day are neither written nor indexed, so a
+        later request for them is downloaded again. Runs that are already
+        archived are skipped, so storing the same response twice writes
+        nothing the second time.
+        """
+        if not len(dates):
+            return 0
+        start = dates.min()
+        offsets = (dates - start).astype(np.int64)
+        first = int(day_number(start))
+        if first < 0:
+            raise ValueError(f"archive starts at {EPOCH}")
+        n_days = int(offsets.max()) + 1
+        if last_day is not None:
+            n_days = min(n_days, int(day_number(last_day)) - first + 1)
+        if n_days <= 0:
+            return 0
+        index = self.index(cell_id)
+        written, n_written = {}, 0
+        for parameter, values in columns.items():
+            dense = np.full(n_days, np.nan, dtype=DTYPE)
+            keep = offsets < n_days
+            dense[offsets[keep]] = np.asarray(values, dtype=DTYPE)[keep]
+            # Start and end offsets of every run of days that have a value
+            edges = np.flatnonzero(np.diff(np.concatenate(([False], ~np.isnan(dense), [False]))))
+            for lo, hi in zip(edges[::2], edges[1::2] - 1):
+                day_range = [first + int(lo), first + int(hi)]
+                if any(a <= day_range[0] and day_range[1] <= b for a, b in index.get(parameter, [])):
+                    continue
+                self._write_file(cell_id, parameter, day_range[0], dense[lo:hi + 1])
+                written.setdefault(parameter, []).append(day_range)
+                n_written += day_range[1] - day_range[0] + 1
+        if written:
+            self._update_index(cell_id, written)
+        return n_written
+
+    def _write_file(self, cell_id, parameter, first, values):
+        os.makedirs(os.path.join(self.directory, cell_id), exist_ok=True)
+        path = self.path(cell_id, parameter)
+        # O_CREAT without truncation: another writer may be filling other days of the file
+        with os.fdopen(os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o644), 'r+b') as f:
+            f.seek(first * DTYPE.itemsize)
+            f.write(values.tobytes())
+
+    def _update_index(self, cell_id, written):
+        with self._lock:
+            index = self._read_index(cell_id)
+            for parameter, day_ranges in written.items():
+                index[parameter] = _merge_ranges(index.get(parameter, []) + day_ranges)
+            path = os.path.join(self.directory, cell_id, INDEX_FILE)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(index, f)
+            os.replace(tmp_path, path)
+            self._indexes.pop(cell_id, None)
+
+    def _read_index(self, cell_id):
+        path = os.path.join(self.directory, cell_id, INDEX_FILE)
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def read_filled(self, cell_id, parameter, start, end):
+        """Copy of start..end with NaN on every day that was never archived"""
+        first, last = int(day_number(start)), int(day_number(end))
+        values = np.full(last - first + 1, np.nan, dtype=DTYPE)
+        source = self.read(cell_id, parameter, start, end)
+        for a, b in self.index(cell_id).get(parameter, []):
+            lo, hi = max(a, first), min(b, last)
+            if lo <= hi:
+                values[lo - first:hi - first + 1] = source[lo - first:hi - first + 1]
+        return values
+
+    def extent(self, cell_id, parameters):
+        """(first, last) datetime64 day archived for any of the parameters, or None"""
+        ranges = [r for parameter in parameters for r in self.index(cell_id).get(parameter, [])]
+        if not ranges:
+            return None
+        return EPOCH + min(a for a, _ in ranges), EPOCH + max(b for _, b in ranges)
+
+    def read_columns(self, cell_id, parameters, start, end):
+        """{parameter: values for start..end}, or None unless the whole range is archived"""
+        if not self.covers(cell_id, parameters, start, end):
+            return None
+        return {parameter: self.read(cell_id, parameter, start, end) for parameter in parameters}
+
+    def power_json(self, cell_id, parameters, start, end):
+        """The archived range shaped like a POWER daily point response, or None unless fully archived"""
+        columns = self.read_columns(cell_id, parameters, start, end)
+        if columns is None:
+            return None
+        dates = np.arange(np.datetime64(start, 'D'), np.datetime64(end, 'D') + 1)
+        return to_power_json(dates, columns)
+
+    def write_arrays(self, cell_id, dates, columns):
+        """Store decoded (dates, {parameter: values}) as returned by decode.power_arrays"""
+        if not len(dates):
+            return
+        start = dates.min()
+        offsets = (dates - start).astype(np.int64)
+        n_days = int(offsets.max()) + 1
+        if len(offsets) == n_days and (offsets == np.arange(n_days)).all():
+            self.write(cell_id, start, columns)
+            return
+        # Days absent from the response are archived as missing
+        dense = {}
+        for parameter, values in columns.items():
+            dense[parameter] = np.full(n_days, np.nan, dtype=DTYPE)
+            dense[parameter][offsets] = values
+        self.write(cell_id, start, dense)
+
+
+_default_archive = None
+_default_archive_lock = threading.Lock()
+
+
+def get_series_archive():
+    """Process-wide archive over DEFAULT_ARCHIVE_DIR"""
+    global _default_archive
+    with _default_archive_lock:
+        if _default_archive is None:
+            _default_archive = SeriesArchive()
+        return _default_archive
+
+
+def settled_end(today=None):
+    """Last day POWER no longer revises: anything newer than today - RECENT_DAYS is preliminary"""
+    return (today or date.today()) - timedelta(days=RECENT_DAYS + 1)
+
+
+def load_power_json(lat, lon, parameters, start, end, today=None):
+    """Archived POWER-shaped response for a settled, fully archived range, else None
+
+    Ranges reaching into the last RECENT_DAYS are always fetched, since POWER
+    still revises those days.
+    """
+    if end > settled_end(today):
+        return None
+    if isinstance(parameters, str):
+        parameters = parameters.split(',')
+    return get_series_archive().power_json(grid_cell(lat, lon).cell_id, parameters, start, end)
+
+
+def store_power_json(lat, lon, data, today=None):
+    """Archive the settled days of a POWER daily response; a failed write only means it is downloaded again later
+
+    Preliminary days (newer than settled_end) and -999 fills are left out of
+    the archive and its index, so they are fetched again until POWER has a
+    final value for them.
+    """
+    try:
+        dates, columns = power_arrays(data)
+        get_series_archive().write_valid(grid_cell(lat, lon).cell_id, dates, columns, settled_end(today))
+    except (OSError, ValueError, KeyError):
+        pass
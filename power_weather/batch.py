@@ -0,0 +1,180 @@
+"""Headless multi-venue batch analysis
+
+    python -m power_weather.batch venues.csv -o results.parquet
+
+The input CSV needs venue, lat, lon, date and event_type columns. Upstream data
+is fetched first, once per POWER grid cell (one climatology series per cell,
+one daily window per cell and past date), with a bounded number of requests in
+flight. Every row is then analyzed with analyze_selected_date from warm caches.
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+import pandas as pd
+
+from power_weather.analysis import HISTORY_YEARS, analyze_selected_date, get_alt_window_dates, get_date_limits
+from power_weather.cache import get_response_cache
+from power_weather.climatology import get_climatology_store
+from power_weather.columnar import FORMATS, format_from_path, results_table, write_table
+from power_weather.grid import grid_cell
+from power_weather.messages import format_message
+from power_weather.power import get_nasa_power_daily
+from power_weather.recommendations import recommendation_titles
+from power_weather.risk import get_precipitation_risk_level, get_wind_risk_level
+
+REQUIRED_COLUMNS = ['venue', 'lat', 'lon', 'date', 'event_type']
+DEFAULT_WORKERS = 8
+
+RESULT_COLUMNS = [
+    'venue', 'lat', 'lon', 'cell_id', 'date', 'event_type', 'status', 'risk_level',
+    'thi', 'temperature', 'precipitation', 'wind_speed', 'wind_risk', 'precip_risk',
+    'confidence', 'data_source', 'historical_period', 'recommendations', 'messages'
+]
+
+
+def load_venues(path_or_buffer):
+    """Read and validate the venue CSV, adding each row's grid cell"""
+    venues = pd.read_csv(path_or_buffer)
+    missing = [column for column in REQUIRED_COLUMNS if column not in venues.columns]
+    if missing:
+        raise ValueError(f"missing columns: {', '.join(missing)}")
+    venues['date'] = pd.to_datetime(venues['date']).dt.date
+    venues['cell_id'] = [grid_cell(lat, lon).cell_id for lat, lon in zip(venues['lat'], venues['lon'])]
+    return venues
+
+
+def plan_fetches(venues, today=None):
+    """Unique upstream fetches needed by the batch, keyed so shared grid cells are fetched once"""
+    today, _, three_months_later = get_date_limits(today)
+    store = get_climatology_store()
+    tasks = {}
+    for row in venues.itertuples(index=False):
+        if row.date > three_months_later:
+            continue
+        if row.date < today:
+            window = get_alt_window_dates(row.date)
+            window_end = min(window[-1], today - timedelta(days=1))
+            tasks.setdefault(('daily', row.cell_id, window[0], window_end),
+                             (get_nasa_power_daily, row.lat, row.lon, window[0], window_end))
+        else:
+            tasks.setdefault(('series', row.cell_id),
+                             (store.get_series, row.lat, row.lon, today.year - HISTORY_YEARS, today.year - 1))
+    return tasks
+
+
+def _run_parallel(calls, max_workers, progress=None, stage=''):
+    results = [None] * len(calls)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='power-batch') as executor:
+        futures = {executor.submit(func, *args): i for i, (func, *args) in enumerate(calls)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                results[futures[future]] = future.result()
+            except Exception:
+                results[futures[future]] = None
+            if progress:
+                progress(stage, done, len(calls))
+    return results
+
+
+def _result_row(venue, analysis, lang):
+    row = {
+        'venue': venue.venue,
+        'lat': venue.lat,
+        'lon': venue.lon,
+        'cell_id': venue.cell_id,
+        'date': venue.date,
+        'event_type': venue.event_type,
+        'status': analysis['status'] if analysis else 'error',
+        'messages': ' | '.join(format_message(m, lang) for m in analysis.get('messages', [])) if analysis else ''
+    }
+    if analysis and analysis['status'] == 'success':
+        row.update({
+            'risk_level': analysis['risk_level'],
+            'thi': analysis['thi'],
+            'temperature': analysis['temperature'],
+            'precipitation': analysis['precipitation'],
+            'wind_speed': analysis['wind_speed'],
+            'wind_risk': get_wind_risk_level(analysis['wind_speed']),
+            'precip_risk': get_precipitation_risk_level(analysis['precipitation']),
+            'confidence': analysis['confidence'],
+            'data_source': analysis['data_source'],
+            'historical_period': analysis['historical_period']
+        })
+    elif analysis:
+        row['messages'] = analysis.get('message', row['messages'])
+    return row
+
+
+def run_batch(venues, lang='en', max_workers=DEFAULT_WORKERS, today=None, progress=None):
+    """Analyze every venue row; returns one result row per input row, in input order
+
+    progress, if given, is called as progress(stage, done, total) with stage
+    'fetch' or 'analyze'.
+    """
+    fetches = plan_fetches(venues, today)
+    _run_parallel(list(fetches.values()), max_workers, progress, 'fetch')
+
+    # Venue names stand in for place names, so no reverse geocoding per row
+    rows = list(venues.itertuples(index=False))
+    calls = [
+        (analyze_selected_date, row.lat, row.lon, row.date, row.event_type, str(row.venue), lang, today)
+        for row in rows
+    ]
+    analyses = _run_parallel(calls, max_workers, progress, 'analyze')
+    results = pd.DataFrame([_result_row(row, analysis, lang) for row, analysis in zip(rows, analyses)])
+    results = results.reindex(columns=RESULT_COLUMNS)
+    success = (results['status'] == 'success').to_numpy()
+    if success.any():
+        analyzed = results[success]
+        results.loc[success, 'recommendations'] = recommendation_titles(
+            analyzed['risk_level'], analyzed['wind_speed'], analyzed['precipitation'],
+            analyzed['temperature'], analyzed['event_type'], lang=lang
+        )
+    return results
+
+
+def write_results(results, path, fmt=None):
+    """Write results as CSV, or typed Parquet / Arrow / Feather (chosen from fmt or the file extension)"""
+    fmt = fmt or ('csv' if str(path).endswith('.csv') else format_from_path(path))
+    if fmt == 'csv':
+        results.to_csv(path, index=False)
+    else:
+        write_table(results_table(results), path, fmt)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch NASA POWER event-weather analysis for many venues")
+    parser.add_argument('venues', help="CSV with venue, lat, lon, date, event_type columns")
+    parser.add_argument('-o', '--output', default='batch_results.csv', help="output .csv, .parquet, .arrow or .feather file")
+    parser.add_argument('--format', choices=['csv', *FORMATS], help="output format (default: from extension)")
+    parser.add_argument('--lang', choices=['en', 'tr'], default='en')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="parallel upstream requests")
+    args = parser.parse_args(argv)
+
+    started = time.monotonic()
+    venues = load_venues(args.venues)
+
+    def progress(stage, done, total):
+        print(f"\r{stage}: {done}/{total}", end='', file=sys.stderr, flush=True)
+        if done == total:
+            print(file=sys.stderr)
+
+    results = run_batch(venues, lang=args.lang, max_workers=args.workers, progress=progress)
+    write_results(results, args.output, args.format)
+
+    stats = get_response_cache().stats()
+    print(
+        f"{len(results)} rows, {venues['cell_id'].nunique()} grid cells, "
+        f"{(results['status'] == 'success').sum()} analyzed in {time.monotonic() - started:.1f}s "
+        f"(cache hits {stats['hits']}, misses {stats['misses']}) -> {args.output}",
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""Best date finder: rank every day of a planning window by climatological risk
+
+Each day is scored from the day-of-year climatology of its grid cell (THI, wind
+and precipitation percentiles and exceedance probabilities over a ±N day
+window). The per-day-of-year table is built once per series with vectorized
+NumPy operations, so scanning a 180-day window is a lookup plus a sort.
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from power_weather.analysis import HISTORY_YEARS
+from power_weather.climatology import DEFAULT_WINDOW_DAYS, day_of_year, get_climatology_store
+from power_weather.recommendations import get_canonical_event_type, recommendation_titles
+from power_weather.risk import (
+    PRECIP_THRESHOLDS,
+    THI_THRESHOLDS,
+    WIND_THRESHOLDS,
+    precipitation_risk_codes,
+    risk_labels,
+    thi_risk_codes,
+    thi_risk_levels,
+    wind_risk_codes,
+)
+
+MAX_WINDOW_DAYS = 183
+DEFAULT_TOP_N = 5
+
+# Parameter of the series, thresholds for 'medium' / 'high'
+RISK_DIMENSIONS = {
+    'thi': ('THI', THI_THRESHOLDS),
+    'wind': ('WS2M', WIND_THRESHOLDS),
+    'precip': ('PRECTOTCORR', PRECIP_THRESHOLDS),
+}
+
+# How much each risk dimension matters per event type (canonical English names)
+EVENT_WEIGHTS = {
+    'Wedding': {'thi': 1.0, 'wind': 0.8, 'precip': 1.5},
+    'Concert': {'thi': 0.8, 'wind': 1.2, 'precip': 1.5},
+    'Sports Event': {'thi': 1.5, 'wind': 0.8, 'precip': 1.0},
+    'Festival': {'thi': 1.0, 'wind': 1.0, 'precip': 1.2},
+    'Outdoor Party': {'thi': 1.0, 'wind': 0.8, 'precip': 1.2},
+    'Picnic': {'thi': 1.0, 'wind': 1.0, 'precip': 1.5},
+    'Business Meeting': {'thi': 0.8, 'wind': 1.0, 'precip': 1.0},
+    'Other': {'thi': 1.0, 'wind': 1.0, 'precip': 1.0},
+}
+
+
+def _by_day_of_year(values, doy):
+    """(365 × max years) matrix of one parameter grouped by day of year, NaN-padded"""
+    order = np.lexsort((np.arange(doy.size), doy))
+    sorted_doy = doy[order]
+    group_start = np.searchsorted(sorted_doy, sorted_doy, side='left')
+    position = np.arange(sorted_doy.size) - group_start
+    table = np.full((365, position.max() + 1), np.nan, dtype=np.float32)
+    table[sorted_doy, position] = values[order]
+    return table
+
+
+def day_of_year_table(series, window=DEFAULT_WINDOW_DAYS):
+    """Percentiles and exceedance probabilities of THI, wind and precipitation for all 365 days
+
+    Cached on the series object, so repeated scans of the same cell are free.
+    """
+    cache = series.__dict__.setdefault('_doy_tables', {})
+    if window in cache:
+        return cache[window]
+
+    table = {}
+    for dimension, (parameter, thresholds) in RISK_DIMENSIONS.items():
+        grouped = _by_day_of_year(series[parameter], series.doy)
+        # Every day of year sees the samples of its ±window neighbours
+        sample = np.concatenate([np.roll(grouped, -offset, axis=0) for offset in range(-window, window + 1)], axis=1)
+        valid = ~np.isnan(sample)
+        counts = np.maximum(valid.sum(axis=1), 1)
+        with np.errstate(invalid='ignore'):
+            p50, p90 = np.nanpercentile(sample, [50, 90], axis=1)
+            table[f'{dimension}_p50'] = p50
+            table[f'{dimension}_p90'] = p90
+            table[f'p_{dimension}_medium'] = (sample >= thresholds[0]).sum(axis=1) / counts
+            table[f'p_{dimension}_high'] = (sample >= thresholds[1]).sum(axis=1) / counts
+    cache[window] = table
+    return table
+
+
+def score_date_window(series, start_date, end_date, event_type='Other', window=DEFAULT_WINDOW_DAYS):
+    """Score every day between start_date and end_date (inclusive) for an event type"""
+    n_days = (end_date - start_date).days + 1
+    if n_days < 1:
+        raise ValueError("end_date must not be before start_date")
+    if n_days > MAX_WINDOW_DAYS:
+        raise ValueError(f"date window is limited to {MAX_WINDOW_DAYS} days")
+
+    table = day_of_year_table(series, window)
+    dates = np.datetime64(start_date, 'D') + np.arange(n_days)
+    doy = day_of_year(dates)
+    weights = EVENT_WEIGHTS.get(event_type, EVENT_WEIGHTS['Other'])
+
+    df = pd.DataFrame({'date': [start_date + timedelta(days=i) for i in range(n_days)]})
+    for column, values in table.items():
+        df[column] = values[doy]
+
+    # Chance of at least 'medium' counts once, chance of 'high' counts twice
+    combined = np.zeros(n_days)
+    for dimension in RISK_DIMENSIONS:
+        combined += weights[dimension] * (df[f'p_{dimension}_medium'].to_numpy() + df[f'p_{dimension}_high'].to_numpy())
+    df['combined_risk'] = combined / (2 * sum(weights.values()))
+
+    typical = np.maximum.reduce([
+        thi_risk_codes(df['thi_p50']),
+        wind_risk_codes(df['wind_p50']),
+        precipitation_risk_codes(df['precip_p50']),
+    ])
+    df['risk_level'] = risk_labels(typical)
+    return df
+
+
+def rank_event_days(series, start_date, end_date, event_type='Other', top_n=DEFAULT_TOP_N,
+                    window=DEFAULT_WINDOW_DAYS):
+    """Top-N days of the window ordered by combined risk (lowest first)"""
+    return _rank(score_date_window(series, start_date, end_date, event_type, window), top_n)
+
+
+def _rank(scores, top_n):
+    ranked = scores.sort_values(['combined_risk', 'precip_p50', 'date'], kind='stable').head(top_n)
+    ranked = ranked.reset_index(drop=True)
+    ranked.insert(0, 'rank', np.arange(1, len(ranked) + 1))
+    return ranked
+
+
+def find_best_dates(lat, lon, start_date, end_date, event_type, top_n=DEFAULT_TOP_N, today=None, lang='en'):
+    """Rank the days of a planning window for a location; returns (ranked, all scores)
+
+    event_type may be a label in either language. The ranked days carry the
+    titles of the recommendation cards for their typical (median) weather.
+    (None, None) when the climatology series of the location cannot be loaded.
+    """
+    today = today or date.today()
+    series = get_climatology_store().get_series(lat, lon, today.year - HISTORY_YEARS, today.year - 1)
+    if series is None:
+        return None, None
+    canonical = get_canonical_event_type(event_type)
+    scores = score_date_window(series, start_date, end_date, canonical)
+    ranked = _rank(scores, top_n)
+    ranked['recommendations'] = recommendation_titles(
+        thi_risk_levels(ranked['thi_p50']), ranked['wind_p50'], ranked['precip_p50'],
+        event_type=canonical, lang=lang, separator='\n'
+    )
+    return ranked, scores
@@ -0,0 +1,330 @@
+"""Multi-venue PDF report with a paginated table, streamed page by page
+
+    python -m power_weather.bulk_report batch_results.parquet -o report.pdf --charts --workers 4
+
+Input rows are read in page-sized chunks (batch output as CSV, Parquet, Arrow
+or Feather, a DataFrame or any iterable of dicts) and each page is drawn and
+closed before the next chunk is read, so the rows are never held for the whole
+report. reportlab does keep every finished page (chart images included) until
+the file is saved, so a single file's memory grows with the report (about
+46 MB traced at 10,000 rows with charts). --pages-per-file N writes
+report-001.pdf, report-002.pdf, ... instead and stays flat (under 4 MB for
+the same rows with N = 50). Optional per-row risk charts are rendered as
+small PNGs with Pillow, in worker processes when workers > 1, one page ahead
+of the drawing.
+"""
+
+import argparse
+import io
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+from PIL import Image, ImageDraw
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+from power_weather.columnar import EXTENSIONS
+from power_weather.risk import PRECIP_THRESHOLDS, THI_THRESHOLDS, WIND_THRESHOLDS
+
+PAGE_SIZE = landscape(A4)
+MARGIN = 36
+HEADER_HEIGHT = 40
+FOOTER_HEIGHT = 20
+ROW_HEIGHT = 16
+CHART_ROW_HEIGHT = 30
+CHART_SIZE = (120, 36)
+# Vera ships with reportlab and, unlike the built-in Helvetica, covers Turkish letters
+FONT = 'Vera'
+FONT_BOLD = 'VeraBd'
+FONT_SIZE = 8
+PARQUET_BATCH_ROWS = 4096
+
+# (key, header per language, width in points, format)
+TABLE_COLUMNS = [
+    ('venue', {'en': 'Venue', 'tr': 'Mekan'}, 150, '{}'),
+    ('date', {'en': 'Date', 'tr': 'Tarih'}, 62, '{}'),
+    ('event_type', {'en': 'Event', 'tr': 'Etkinlik'}, 80, '{}'),
+    ('risk_level', {'en': 'Risk', 'tr': 'Risk'}, 44, '{}'),
+    ('thi', {'en': 'THI', 'tr': 'THI'}, 36, '{:.1f}'),
+    ('temperature', {'en': 'Temp °C', 'tr': 'Sıc. °C'}, 44, '{:.1f}'),
+    ('precipitation', {'en': 'Precip mm', 'tr': 'Yağış mm'}, 50, '{:.1f}'),
+    ('wind_speed', {'en': 'Wind m/s', 'tr': 'Rüzgar m/s'}, 50, '{:.1f}'),
+    ('confidence', {'en': 'Confidence', 'tr': 'Güven'}, 54, '{}'),
+    ('data_source', {'en': 'Source', 'tr': 'Kaynak'}, 110, '{}'),
+]
+
+RISK_COLORS = {'low': (0, 176, 155), 'medium': (244, 107, 69), 'high': (255, 65, 108)}
+CHART_DIMENSIONS = [('thi', THI_THRESHOLDS), ('precipitation', PRECIP_THRESHOLDS), ('wind_speed', WIND_THRESHOLDS)]
+
+TEXTS = {
+    'en': {'title': "NASA POWER Event Weather Report", 'page': "Page", 'generated': "Generated", 'chart': "THI / precip / wind"},
+    'tr': {'title': "NASA POWER Etkinlik Hava Raporu", 'page': "Sayfa", 'generated': "Oluşturulma", 'chart': "THI / yağış / rüzgar"},
+}
+
+
+def render_risk_chart(values):
+    """PNG bytes of a three-bar chart (THI, precipitation, wind) scaled to their 'high' thresholds
+
+    values is a (thi, precipitation, wind_speed) tuple; NaN bars are left empty.
+    """
+    width, height = CHART_SIZE
+    image = Image.new('RGB', CHART_SIZE, 'white')
+    draw = ImageDraw.Draw(image)
+    bar_height = height // len(CHART_DIMENSIONS)
+    for i, ((_, thresholds), value) in enumerate(zip(CHART_DIMENSIONS, values)):
+        top = i * bar_height + 2
+        bottom = top + bar_height - 4
+        draw.rectangle([0, top, width - 1, bottom], outline=(200, 200, 200))
+        if value is None or np.isnan(value):
+            continue
+        level = 'low' if value < thresholds[0] else 'medium' if value < thresholds[1] else 'high'
+        # The 'high' threshold sits at 3/4 of the bar
+        filled = int(min(max(value / thresholds[1] * 0.75, 0.0), 1.0) * (width - 2))
+        draw.rectangle([1, top + 1, 1 + filled, bottom - 1], fill=RISK_COLORS[level])
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def _chart_values(row):
+    return tuple(float(row.get(key, np.nan)) if row.get(key) is not None else np.nan for key, _ in CHART_DIMENSIONS)
+
+
+def _format_cell(value, fmt):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return '-'
+    if hasattr(value, 'strftime'):
+        return value.strftime('%d.%m.%Y')
+    try:
+        return fmt.format(value)
+    except (ValueError, TypeError):
+        return str(value)
+
+
+def _fit(c, text, width):
+    """Truncate text with an ellipsis so it fits the column width"""
+    if c.stringWidth(text, FONT, FONT_SIZE) <= width:
+        return text
+    while text and c.stringWidth(text + '…', FONT, FONT_SIZE) > width:
+        text = text[:-1]
+    return text + '…'
+
+
+def _table_batches(path):
+    """Record batches of a Parquet / Arrow / Feather file, read one at a time"""
+    fmt = next((name for name, extension in EXTENSIONS.items() if path.endswith(extension)), None)
+    if fmt == 'parquet':
+        yield from pq.ParquetFile(path).iter_batches(batch_size=PARQUET_BATCH_ROWS)
+    else:
+        # Arrow and Feather are both IPC files; memory-mapped, only the batch being read is decoded
+        with pa.memory_map(path) as source:
+            reader = ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                for offset in range(0, batch.num_rows, PARQUET_BATCH_ROWS):
+                    yield batch.slice(offset, PARQUET_BATCH_ROWS)
+
+
+def iter_report_rows(source):
+    """Rows as dicts from a DataFrame, a CSV / Parquet / Arrow / Feather path or an iterable of dicts, read lazily"""
+    if isinstance(source, pd.DataFrame):
+        for record in source.itertuples(index=False):
+            yield record._asdict()
+    elif isinstance(source, str) and source.endswith(tuple(EXTENSIONS.values())):
+        for batch in _table_batches(source):
+            yield from batch.to_pylist()
+    elif isinstance(source, str) and source.endswith('.csv'):
+        for chunk in pd.read_csv(source, chunksize=PARQUET_BATCH_ROWS):
+            if 'date' in chunk:
+                # CSV dates are ISO text; as dates they print like the other inputs (dd.mm.yyyy)
+                chunk['date'] = pd.to_datetime(chunk['date']).dt.date
+            yield from chunk.to_dict('records')
+    elif isinstance(source, str):
+        raise ValueError(f"unsupported results file (expected .csv, {', '.join(EXTENSIONS.values())}): {source}")
+    else:
+        yield from source
+
+
+def part_path(output, number):
+    """report.pdf -> report-001.pdf, the number-th file of a report split with pages_per_file"""
+    root, extension = os.path.splitext(output)
+    return f"{root}-{number:03d}{extension or '.pdf'}"
+
+
+def _register_fonts():
+    for name in (FONT, FONT_BOLD):
+        if name not in pdfmetrics.getRegisteredFontNames():
+            pdfmetrics.registerFont(TTFont(name, f"{name}.ttf"))
+
+
+class BulkReportWriter:
+    """Draws the paginated table onto a reportlab canvas one page at a time"""
+
+    def __init__(self, output, title=None, lang='en', charts=False, pages_per_file=None):
+        _register_fonts()
+        if pages_per_file and not isinstance(output, str):
+            raise ValueError("pages_per_file needs an output path")
+        self.output = output
+        self.pages_per_file = pages_per_file
+        self.lang = lang
+        self.texts = TEXTS.get(lang, TEXTS['en'])
+        self.title = title or self.texts['title']
+        self.charts = charts
+        self.canvas = None
+        self.paths = []
+        self.page_number = 0
+        width, height = PAGE_SIZE
+        self.row_height = CHART_ROW_HEIGHT if charts else ROW_HEIGHT
+        table_height = height - 2 * MARGIN - HEADER_HEIGHT - FOOTER_HEIGHT - ROW_HEIGHT
+        self.rows_per_page = int(table_height // self.row_height)
+        self.columns = TABLE_COLUMNS
+        if charts:
+            self.columns = TABLE_COLUMNS + [('_chart', {'en': self.texts['chart'], 'tr': self.texts['chart']}, CHART_SIZE[0], '')]
+
+    def _draw_frame(self):
+        c = self.canvas
+        width, height = PAGE_SIZE
+        c.setFont(FONT_BOLD, 14)
+        c.drawString(MARGIN, height - MARGIN - 14, self.title)
+        c.setFont(FONT, FONT_SIZE)
+        c.drawRightString(width - MARGIN, height - MARGIN - 14,
+                          f"{self.texts['generated']}: {date.today().strftime('%d.%m.%Y')}")
+        c.drawRightString(width - MARGIN, MARGIN - FOOTER_HEIGHT / 2, f"{self.texts['page']} {self.page_number}")
+
+        y = height - MARGIN - HEADER_HEIGHT
+        c.setFillColorRGB(0.9, 0.9, 0.9)
+        c.rect(MARGIN, y - ROW_HEIGHT, sum(col[2] for col in self.columns), ROW_HEIGHT, stroke=0, fill=1)
+        c.setFillColorRGB(0, 0, 0)
+        c.setFont(FONT_BOLD, FONT_SIZE)
+        x = MARGIN
+        for _, headers, col_width, _ in self.columns:
+            c.drawString(x + 2, y - ROW_HEIGHT + 5, headers.get(self.lang, headers['en']))
+            x += col_width
+        return y - ROW_HEIGHT
+
+    def _open(self):
+        output = self.output
+        if self.pages_per_file:
+            output = part_path(self.output, len(self.paths) + 1)
+            self.paths.append(output)
+        self.canvas = canvas.Canvas(output, pagesize=PAGE_SIZE, pageCompression=1)
+        self.canvas.setTitle(self.title)
+
+    def write_page(self, rows, charts=None):
+        """Draw one page of rows (at most rows_per_page) and close the page
+
+        reportlab keeps every page of a canvas until save(), so with
+        pages_per_file the current file is saved and a new one started every
+        pages_per_file pages, which keeps memory flat however long the report.
+        """
+        if self.canvas is None:
+            self._open()
+        elif self.pages_per_file and self.page_number % self.pages_per_file == 0:
+            self.canvas.save()
+            self._open()
+        c = self.canvas
+        self.page_number += 1
+        y = self._draw_frame()
+        c.setFont(FONT, FONT_SIZE)
+        for i, row in enumerate(rows):
+            y -= self.row_height
+            if i % 2:
+                c.setFillColorRGB(0.97, 0.97, 0.97)
+                c.rect(MARGIN, y, sum(col[2] for col in self.columns), self.row_height, stroke=0, fill=1)
+                c.setFillColorRGB(0, 0, 0)
+            x = MARGIN
+            text_y = y + (self.row_height - FONT_SIZE) / 2 + 1
+            for key, _, col_width, fmt in self.columns:
+                if key == '_chart':
+                    if charts and charts[i]:
+                        c.drawImage(ImageReader(io.BytesIO(charts[i])), x + 2, y + (self.row_height - 24) / 2,
+                                    width=col_width - 4, height=24)
+                else:
+                    c.drawString(x + 2, text_y, _fit(c, _format_cell(row.get(key), fmt), col_width - 4))
+                x += col_width
+        c.showPage()
+
+    def close(self):
+        """Save the (last) file; returns the paths written"""
+        if self.page_number == 0:
+            self.write_page([])
+        self.canvas.save()
+        return self.paths or [self.output]
+
+
+def _pages(rows, rows_per_page):
+    rows = iter(rows)
+    while True:
+        page = list(itertools.islice(rows, rows_per_page))
+        if not page:
+            return
+        yield page
+
+
+def write_bulk_report(source, output, title=None, lang='en', charts=False, workers=1, pages_per_file=None):
+    """Write the multi-venue report to a path or binary file object; returns the page count
+
+    source is anything iter_report_rows accepts. With charts and workers > 1
+    the chart PNGs of the next page render in worker processes while the
+    current page is drawn. pages_per_file splits the report into
+    report-001.pdf, report-002.pdf, ... (page numbers run on across files).
+    """
+    writer = BulkReportWriter(output, title, lang, charts, pages_per_file)
+    pages = _pages(iter_report_rows(source), writer.rows_per_page)
+    if not charts:
+        for page in pages:
+            writer.write_page(page)
+    elif workers and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            def submit(page):
+                return page, executor.map(render_risk_chart, [_chart_values(r) for r in page], chunksize=8)
+
+            pending = None
+            for page in pages:
+                upcoming = submit(page)
+                if pending:
+                    writer.write_page(pending[0], list(pending[1]))
+                pending = upcoming
+            if pending:
+                writer.write_page(pending[0], list(pending[1]))
+    else:
+        for page in pages:
+            writer.write_page(page, [render_risk_chart(_chart_values(r)) for r in page])
+    writer.close()
+    return writer.page_number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-venue PDF report from batch analysis results")
+    parser.add_argument('results', help="batch output (.csv, .parquet, .arrow or .feather)")
+    parser.add_argument('-o', '--output', default='report.pdf')
+    parser.add_argument('--title')
+    parser.add_argument('--lang', choices=['en', 'tr'], default='en')
+    parser.add_argument('--charts', action='store_true', help="add a risk chart to every row")
+    parser.add_argument('--workers', type=int, default=1, help="processes rendering charts")
+    parser.add_argument('--pages-per-file', type=int,
+                        help="split into <output>-001.pdf, ... of this many pages each (keeps memory flat)")
+    args = parser.parse_args(argv)
+
+    started = time.monotonic()
+    pages = write_bulk_report(args.results, args.output, args.title, args.lang, args.charts, args.workers,
+                              args.pages_per_file)
+    files = f"{part_path(args.output, 1)} ..." if args.pages_per_file else args.output
+    print(f"{pages} pages in {time.monotonic() - started:.1f}s -> {files}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
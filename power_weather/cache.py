@@ -0,0 +1,165 @@
+"""Persistent on-disk cache for NASA POWER API responses"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import date, datetime, timedelta
+
+from power_weather.decode import dumps, loads
+from power_weather.grid import grid_cell
+
+# Cache location and size can be overridden from the environment
+DEFAULT_CACHE_DIR = os.environ.get(
+    'POWER_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'power_weather')
+)
+DEFAULT_MAX_BYTES = int(os.environ.get('POWER_CACHE_MAX_MB', '256')) * 1024 * 1024
+
+# POWER keeps revising the last few days, so only those entries expire
+RECENT_DAYS = 7
+RECENT_TTL_SECONDS = 6 * 60 * 60
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value), "%Y%m%d").date()
+
+
+class ResponseCache:
+    """SQLite-backed response cache with LRU eviction and a TTL for recent data"""
+
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES,
+                 recent_days=RECENT_DAYS, recent_ttl=RECENT_TTL_SECONDS):
+        if path is None:
+            path = os.path.join(DEFAULT_CACHE_DIR, 'responses.sqlite3')
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.recent_days = recent_days
+        self.recent_ttl = recent_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                payload BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL,
+                expires REAL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed)")
+
+    @staticmethod
+    def make_key(endpoint, lat, lon, parameters, start, end):
+        """Content address for a request: POWER grid cell, parameter set and range
+
+        Nearby coordinates inside the same grid cell share one entry.
+        """
+        if not isinstance(parameters, str):
+            parameters = ','.join(parameters)
+        parameters = ','.join(sorted(p.strip() for p in parameters.split(',') if p.strip()))
+        raw = "|".join([
+            endpoint,
+            grid_cell(lat, lon).cell_id,
+            parameters,
+            str(start),
+            str(end),
+        ])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return the cached payload for key, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            payload, expires = row
+            if expires is not None and expires < now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return loads(zlib.decompress(payload))
+
+    def set(self, key, value, end_date=None):
+        """Store a payload; ranges touching the last few days get a short TTL"""
+        payload = zlib.compress(dumps(value))
+        now = time.time()
+        expires = None
+        if end_date is not None:
+            cutoff = date.today() - timedelta(days=self.recent_days)
+            if _as_date(end_date) >= cutoff:
+                expires = now + self.recent_ttl
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, payload, size, created, accessed, expires) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now, expires)
+            )
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits under max_bytes"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed ASC").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def stats(self):
+        """Hit/miss counters for this process plus current on-disk usage"""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': entries,
+            'bytes': size,
+            'max_bytes': self.max_bytes
+        }
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Process-wide cache instance shared by all fetchers"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+        return _default_cache
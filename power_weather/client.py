@@ -0,0 +1,119 @@
+"""Shared HTTP client for NASA POWER and Nominatim
+
+One pooled requests.Session per process keeps connections alive between calls.
+Requests are retried on 429/5xx and connection errors with exponential backoff
+and jitter, concurrency is bounded per host and every endpoint has its own
+timeout budget.
+"""
+
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = 'NASAWeatherApp/1.0'
+
+# (connect, read) timeout per attempt and total time budget including retries
+ENDPOINT_TIMEOUTS = {
+    'power_daily': {'timeout': (5, 30), 'budget': 60},
+    'power_climatology': {'timeout': (5, 30), 'budget': 60},
+    'power_series': {'timeout': (5, 90), 'budget': 180},
+    'power_regional': {'timeout': (5, 180), 'budget': 420},
+    'nominatim': {'timeout': (3, 5), 'budget': 8},
+    'default': {'timeout': (5, 30), 'budget': 60},
+}
+
+# Nominatim's usage policy allows a single request at a time
+HOST_CONCURRENCY = {
+    'power.larc.nasa.gov': 8,
+    'nominatim.openstreetmap.org': 1,
+}
+DEFAULT_HOST_CONCURRENCY = 4
+
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+
+
+class HttpClient:
+    """Pooled session with per-host concurrency limits and retrying GETs"""
+
+    def __init__(self, pool_size=16, max_retries=MAX_RETRIES,
+                 backoff_base=BACKOFF_BASE, backoff_cap=BACKOFF_CAP):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': USER_AGENT})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._host_slots = {}
+        self._lock = threading.Lock()
+
+    def _slot(self, host):
+        with self._lock:
+            if host not in self._host_slots:
+                limit = HOST_CONCURRENCY.get(host, DEFAULT_HOST_CONCURRENCY)
+                self._host_slots[host] = threading.BoundedSemaphore(limit)
+            return self._host_slots[host]
+
+    def _backoff(self, attempt, response):
+        """Full-jitter exponential backoff, honouring Retry-After when the server sends it"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_cap)
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def get(self, url, params=None, endpoint='default', headers=None):
+        """GET with retries; returns the last response or raises the last connection error"""
+        config = ENDPOINT_TIMEOUTS.get(endpoint, ENDPOINT_TIMEOUTS['default'])
+        deadline = time.monotonic() + config['budget']
+        slot = self._slot(urlsplit(url).hostname)
+        response = None
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                with slot:
+                    response = self.session.get(url, params=params, headers=headers, timeout=config['timeout'])
+            except (requests.ConnectionError, requests.Timeout) as e:
+                last_error = e
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+
+            if attempt == self.max_retries:
+                break
+            delay = self._backoff(attempt, response)
+            if time.monotonic() + delay >= deadline:
+                break
+            time.sleep(delay)
+
+        if response is not None:
+            return response
+        raise last_error
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Process-wide client so every fetch reuses the same connection pool"""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HttpClient()
+        return _default_client
+
+
+def http_get(url, params=None, endpoint='default', headers=None):
+    """Shortcut for get_http_client().get(...)"""
+    return get_http_client().get(url, params=params, endpoint=endpoint, headers=headers)
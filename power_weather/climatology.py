@@ -0,0 +1,293 @@
+"""Local day-of-year climatology built from multi-year POWER daily series
+
+The full daily series for a POWER grid cell is downloaded once, stored as
+float32 day arrays in the shared memory-mapped archive (power_weather.archive)
+and every later date in that cell is answered locally.
+"""
+
+import io
+import os
+import threading
+from collections import OrderedDict
+from datetime import date
+
+import numpy as np
+
+from power_weather.archive import get_series_archive
+from power_weather.cache import DEFAULT_CACHE_DIR
+from power_weather.client import http_get
+from power_weather.decode import FETCH_FORMAT, decode_power_response, power_arrays
+from power_weather.grid import grid_cell
+from power_weather.risk import PRECIP_THRESHOLDS, THI_THRESHOLDS, WIND_THRESHOLDS, calculate_thi
+
+DAILY_URL = "https://power.larc.nasa.gov/api/temporal/daily/point"
+CLIMATOLOGY_PARAMETERS = ('PRECTOTCORR', 'T2M', 'RH2M', 'WS2M')
+DERIVED_PARAMETERS = ('THI',)
+
+DEFAULT_WINDOW_DAYS = 7
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+
+# Exceedance thresholds follow the low/medium/high boundaries of the risk levels
+EXCEEDANCE_THRESHOLDS = {
+    'PRECTOTCORR': PRECIP_THRESHOLDS,
+    'WS2M': WIND_THRESHOLDS,
+    'THI': THI_THRESHOLDS,
+}
+
+# Cumulative day counts of a non-leap year, used to map dates onto 0..364
+_MONTH_OFFSETS = np.array([0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334])
+
+
+def day_of_year(dates):
+    """0-based day of year on a 365-day calendar (29 Feb shares 28 Feb's slot)"""
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    month_start = dates.astype('datetime64[M]')
+    months = month_start.astype(np.int64) % 12
+    days = (dates - month_start.astype('datetime64[D]')).astype(np.int64)
+    days = np.where((months == 1) & (days == 28), 27, days)
+    return _MONTH_OFFSETS[months] + days
+
+
+def window_mask(doy, target_doy, window):
+    """Boolean mask of days within ±window days of target_doy, wrapping the year end"""
+    distance = np.abs(doy - target_doy)
+    distance = np.minimum(distance, 365 - distance)
+    return distance <= window
+
+
+class DailySeries:
+    """Multi-year daily values for one grid cell as a (parameter × day) float32 matrix"""
+
+    def __init__(self, parameters, values, start):
+        self.parameters = list(parameters)
+        self.values = np.asarray(values, dtype=np.float32)
+        self.start = np.datetime64(start, 'D')
+        self.dates = self.start + np.arange(self.values.shape[1])
+        self.doy = day_of_year(self.dates)
+        self._index = {name: i for i, name in enumerate(self.parameters)}
+
+    def __getitem__(self, name):
+        return self.values[self._index[name]]
+
+    def __contains__(self, name):
+        return name in self._index
+
+    @classmethod
+    def from_power_json(cls, data, parameters=CLIMATOLOGY_PARAMETERS):
+        """Build a series from a POWER daily point response (dict or raw bytes), turning -999 into NaN"""
+        dates, columns = power_arrays(data, parameters)
+        return cls.from_arrays(dates, columns, parameters)
+
+    @classmethod
+    def from_arrays(cls, dates, columns, parameters=CLIMATOLOGY_PARAMETERS):
+        """Build a series from decoded dates and per-parameter arrays, leaving missing days as NaN"""
+        start = dates.min()
+        n_days = int((dates.max() - start).astype(np.int64)) + 1
+        offsets = (dates - start).astype(np.int64)
+        values = np.full((len(parameters), n_days), np.nan, dtype=np.float32)
+        for row, name in enumerate(parameters):
+            if name in columns:
+                values[row, offsets] = columns[name]
+        return cls.with_derived(parameters, values, start)
+
+    @classmethod
+    def with_derived(cls, parameters, values, start):
+        """Append derived rows (THI) so they get the same statistics as raw parameters"""
+        parameters = [p for p in parameters if p not in DERIVED_PARAMETERS]
+        values = np.asarray(values, dtype=np.float32)[:len(parameters)]
+        index = {name: i for i, name in enumerate(parameters)}
+        thi = calculate_thi(values[index['T2M']], values[index['RH2M']])
+        return cls(parameters + ['THI'], np.vstack([values, thi[np.newaxis, :]]), start)
+
+    def to_npz(self, path):
+        buffer = io.BytesIO()
+        raw_rows = [i for i, name in enumerate(self.parameters) if name not in DERIVED_PARAMETERS]
+        np.savez_compressed(
+            buffer,
+            parameters=np.array([self.parameters[i] for i in raw_rows]),
+            values=self.values[raw_rows],
+            start=np.array(str(self.start))
+        )
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(buffer.getvalue())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def from_npz(cls, path):
+        with np.load(path) as archive:
+            return cls.with_derived(
+                archive['parameters'].tolist(),
+                archive['values'],
+                str(archive['start'])
+            )
+
+
+def day_of_year_climatology(series, target_date, window=DEFAULT_WINDOW_DAYS,
+                            percentiles=DEFAULT_PERCENTILES):
+    """Mean, percentiles and exceedance probabilities for every parameter around target_date"""
+    target_doy = int(day_of_year(np.datetime64(target_date, 'D')))
+    mask = window_mask(series.doy, target_doy, window)
+    sample = series.values[:, mask]
+    valid = ~np.isnan(sample)
+    counts = valid.sum(axis=1)
+
+    with np.errstate(invalid='ignore'):
+        means = np.nanmean(sample, axis=1) if sample.size else np.full(len(series.parameters), np.nan)
+        pct = np.nanpercentile(sample, percentiles, axis=1) if sample.size else None
+
+    stats = {}
+    for row, name in enumerate(series.parameters):
+        if counts[row] == 0:
+            stats[name] = None
+            continue
+        entry = {
+            'mean': float(means[row]),
+            'percentiles': {p: float(pct[i, row]) for i, p in enumerate(percentiles)},
+            'samples': int(counts[row])
+        }
+        if name in EXCEEDANCE_THRESHOLDS:
+            values = sample[row][valid[row]]
+            entry['exceedance'] = {
+                threshold: float(np.count_nonzero(values >= threshold) / values.size)
+                for threshold in EXCEEDANCE_THRESHOLDS[name]
+            }
+        stats[name] = entry
+    return {
+        'window_days': window,
+        'years': f"{str(series.dates[0])[:4]}-{str(series.dates[-1])[:4]}",
+        'samples': int(mask.sum()),
+        'parameters': stats
+    }
+
+
+def day_of_year_means(series, target_dates, window=DEFAULT_WINDOW_DAYS):
+    """Windowed day-of-year means for several target dates at once
+
+    Returns a (parameter × target date) array, NaN where a window has no data.
+    """
+    target_doy = day_of_year(np.asarray(target_dates, dtype='datetime64[D]'))
+    masks = window_mask(series.doy[np.newaxis, :], target_doy[:, np.newaxis], window).astype(np.float32)
+    valid = ~np.isnan(series.values)
+    sums = np.where(valid, series.values, 0.0).astype(np.float32) @ masks.T
+    counts = valid.astype(np.float32) @ masks.T
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def fetch_daily_series(lat, lon, start_year, end_year, parameters=CLIMATOLOGY_PARAMETERS, fmt=None):
+    """Download a full multi-year daily series in a single POWER request
+
+    fmt is 'JSON' or 'CSV' (default POWER_FETCH_FORMAT); either way the body is
+    decoded straight into per-parameter arrays.
+    """
+    fmt = (fmt or FETCH_FORMAT).upper()
+    cell = grid_cell(lat, lon)
+    params = {
+        'parameters': ','.join(parameters),
+        'community': 'RE',
+        'longitude': cell.lon,
+        'latitude': cell.lat,
+        'start': f"{start_year}0101",
+        'end': f"{end_year}1231",
+        'format': fmt
+    }
+    response = http_get(DAILY_URL, params=params, endpoint='power_series')
+    if response.status_code != 200:
+        return None
+    try:
+        dates, columns = decode_power_response(response, fmt, parameters)
+    except (KeyError, TypeError, ValueError):
+        return None
+    if len(dates) == 0:
+        return None
+    return DailySeries.from_arrays(dates, columns, parameters)
+
+
+class ClimatologyStore:
+    """Daily series per grid cell from the shared on-disk archive, with an in-memory LRU in front
+
+    Series are read from the memory-mapped SeriesArchive; cells that are not
+    archived yet come from an older .npz file of the store or are downloaded,
+    and are archived for every later process.
+    """
+
+    def __init__(self, directory=None, max_in_memory=64, archive=None):
+        self.directory = directory or os.path.join(DEFAULT_CACHE_DIR, 'climatology')
+        os.makedirs(self.directory, exist_ok=True)
+        self.archive = archive or get_series_archive()
+        self.max_in_memory = max_in_memory
+        self._series = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def series_key(self, lat, lon, start_year, end_year):
+        return f"{grid_cell(lat, lon).cell_id}_{start_year}_{end_year}"
+
+    def _remember(self, key, series):
+        with self._lock:
+            self._series[key] = series
+            self._series.move_to_end(key)
+            while len(self._series) > self.max_in_memory:
+                self._series.popitem(last=False)
+
+    def _from_archive(self, cell_id, start_year, end_year):
+        start, end = date(start_year, 1, 1), date(end_year, 12, 31)
+        columns = self.archive.read_columns(cell_id, CLIMATOLOGY_PARAMETERS, start, end)
+        if columns is None:
+            return None
+        return DailySeries.with_derived(
+            CLIMATOLOGY_PARAMETERS, np.vstack([columns[name] for name in CLIMATOLOGY_PARAMETERS]), start
+        )
+
+    def _to_archive(self, cell_id, series):
+        raw = [name for name in series.parameters if name not in DERIVED_PARAMETERS]
+        self.archive.write(cell_id, series.start, {name: series[name] for name in raw})
+
+    def get_series(self, lat, lon, start_year, end_year):
+        """Return the DailySeries for a grid cell, downloading it only the first time"""
+        key = self.series_key(lat, lon, start_year, end_year)
+        with self._lock:
+            if key in self._series:
+                self._series.move_to_end(key)
+                return self._series[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # One download per cell even when several sessions ask at once
+        with key_lock:
+            with self._lock:
+                if key in self._series:
+                    return self._series[key]
+            cell_id = grid_cell(lat, lon).cell_id
+            series = self._from_archive(cell_id, start_year, end_year)
+            if series is None:
+                path = os.path.join(self.directory, f"{key}.npz")
+                if os.path.exists(path):
+                    series = DailySeries.from_npz(path)
+                else:
+                    series = fetch_daily_series(lat, lon, start_year, end_year)
+                    if series is None:
+                        return None
+                self._to_archive(cell_id, series)
+            self._remember(key, series)
+            return series
+
+    def climatology(self, lat, lon, target_date, start_year, end_year,
+                    window=DEFAULT_WINDOW_DAYS, percentiles=DEFAULT_PERCENTILES):
+        series = self.get_series(lat, lon, start_year, end_year)
+        if series is None:
+            return None
+        return day_of_year_climatology(series, target_date, window, percentiles)
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_climatology_store():
+    """Process-wide climatology store shared by all sessions"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ClimatologyStore()
+        return _default_store
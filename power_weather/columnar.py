@@ -0,0 +1,255 @@
+"""Typed columnar exports (Parquet, Arrow IPC, Feather) of analysis results and daily series
+
+    python -m power_weather.columnar -o series/ --format parquet   # every archived cell
+
+Columns keep their types instead of going through CSV text: dates are date32,
+measurements float32/float64 and low-cardinality labels dictionary-encoded.
+Daily series are written as a dataset partitioned by year (hive layout,
+year=2024/...), one row per cell and day with a column per parameter, so a
+reader can load a few years of many cells without touching the rest.
+"""
+
+import argparse
+import io
+import sys
+import time
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+from power_weather.archive import SeriesArchive, get_series_archive
+from power_weather.climatology import CLIMATOLOGY_PARAMETERS, DailySeries
+from power_weather.grid import cell_from_id
+
+FORMATS = ('parquet', 'arrow', 'feather')
+EXTENSIONS = {'parquet': '.parquet', 'arrow': '.arrow', 'feather': '.feather'}
+COMPRESSION = 'zstd'
+
+_label = pa.dictionary(pa.int8(), pa.string())
+
+RESULT_SCHEMA = pa.schema([
+    ('venue', pa.string()),
+    ('lat', pa.float64()),
+    ('lon', pa.float64()),
+    ('cell_id', pa.string()),
+    ('date', pa.date32()),
+    ('event_type', _label),
+    ('status', _label),
+    ('risk_level', _label),
+    ('thi', pa.float64()),
+    ('temperature', pa.float64()),
+    ('precipitation', pa.float64()),
+    ('wind_speed', pa.float64()),
+    ('wind_risk', _label),
+    ('precip_risk', _label),
+    ('confidence', _label),
+    ('data_source', pa.string()),
+    ('historical_period', pa.string()),
+    ('recommendations', pa.string()),
+    ('messages', pa.string()),
+])
+
+ANALYSIS_SCHEMA = pa.schema([
+    ('date', pa.date32()),
+    ('selected', pa.bool_()),
+    ('precipitation', pa.float64()),
+    ('temperature', pa.float64()),
+    ('rh', pa.float64()),
+    ('wind_speed', pa.float64()),
+    ('thi', pa.float64()),
+    ('risk_level', _label),
+    ('accuracy', pa.string()),
+])
+
+SERIES_KEY_FIELDS = [
+    ('cell_id', pa.string()),
+    ('lat', pa.float32()),
+    ('lon', pa.float32()),
+    ('date', pa.date32()),
+    ('year', pa.int16()),
+]
+YEAR_PARTITIONING = ds.partitioning(pa.schema([('year', pa.int16())]), flavor='hive')
+
+
+def series_schema(parameters):
+    return pa.schema(SERIES_KEY_FIELDS + [(name, pa.float32()) for name in parameters])
+
+
+def format_from_path(path, fmt=None):
+    """Explicit fmt, else the one matching the file extension (Parquet by default)"""
+    if fmt:
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown format: {fmt}")
+        return fmt
+    for name, extension in EXTENSIONS.items():
+        if str(path).endswith(extension):
+            return name
+    return 'parquet'
+
+
+def write_table(table, path_or_buffer, fmt='parquet'):
+    """Write one table; 'arrow' is the uncompressed IPC file format, 'feather' the compressed one"""
+    if fmt == 'parquet':
+        pq.write_table(table, path_or_buffer, compression=COMPRESSION)
+    elif fmt == 'arrow':
+        feather.write_feather(table, path_or_buffer, compression='uncompressed')
+    elif fmt == 'feather':
+        feather.write_feather(table, path_or_buffer, compression=COMPRESSION)
+    else:
+        raise ValueError(f"unknown format: {fmt}")
+
+
+def read_table(path_or_buffer, fmt='parquet'):
+    if fmt == 'parquet':
+        return pq.read_table(path_or_buffer)
+    if fmt in ('arrow', 'feather'):
+        return feather.read_table(path_or_buffer)
+    raise ValueError(f"unknown format: {fmt}")
+
+
+def table_bytes(table, fmt='parquet'):
+    buffer = io.BytesIO()
+    write_table(table, buffer, fmt)
+    return buffer.getvalue()
+
+
+def frame_bytes(frame, fmt='parquet'):
+    """Any DataFrame (index dropped) as file bytes in a columnar format"""
+    return table_bytes(pa.Table.from_pandas(frame, preserve_index=False), fmt)
+
+
+def results_table(results):
+    """Batch results DataFrame as a table with RESULT_SCHEMA (missing columns become nulls)"""
+    results = results.reindex(columns=RESULT_SCHEMA.names)
+    columns = []
+    for field in RESULT_SCHEMA:
+        values = results[field.name]
+        if not pa.types.is_floating(field.type):
+            # Columns that are all NaN (every row failed) come back as floats
+            values = values.astype(object).where(values.notna(), None)
+        if pa.types.is_dictionary(field.type):
+            columns.append(pa.array(values, type=pa.string()).dictionary_encode().cast(field.type))
+        else:
+            columns.append(pa.array(values, type=field.type, from_pandas=True))
+    return pa.Table.from_arrays(columns, schema=RESULT_SCHEMA)
+
+
+def analysis_table(results, alt_dates):
+    """One analysis result and its nearby dates in date order, the selected date flagged"""
+    rows = [{**alt, 'selected': alt['date'] == results['selected_date']} for alt in alt_dates]
+    selected = next((row for row in rows if row['selected']), None)
+    if selected is None:
+        selected = {'date': results['selected_date'], 'selected': True}
+        rows.append(selected)
+    # Values the strip already has (e.g. the risk code) win over the localized result
+    for key in ANALYSIS_SCHEMA.names:
+        if key in results:
+            selected.setdefault(key, results[key])
+    rows.sort(key=lambda row: row['date'])
+    return pa.Table.from_pylist(rows, schema=ANALYSIS_SCHEMA)
+
+
+def generate_analysis_export(results, alt_dates, fmt='parquet'):
+    return table_bytes(analysis_table(results, alt_dates), fmt)
+
+
+def series_batch(series, cell_id):
+    """One cell's DailySeries as a record batch (one row per day)"""
+    cell = cell_from_id(cell_id)
+    n_days = len(series.dates)
+    years = series.dates.astype('datetime64[Y]').astype(np.int64) + 1970
+    columns = [
+        pa.array([cell_id] * n_days, type=pa.string()),
+        pa.array(np.full(n_days, cell.lat, dtype=np.float32)),
+        pa.array(np.full(n_days, cell.lon, dtype=np.float32)),
+        pa.array(series.dates, type=pa.date32()),
+        pa.array(years.astype(np.int16)),
+    ]
+    columns += [pa.array(series[name], from_pandas=True) for name in series.parameters]
+    return pa.RecordBatch.from_arrays(columns, schema=series_schema(series.parameters))
+
+
+def _dataset_format(fmt):
+    if fmt == 'parquet':
+        file_format = ds.ParquetFileFormat()
+        return file_format, file_format.make_write_options(compression=COMPRESSION)
+    if fmt in ('arrow', 'feather'):
+        file_format = ds.IpcFileFormat()
+        return file_format, file_format.make_write_options(compression=None if fmt == 'arrow' else COMPRESSION)
+    raise ValueError(f"unknown format: {fmt}")
+
+
+def write_series_dataset(cells, directory, fmt='parquet'):
+    """Write (cell_id, DailySeries) pairs as a year-partitioned dataset; returns the row count
+
+    One cell is converted and written at a time. Files are named after the
+    cell (year=2024/r260c341-0.parquet), so exporting a cell again replaces
+    its files instead of adding duplicate rows, while other cells already in
+    the directory are kept: a directory can be filled by several runs.
+    """
+    file_format, options = _dataset_format(fmt)
+    schema = None
+    written = 0
+    for cell_id, series in cells:
+        schema = schema or series_schema(series.parameters)
+        batch = series_batch(series, cell_id)
+        ds.write_dataset(
+            batch, directory, schema=schema, format=file_format, file_options=options,
+            partitioning=YEAR_PARTITIONING, basename_template=f"{cell_id}-{{i}}{EXTENSIONS[fmt]}",
+            existing_data_behavior='overwrite_or_ignore'
+        )
+        written += batch.num_rows
+    return written
+
+
+def read_series_dataset(directory, fmt='parquet', cell_ids=None, start=None, end=None, columns=None):
+    """Load a series dataset as a table, reading only the years and cells asked for
+
+    start / end are dates (inclusive); the year bounds prune whole partitions.
+    """
+    file_format, _ = _dataset_format(fmt)
+    dataset = ds.dataset(directory, format=file_format, partitioning=YEAR_PARTITIONING)
+    condition = None
+    bounds = []
+    if start is not None:
+        bounds += [ds.field('year') >= start.year, ds.field('date') >= pa.scalar(start, pa.date32())]
+    if end is not None:
+        bounds += [ds.field('year') <= end.year, ds.field('date') <= pa.scalar(end, pa.date32())]
+    if cell_ids is not None:
+        bounds.append(ds.field('cell_id').isin(list(cell_ids)))
+    for bound in bounds:
+        condition = bound if condition is None else condition & bound
+    table = dataset.to_table(columns=columns, filter=condition)
+    return table.sort_by([('cell_id', 'ascending'), ('date', 'ascending')]) if 'date' in table.column_names else table
+
+
+def iter_store_series(archive=None, parameters=CLIMATOLOGY_PARAMETERS):
+    """(cell_id, DailySeries) over the archived extent of every cell in the series archive"""
+    archive = archive or get_series_archive()
+    for cell_id in archive.cells():
+        extent = archive.extent(cell_id, parameters)
+        if extent is None:
+            continue
+        start, end = extent
+        values = np.vstack([archive.read_filled(cell_id, name, start, end) for name in parameters])
+        yield cell_id, DailySeries.with_derived(parameters, values, start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the cached daily series of every grid cell as a columnar dataset")
+    parser.add_argument('-o', '--output', default='power_series', help="dataset directory")
+    parser.add_argument('--format', choices=FORMATS, default='parquet')
+    parser.add_argument('--archive', help="series archive directory (default: POWER_ARCHIVE_DIR)")
+    args = parser.parse_args(argv)
+
+    started = time.monotonic()
+    rows = write_series_dataset(iter_store_series(SeriesArchive(args.archive) if args.archive else None), args.output, args.format)
+    print(f"{rows} rows in {time.monotonic() - started:.1f}s -> {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""Server-side downsampling of long daily series for charts
+
+A chart never needs more points per trace than it has pixels, so long ranges
+are reduced to about MAX_POINTS before they are sent to the browser:
+
+- minmax keeps each bucket's minimum and maximum, so no extreme is ever lost;
+  fully vectorized (about 1 ms for 40 years), the default;
+- lttb (Largest-Triangle-Three-Buckets) keeps the points that shape the line
+  visually. Each bucket's pick depends on the previous one, so it keeps a
+  Python loop over the buckets (about 25 ms per trace) and is opt-in.
+
+Both return sorted indices into the input, so the caller picks the same rows
+from every column. Ranges short enough to draw in full are returned untouched.
+"""
+
+import numpy as np
+
+MAX_POINTS = 2000
+METHODS = ('minmax', 'lttb')
+
+
+def lttb(x, y, n_out):
+    """Indices of n_out points chosen by Largest-Triangle-Three-Buckets (first and last always kept)
+
+    Everything that does not depend on the previously selected point (bucket
+    bounds, next-bucket averages, per-candidate terms of the triangle area) is
+    computed for all buckets at once; the sequential pass is one small
+    vectorized argmax per bucket, so the cost hardly grows with the input.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    # Relative to the first point so the running sums keep their precision
+    x = x - x[0]
+    # n_out - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+    next_ends = np.append(edges[2:], n)
+    sum_x = np.concatenate([[0.0], np.cumsum(x)])
+    sum_y = np.concatenate([[0.0], np.cumsum(y)])
+    avg_x = ((sum_x[next_ends] - sum_x[ends]) / (next_ends - ends))[:, np.newaxis]
+    avg_y = ((sum_y[next_ends] - sum_y[ends]) / (next_ends - ends))[:, np.newaxis]
+    # Candidates as a (bucket × width) matrix; short buckets repeat their last point
+    width = int((ends - starts).max())
+    candidates = np.minimum(starts[:, np.newaxis] + np.arange(width), ends[:, np.newaxis] - 1)
+    cx, cy = x[candidates], y[candidates]
+    # Twice the triangle area is |x_a * dy - y_a * dx + cross| for the anchor point a
+    dy, dx, cross = cy - avg_y, cx - avg_x, cx * avg_y - avg_x * cy
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        a = starts[i] + int(np.abs(x[a] * dy[i] - y[a] * dx[i] + cross[i]).argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def minmax(y, n_out):
+    """Indices of the minimum and maximum of n_out // 2 equal buckets, in order"""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    n_buckets = n_out // 2
+    if n_out >= n or n_buckets < 1:
+        return np.arange(n)
+    size = -(-n // n_buckets)
+    padded = np.pad(y, (0, size * n_buckets - n), mode='edge').reshape(n_buckets, size)
+    offsets = np.arange(n_buckets) * size
+    lows = np.minimum(offsets + padded.argmin(axis=1), n - 1)
+    highs = np.minimum(offsets + padded.argmax(axis=1), n - 1)
+    # Buckets are in order, so sorting each (low, high) pair sorts them all; no np.unique needed
+    index = np.sort(np.stack([lows, highs], axis=1), axis=1).ravel()
+    return index[np.concatenate(([True], index[1:] != index[:-1]))]
+
+
+def downsample(x, y, max_points=MAX_POINTS, method='minmax'):
+    """(x, y) reduced to at most max_points, NaNs dropped; unchanged when already small enough
+
+    x may be dates (datetime64) or numbers.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    valid = ~np.isnan(y)
+    x, y = x[valid], y[valid]
+    if len(y) <= max_points:
+        return x, y
+    if method == 'lttb':
+        index = lttb(x.astype('datetime64[s]').astype(np.int64) if np.issubdtype(x.dtype, np.datetime64) else x,
+                     y, max_points)
+    elif method == 'minmax':
+        index = minmax(y, max_points)
+    else:
+        raise ValueError(f"unknown method: {method}")
+    return x[index], y[index]
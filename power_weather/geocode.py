@@ -0,0 +1,209 @@
+"""Reverse geocoding of coordinates to place names
+
+Lookups are answered offline from a bundled gazetteer of populated places
+(GeoNames cities1000 with the UTF-8 place names, ~155k places, CC BY 4.0)
+indexed in 1° buckets, so a lookup only measures distances to the handful of
+places around the point.
+Nominatim is used only when asked for (online=True or POWER_GEOCODE_ONLINE=1)
+and no local place is close enough. Resolved names are kept in a bounded LRU
+shared by all sessions of the process; failed lookups are not kept, so they
+are retried. get_city_name_nowait lets a page render right away and pick the
+name up on a later rerun.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from power_weather.client import http_get
+
+NOMINATIM_REVERSE_URL = "https://nominatim.openstreetmap.org/reverse"
+GAZETTEER_PATH = os.path.join(os.path.dirname(__file__), 'data', 'places.csv.gz')
+
+# Points farther than this from every gazetteer place (open sea, deserts) have no local name
+MAX_PLACE_DISTANCE_KM = 50.0
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.2
+ONLINE_FALLBACK = os.environ.get('POWER_GEOCODE_ONLINE', '') not in ('', '0')
+MEMO_SIZE = 4096
+
+
+def format_coordinates(lat, lon):
+    return f"{lat:.2f}, {lon:.2f}"
+
+
+def _bucket(lat_index, lon_index):
+    return lat_index * 360 + lon_index % 360
+
+
+class PlaceIndex:
+    """Nearest populated place lookup over 1° × 1° buckets of the gazetteer"""
+
+    def __init__(self, path=GAZETTEER_PATH):
+        places = pd.read_csv(path, keep_default_na=False, dtype={'name': str, 'admin1': str, 'cc': str})
+        self.lat = places['lat'].to_numpy(dtype=np.float64)
+        self.lon = places['lon'].to_numpy(dtype=np.float64)
+        self.labels = [
+            ', '.join(part for part in (name, admin1 if admin1 != name else '', cc) if part)
+            for name, admin1, cc in zip(places['name'], places['admin1'], places['cc'])
+        ]
+        buckets = _bucket(np.floor(self.lat).astype(np.int64) + 90, np.floor(self.lon).astype(np.int64) + 180)
+        self._order = np.argsort(buckets, kind='stable')
+        self._buckets = buckets[self._order]
+
+    def __len__(self):
+        return len(self.labels)
+
+    def _candidates(self, lat, lon, max_km):
+        lat_span = int(np.ceil(max_km / KM_PER_DEGREE))
+        cos_lat = max(np.cos(np.radians(min(abs(lat) + lat_span, 90.0))), 1e-6)
+        lon_span = min(int(np.ceil(max_km / (KM_PER_DEGREE * cos_lat))), 180)
+        lat_index = int(np.floor(lat)) + 90
+        lon_index = int(np.floor(lon)) + 180
+        keys = [
+            _bucket(i, j)
+            for i in range(max(lat_index - lat_span, 0), min(lat_index + lat_span, 179) + 1)
+            for j in range(lon_index - lon_span, lon_index + lon_span + 1)
+        ]
+        keys = np.unique(keys)
+        starts = np.searchsorted(self._buckets, keys, side='left')
+        ends = np.searchsorted(self._buckets, keys, side='right')
+        if not (ends > starts).any():
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([self._order[s:e] for s, e in zip(starts, ends) if e > s])
+
+    def nearest(self, lat, lon, max_km=MAX_PLACE_DISTANCE_KM):
+        """(label, distance_km) of the closest place within max_km, or None"""
+        candidates = self._candidates(lat, lon, max_km)
+        if candidates.size == 0:
+            return None
+        lat1, lon1 = np.radians(lat), np.radians(lon)
+        lat2, lon2 = np.radians(self.lat[candidates]), np.radians(self.lon[candidates])
+        a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        distances = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+        best = int(np.argmin(distances))
+        if distances[best] > max_km:
+            return None
+        return self.labels[candidates[best]], float(distances[best])
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_place_index():
+    """Process-wide gazetteer index, loaded on first use"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = PlaceIndex()
+    return _index
+
+
+def get_nominatim_name(lat, lon):
+    """Display name from Nominatim, or None"""
+    try:
+        response = http_get(NOMINATIM_REVERSE_URL, params={'lat': lat, 'lon': lon, 'format': 'json'}, endpoint='nominatim')
+        if response.status_code == 200:
+            return response.json().get('display_name')
+    except Exception:
+        pass
+    return None
+
+
+def _lookup(lat, lon, online):
+    """(name or None, whether the answer may be cached)
+
+    Only a found name or the loaded index's "no place within range" is
+    final; a failed index load or Nominatim request is retried next time.
+    """
+    try:
+        place = get_place_index().nearest(lat, lon)
+        indexed = True
+    except Exception:
+        place, indexed = None, False
+    if place is not None:
+        return place[0], True
+    if online:
+        name = get_nominatim_name(lat, lon)
+        return name, name is not None
+    return None, indexed
+
+
+class PlaceNameCache:
+    """Bounded LRU of resolved place names, shared across sessions"""
+
+    def __init__(self, max_entries=MEMO_SIZE):
+        self.max_entries = max_entries
+        self._names = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='power-geocode')
+
+    @staticmethod
+    def make_key(lat, lon, online):
+        # ~10 m resolution is plenty for a place name and keeps the cache effective
+        return round(float(lat), 4), round(float(lon), 4), bool(online)
+
+    def peek(self, key):
+        """Cached name without resolving; None if the key was never resolved"""
+        with self._lock:
+            if key in self._names:
+                self._names.move_to_end(key)
+                return self._names[key]
+        return None
+
+    def resolve(self, key):
+        """Place name for a key, '' when there is none (or the lookup failed)"""
+        name = self.peek(key)
+        if name is None:
+            name, final = _lookup(*key)
+            name = name or ''
+            if final:
+                with self._lock:
+                    self._names[key] = name
+                    self._names.move_to_end(key)
+                    while len(self._names) > self.max_entries:
+                        self._names.popitem(last=False)
+        return name
+
+    def resolve_later(self, key):
+        """Resolve in the background (at most once at a time per key)"""
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None or future.done():
+                future = self._executor.submit(self.resolve, key)
+                self._pending[key] = future
+                future.add_done_callback(lambda done, key=key: self._forget(key, done))
+        return future
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+
+_names = PlaceNameCache()
+
+
+# Function to get city name from coordinates
+def get_city_name(lat, lon, online=None):
+    """Nearest place name for the coordinates, or the formatted coordinates if none"""
+    online = ONLINE_FALLBACK if online is None else online
+    name = _names.resolve(PlaceNameCache.make_key(lat, lon, online))
+    return name or format_coordinates(lat, lon)
+
+
+def get_city_name_nowait(lat, lon, online=None):
+    """Cached place name, or None after starting the lookup in the background"""
+    online = ONLINE_FALLBACK if online is None else online
+    key = PlaceNameCache.make_key(lat, lon, online)
+    name = _names.peek(key)
+    if name is None:
+        _names.resolve_later(key)
+    return name
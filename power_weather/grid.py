@@ -0,0 +1,38 @@
+"""Snapping of coordinates onto the NASA POWER (MERRA-2) grid"""
+
+from collections import namedtuple
+
+# POWER meteorology comes from MERRA-2 at 0.5° latitude x 0.625° longitude
+LAT_STEP = 0.5
+LON_STEP = 0.625
+N_ROWS = int(180 / LAT_STEP) + 1
+N_COLS = int(360 / LON_STEP)
+
+GridCell = namedtuple('GridCell', ['cell_id', 'row', 'col', 'lat', 'lon'])
+
+
+def grid_cell(lat, lon):
+    """Return the POWER grid cell containing (lat, lon)"""
+    lat = min(90.0, max(-90.0, float(lat)))
+    row = int(round((lat + 90.0) / LAT_STEP))
+    col = int(round((float(lon) + 180.0) / LON_STEP)) % N_COLS
+    return GridCell(
+        cell_id=f"r{row:03d}c{col:03d}",
+        row=row,
+        col=col,
+        lat=round(-90.0 + row * LAT_STEP, 4),
+        lon=round(-180.0 + col * LON_STEP, 4)
+    )
+
+
+def cell_from_id(cell_id):
+    """Inverse of grid_cell(...).cell_id"""
+    row = int(cell_id[1:4])
+    col = int(cell_id[5:8])
+    return GridCell(cell_id, row, col, round(-90.0 + row * LAT_STEP, 4), round(-180.0 + col * LON_STEP, 4))
+
+
+def snap_to_grid(lat, lon):
+    """Centre coordinate of the grid cell, used for every upstream request"""
+    cell = grid_cell(lat, lon)
+    return cell.lat, cell.lon
@@ -0,0 +1,245 @@
+"""Precomputed day-of-year risk rasters for the map overlay
+
+    python -m power_weather.ingest --region turkiye      # fill the archive first
+    python -m power_weather.heatmap --region turkiye
+
+For every archived grid cell in the region the climatology-period series is
+read from the local archive and turned into windowed day-of-year means, then
+into THI / wind / precipitation risk codes and the overall (worst) code. Each
+layer and day of year is written as a tiny palette PNG with one pixel per
+grid cell:
+
+    <POWER_HEATMAP_DIR>/overall/152.png     layers: overall, thi, wind, precip; days 0..364
+    <POWER_HEATMAP_DIR>/metadata.json       bounds, layers, period, window
+
+The map only reads these files (heatmap_overlays), so showing the layer never
+calls POWER, however many cells it covers. Cells that are not archived stay
+transparent. The PNGs are on the plain latitude/longitude grid; the app hands
+them to folium as codes (overlay_codes) to be reprojected to Web Mercator.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from datetime import date
+
+import numpy as np
+from PIL import Image
+
+from power_weather.archive import SeriesArchive, get_series_archive
+from power_weather.cache import DEFAULT_CACHE_DIR
+from power_weather.climatology import CLIMATOLOGY_PARAMETERS, DEFAULT_WINDOW_DAYS, DailySeries, day_of_year, window_mask
+from power_weather.grid import LAT_STEP, LON_STEP, cell_from_id, grid_cell
+from power_weather.ingest import REGIONS, default_range
+from power_weather.risk import precipitation_risk_codes, thi_risk_codes, wind_risk_codes
+
+DEFAULT_HEATMAP_DIR = os.environ.get('POWER_HEATMAP_DIR', os.path.join(DEFAULT_CACHE_DIR, 'heatmap'))
+METADATA_FILE = 'metadata.json'
+LAYERS = ('overall', 'thi', 'wind', 'precip')
+NO_DATA = 255
+# Cells whose series are held in memory at once (5 x 365 float32 per cell and year)
+BATCH_CELLS = 256
+
+# Palette index = risk code (low, medium, high), matching the app's risk colours
+PALETTE = ((0, 176, 155), (244, 107, 69), (255, 65, 108))
+OPACITY = 150
+# The same colours as RGBA for the map overlay, then the transparent no-data entry
+OVERLAY_RGBA = np.array([colour + (OPACITY,) for colour in PALETTE] + [(0, 0, 0, 0)], dtype=np.uint8)
+# Tuples of np.uint8, so folium builds a uint8 image and does not rescale the channels
+_OVERLAY_COLOURS = [tuple(rgba) for rgba in OVERLAY_RGBA]
+# Image rows per grid row handed to folium's Mercator reprojection
+MERCATOR_ROWS_PER_CELL = 16
+
+# Every day of a non-leap year, i.e. day_of_year 0..364
+YEAR_DAYS = np.arange(np.datetime64('2001-01-01'), np.datetime64('2002-01-01'))
+
+
+def risk_layers(values, doy, window=DEFAULT_WINDOW_DAYS):
+    """{layer: (cell × 365) uint8 risk codes} from (cell × parameter × day) values
+
+    values rows follow CLIMATOLOGY_PARAMETERS plus THI (DailySeries order).
+    The window masks are shared by every cell, so the whole region is one
+    matrix product; days without data give NO_DATA instead of 'high'.
+    """
+    masks = window_mask(doy[np.newaxis, :], day_of_year(YEAR_DAYS)[:, np.newaxis], window).astype(np.float32)
+    valid = ~np.isnan(values)
+    sums = np.where(valid, values, 0.0).astype(np.float32) @ masks.T
+    counts = valid.astype(np.float32) @ masks.T
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.where(counts > 0, sums / counts, np.nan)
+    index = {name: i for i, name in enumerate(list(CLIMATOLOGY_PARAMETERS) + ['THI'])}
+    layers = {}
+    for layer, name, codes in (('thi', 'THI', thi_risk_codes), ('wind', 'WS2M', wind_risk_codes),
+                               ('precip', 'PRECTOTCORR', precipitation_risk_codes)):
+        mean = means[:, index[name]]
+        layers[layer] = np.where(np.isnan(mean), NO_DATA, codes(mean)).astype(np.uint8)
+    stacked = np.stack([layers['thi'], layers['wind'], layers['precip']])
+    # Worst known dimension; NO_DATA only when none is known
+    known = np.where(stacked == NO_DATA, 0, stacked).max(axis=0)
+    layers['overall'] = np.where((stacked == NO_DATA).all(axis=0), NO_DATA, known).astype(np.uint8)
+    return layers
+
+
+def _bbox_cells(bbox):
+    lat_min, lat_max, lon_min, lon_max = bbox
+    south_west, north_east = grid_cell(lat_min, lon_min), grid_cell(lat_max, lon_max)
+    return south_west.row, north_east.row, south_west.col, north_east.col
+
+
+def _png(codes, path):
+    # NO_DATA becomes an extra, fully transparent palette entry right after the risk colours
+    image = Image.fromarray(np.where(codes == NO_DATA, len(PALETTE), codes).astype(np.uint8), mode='P')
+    image.putpalette([channel for colour in PALETTE + ((0, 0, 0),) for channel in colour])
+    tmp_path = f"{path}.tmp"
+    image.save(tmp_path, format='PNG', optimize=True, transparency=bytes([OPACITY] * len(PALETTE) + [0]))
+    os.replace(tmp_path, path)
+
+
+def build_heatmap(bbox=REGIONS['turkiye'], directory=None, archive=None, start=None, end=None,
+                  window=DEFAULT_WINDOW_DAYS, progress=None):
+    """Compute and write every layer for the archived cells in bbox; returns the metadata
+
+    start..end defaults to the climatology period ClimatologyStore uses.
+    progress(done, total) is called after each batch of cells.
+    """
+    directory = directory or DEFAULT_HEATMAP_DIR
+    archive = archive or get_series_archive()
+    default_start, default_end = default_range()
+    start, end = start or default_start, end or default_end
+    row_min, row_max, col_min, col_max = _bbox_cells(bbox)
+    cells = [
+        cell for cell in map(cell_from_id, archive.cells())
+        if row_min <= cell.row <= row_max and col_min <= cell.col <= col_max
+    ]
+
+    shape = (365, row_max - row_min + 1, col_max - col_min + 1)
+    rasters = {layer: np.full(shape, NO_DATA, dtype=np.uint8) for layer in LAYERS}
+    doy = day_of_year(np.arange(np.datetime64(start, 'D'), np.datetime64(end, 'D') + 1))
+    n_cells = 0
+    for batch_start in range(0, len(cells), BATCH_CELLS):
+        values, rows, cols = [], [], []
+        for cell in cells[batch_start:batch_start + BATCH_CELLS]:
+            if archive.extent(cell.cell_id, CLIMATOLOGY_PARAMETERS) is None:
+                continue
+            series = DailySeries.with_derived(CLIMATOLOGY_PARAMETERS, np.vstack([
+                archive.read_filled(cell.cell_id, name, start, end) for name in CLIMATOLOGY_PARAMETERS
+            ]), start)
+            values.append(series.values)
+            # North up: image row 0 is the northernmost grid row
+            rows.append(row_max - cell.row)
+            cols.append(cell.col - col_min)
+        if values:
+            layers = risk_layers(np.stack(values), doy, window)
+            for layer in LAYERS:
+                rasters[layer][:, rows, cols] = layers[layer].T
+            n_cells += len(values)
+        if progress:
+            progress(min(batch_start + BATCH_CELLS, len(cells)), len(cells))
+
+    for layer in LAYERS:
+        os.makedirs(os.path.join(directory, layer), exist_ok=True)
+        for day in range(365):
+            _png(rasters[layer][day], os.path.join(directory, layer, f"{day:03d}.png"))
+
+    north, west = -90.0 + row_max * LAT_STEP, -180.0 + col_min * LON_STEP
+    south, east = -90.0 + row_min * LAT_STEP, -180.0 + col_max * LON_STEP
+    metadata = {
+        # Outer edges of the edge cells, as [[south, west], [north, east]]
+        'bounds': [[south - LAT_STEP / 2, west - LON_STEP / 2], [north + LAT_STEP / 2, east + LON_STEP / 2]],
+        'layers': list(LAYERS),
+        'cells': n_cells,
+        'period': f"{start.year}-{end.year}",
+        'window_days': window,
+        'created': date.today().isoformat()
+    }
+    # Written last, so the app shows nothing until the first build is complete
+    tmp_path = os.path.join(directory, f"{METADATA_FILE}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f)
+    os.replace(tmp_path, os.path.join(directory, METADATA_FILE))
+    return metadata
+
+
+_metadata_cache = {}
+_metadata_lock = threading.Lock()
+
+
+def load_heatmap(directory=None):
+    """metadata.json of a built heatmap, or None; re-read only when the file changes"""
+    path = os.path.join(directory or DEFAULT_HEATMAP_DIR, METADATA_FILE)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    with _metadata_lock:
+        cached = _metadata_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+    with open(path, encoding='utf-8') as f:
+        metadata = json.load(f)
+    with _metadata_lock:
+        _metadata_cache[path] = (mtime, metadata)
+    return metadata
+
+
+def heatmap_overlays(target_date, directory=None):
+    """(metadata, {layer: PNG path}) for target_date's day of year, or None when no heatmap is built"""
+    directory = directory or DEFAULT_HEATMAP_DIR
+    metadata = load_heatmap(directory)
+    if metadata is None:
+        return None
+    doy = int(day_of_year(np.datetime64(target_date, 'D')))
+    return metadata, {layer: os.path.join(directory, layer, f"{doy:03d}.png") for layer in metadata['layers']}
+
+
+def overlay_codes(path, rows_per_cell=MERCATOR_ROWS_PER_CELL):
+    """Risk codes of a heatmap PNG as floats (NaN = no data), every grid row repeated rows_per_cell times
+
+    folium's mercator_project resamples the rows with linear interpolation, so
+    the codes are stretched first: cell edges then stay sharp to a fraction of
+    a cell, and an edge next to a missing cell stays transparent.
+    """
+    with Image.open(path) as image:
+        codes = np.asarray(image).astype(np.float32)
+    codes[codes >= len(PALETTE)] = np.nan
+    return np.repeat(codes, rows_per_cell, axis=0)
+
+
+def overlay_colour(code):
+    """folium colormap for overlay_codes: the nearest risk colour as uint8 RGBA, transparent for NaN"""
+    return _OVERLAY_COLOURS[len(PALETTE) if code != code else int(code + 0.5)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute day-of-year risk rasters for the map overlay")
+    region = parser.add_mutually_exclusive_group()
+    region.add_argument('--region', choices=sorted(REGIONS), default='turkiye', help="named bounding box")
+    region.add_argument('--bbox', nargs=4, type=float, metavar=('LAT_MIN', 'LAT_MAX', 'LON_MIN', 'LON_MAX'))
+    parser.add_argument('-o', '--output', help="output directory (default: POWER_HEATMAP_DIR)")
+    parser.add_argument('--archive', help="series archive directory (default: POWER_ARCHIVE_DIR)")
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW_DAYS, help="± days around each day of year")
+    args = parser.parse_args(argv)
+
+    def progress(done, total):
+        print(f"\rcells: {done}/{total}", end='', file=sys.stderr, flush=True)
+        if done == total:
+            print(file=sys.stderr)
+
+    started = time.monotonic()
+    metadata = build_heatmap(
+        tuple(args.bbox) if args.bbox else REGIONS[args.region], args.output,
+        SeriesArchive(args.archive) if args.archive else None, window=args.window, progress=progress
+    )
+    print(
+        f"{metadata['cells']} cells, {len(LAYERS)} layers x 365 days in {time.monotonic() - started:.1f}s "
+        f"-> {args.output or DEFAULT_HEATMAP_DIR}",
+        file=sys.stderr
+    )
+    return 0 if metadata['cells'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
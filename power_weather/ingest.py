@@ -0,0 +1,258 @@
+"""Bulk ingest of POWER regional daily data into the per-cell series archive
+
+    python -m power_weather.ingest --region turkiye --workers 4
+    python -m power_weather.ingest --bbox 36 42 26 45 --start 2001-01-01 --end 2024-12-31
+    python -m power_weather.ingest --from-dir downloads/        # regional JSON files fetched elsewhere
+
+A bounding box is cut into tiles POWER's regional endpoint accepts (2° to 10°
+per side, one parameter per request) and every (tile, year, parameter) request
+writes all grid cells of its response into the SeriesArchive at once, instead
+of one point request per cell. Finished requests (or files) are recorded in a
+checkpoint file after each one, so an interrupted run picks up where it
+stopped. Once a region is ingested, ClimatologyStore answers every cell in it
+from the archive without further downloads.
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+from power_weather.analysis import HISTORY_YEARS
+from power_weather.archive import SeriesArchive, get_series_archive
+from power_weather.cache import RECENT_DAYS
+from power_weather.client import http_get
+from power_weather.climatology import CLIMATOLOGY_PARAMETERS
+from power_weather.decode import decode_json, loads, regional_arrays
+from power_weather.grid import grid_cell
+from power_weather.ranges import CHUNK_RETRIES, fetch_chunks, split_range
+
+REGIONAL_URL = "https://power.larc.nasa.gov/api/temporal/daily/regional"
+MIN_TILE_DEGREES = 2.0
+MAX_TILE_DEGREES = 10.0
+DEFAULT_WORKERS = 4
+CHECKPOINT_FILE = 'ingest_checkpoint.json'
+
+# (lat_min, lat_max, lon_min, lon_max)
+REGIONS = {
+    'turkiye': (35.5, 42.5, 25.5, 45.0),
+}
+
+
+def _spans(low, high, size):
+    spans = []
+    start = low
+    while True:
+        end = min(start + size, high)
+        spans.append((start, end))
+        if end >= high:
+            return spans
+        start = end
+
+
+def _widen(low, high, lower_limit, upper_limit):
+    # POWER rejects boxes narrower than MIN_TILE_DEGREES; extra cells are archived too
+    missing = MIN_TILE_DEGREES - (high - low)
+    if missing <= 0:
+        return low, high
+    low = max(lower_limit, low - missing / 2)
+    return low, min(upper_limit, low + MIN_TILE_DEGREES)
+
+
+def split_bbox(bbox, size=MAX_TILE_DEGREES):
+    """[(lat_min, lat_max, lon_min, lon_max), ...] tiles covering bbox, each 2°..size per side"""
+    lat_min, lat_max, lon_min, lon_max = bbox
+    if lat_min > lat_max or lon_min > lon_max:
+        raise ValueError(f"empty bounding box: {bbox}")
+    tiles = []
+    for lat_span in _spans(lat_min, lat_max, size):
+        for lon_span in _spans(lon_min, lon_max, size):
+            tile = _widen(*lat_span, -90.0, 90.0) + _widen(*lon_span, -180.0, 180.0)
+            tiles.append(tuple(round(value, 4) for value in tile))
+    return tiles
+
+
+def default_range(today=None):
+    """The years ClimatologyStore reads: the last HISTORY_YEARS full years"""
+    today = today or date.today()
+    return date(today.year - HISTORY_YEARS, 1, 1), date(today.year - 1, 12, 31)
+
+
+def plan_region(bbox, start, end, parameters=CLIMATOLOGY_PARAMETERS, today=None):
+    """[(tile, chunk_start, chunk_end, parameter), ...] regional requests, tile by tile
+
+    end is clamped to settled data (older than RECENT_DAYS), which POWER no
+    longer revises.
+    """
+    today = today or date.today()
+    end = min(end, today - timedelta(days=RECENT_DAYS + 1))
+    return [
+        (tile, chunk_start, chunk_end, parameter)
+        for tile in split_bbox(bbox)
+        for chunk_start, chunk_end in split_range(start, end)
+        for parameter in parameters
+    ]
+
+
+def job_key(job):
+    """Stable checkpoint key of a planned request or file"""
+    if len(job) == 1:
+        path = job[0]
+        stat = os.stat(path)
+        return f"file:{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    (lat_min, lat_max, lon_min, lon_max), chunk_start, chunk_end, parameter = job
+    return f"region:{lat_min},{lat_max},{lon_min},{lon_max}:{chunk_start:%Y%m%d}-{chunk_end:%Y%m%d}:{parameter}"
+
+
+def load_checkpoint(path):
+    """Set of finished job keys (empty when there is no checkpoint yet)"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return set(json.load(f)['done'])
+    except FileNotFoundError:
+        return set()
+
+
+def save_checkpoint(path, done):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'done': sorted(done)}, f)
+    os.replace(tmp_path, path)
+
+
+def archive_regional(data, archive, parameters=None):
+    """Write every grid cell of a regional payload into the archive; returns the number of cells"""
+    dates, cells = regional_arrays(data, parameters)
+    for lat, lon, columns in cells:
+        archive.write_arrays(grid_cell(lat, lon).cell_id, dates, columns)
+    return len(cells)
+
+
+def fetch_regional(tile, start, end, parameter):
+    """Decoded POWER regional response for one tile, date range and parameter, or None"""
+    lat_min, lat_max, lon_min, lon_max = tile
+    params = {
+        'parameters': parameter,
+        'community': 'RE',
+        'latitude-min': lat_min,
+        'latitude-max': lat_max,
+        'longitude-min': lon_min,
+        'longitude-max': lon_max,
+        'start': start.strftime("%Y%m%d"),
+        'end': end.strftime("%Y%m%d"),
+        'format': 'JSON'
+    }
+    response = http_get(REGIONAL_URL, params=params, endpoint='power_regional')
+    if response.status_code != 200:
+        return None
+    data = decode_json(response)
+    return data if data.get('features') else None
+
+
+def read_regional_file(path):
+    """Decoded regional JSON file (optionally gzip-compressed)"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        return loads(f.read())
+
+
+def _run_jobs(jobs, run, checkpoint, max_workers, retries, progress):
+    done = load_checkpoint(checkpoint) if checkpoint else set()
+    pending = [job for job in jobs if job_key(job) not in done]
+
+    def finished(n_done, total, job, result):
+        # Called on the calling thread, so the checkpoint has a single writer
+        if result is not None and checkpoint:
+            done.add(job_key(job))
+            save_checkpoint(checkpoint, done)
+        if progress:
+            progress(n_done, total, job, result)
+
+    results = fetch_chunks(run, pending, max_workers, retries, finished)
+    return {job_key(job): result for job, result in zip(pending, results)}
+
+
+def ingest_region(bbox, start=None, end=None, parameters=CLIMATOLOGY_PARAMETERS, archive=None,
+                  checkpoint=None, max_workers=DEFAULT_WORKERS, progress=None):
+    """Download bbox into the archive; returns {job key: cells archived, None if failed} for the jobs run
+
+    Jobs already recorded in the checkpoint file are skipped. progress(done,
+    total, job, cells) is called as each remaining job finishes.
+    """
+    archive = archive or get_series_archive()
+    default_start, default_end = default_range()
+    jobs = plan_region(bbox, start or default_start, end or default_end, parameters)
+
+    def run(tile, chunk_start, chunk_end, parameter):
+        data = fetch_regional(tile, chunk_start, chunk_end, parameter)
+        return None if data is None else archive_regional(data, archive, [parameter])
+
+    return _run_jobs(jobs, run, checkpoint, max_workers, CHUNK_RETRIES, progress)
+
+
+def ingest_directory(directory, parameters=None, archive=None, checkpoint=None,
+                     max_workers=DEFAULT_WORKERS, progress=None):
+    """Archive every regional JSON file (*.json, *.json.gz) in directory; same result as ingest_region
+
+    Parse errors are not retried; a file that changes after ingest is read again.
+    """
+    archive = archive or get_series_archive()
+    paths = sorted(glob.glob(os.path.join(directory, '*.json')) + glob.glob(os.path.join(directory, '*.json.gz')))
+
+    def run(path):
+        return archive_regional(read_regional_file(path), archive, parameters)
+
+    return _run_jobs([(path,) for path in paths], run, checkpoint, max_workers, 0, progress)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fill the daily series archive for every grid cell of a region")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--region', choices=sorted(REGIONS), help="named bounding box")
+    source.add_argument('--bbox', nargs=4, type=float, metavar=('LAT_MIN', 'LAT_MAX', 'LON_MIN', 'LON_MAX'))
+    source.add_argument('--from-dir', help="directory of POWER regional JSON downloads instead of the API")
+    parser.add_argument('--start', type=date.fromisoformat, help="first day (default: start of the climatology period)")
+    parser.add_argument('--end', type=date.fromisoformat, help="last day (default: end of last year)")
+    parser.add_argument('--parameters', help="comma-separated POWER parameters (default: the climatology set, or all in the files)")
+    parser.add_argument('--archive', help="series archive directory (default: POWER_ARCHIVE_DIR)")
+    parser.add_argument('--checkpoint', help=f"checkpoint file (default: {CHECKPOINT_FILE} in the archive directory)")
+    parser.add_argument('--restart', action='store_true', help="ignore the checkpoint and ingest everything again")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="parallel requests")
+    args = parser.parse_args(argv)
+
+    archive = SeriesArchive(args.archive) if args.archive else get_series_archive()
+    checkpoint = args.checkpoint or os.path.join(archive.directory, CHECKPOINT_FILE)
+    if args.restart and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    parameters = [name.strip() for name in args.parameters.split(',') if name.strip()] if args.parameters else None
+
+    def progress(done, total, job, cells):
+        print(f"\r{done}/{total} jobs", end='', file=sys.stderr, flush=True)
+        if done == total:
+            print(file=sys.stderr)
+
+    started = time.monotonic()
+    if args.from_dir:
+        results = ingest_directory(args.from_dir, parameters, archive, checkpoint, args.workers, progress)
+    else:
+        bbox = REGIONS[args.region] if args.region else tuple(args.bbox)
+        results = ingest_region(bbox, args.start, args.end, parameters or CLIMATOLOGY_PARAMETERS, archive, checkpoint,
+                                args.workers, progress)
+
+    failed = [key for key, cells in results.items() if cells is None]
+    print(
+        f"{len(results)} jobs, {sum(cells or 0 for cells in results.values())} cell series archived, "
+        f"{len(failed)} failed in {time.monotonic() - started:.1f}s -> {archive.directory}",
+        file=sys.stderr
+    )
+    for key in failed:
+        print(f"  failed: {key}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""Structured status messages returned by the data layer instead of UI calls
+
+Fetchers append {'level', 'code', 'params'} dicts to a list; the front end
+decides how to show them (st.info / st.warning, a log line, a CSV column) and
+formats them in the current language only when rendering.
+"""
+
+MESSAGES = {
+    'power_request': {
+        'en': "🌍 Sending request to NASA API: {start} - {end}",
+        'tr': "🌍 NASA API'ye istek gönderiliyor: {start} - {end}"
+    },
+    'power_success': {
+        'en': "✅ NASA daily data retrieved successfully!",
+        'tr': "✅ NASA günlük verileri başarıyla alındı!"
+    },
+    'power_unexpected': {
+        'en': "⚠️ NASA data structure unexpected, using simulation",
+        'tr': "⚠️ NASA veri yapısı beklenenden farklı, simülasyon kullanılıyor"
+    },
+    'power_http_error': {
+        'en': "⚠️ NASA API error: {status}, using simulation",
+        'tr': "⚠️ NASA API hatası: {status}, simülasyon kullanılıyor"
+    },
+    'power_connection_error': {
+        'en': "⚠️ NASA API connection error: {error}, using simulation",
+        'tr': "⚠️ NASA API bağlantı hatası: {error}, simülasyon kullanılıyor"
+    },
+    'simulation': {
+        'en': "🔬 Using simulation data",
+        'tr': "🔬 Simülasyon verileri kullanılıyor"
+    },
+}
+
+
+def add_message(messages, level, code, **params):
+    """Append a message to messages (a list, or None to discard it)"""
+    if messages is not None:
+        messages.append({'level': level, 'code': code, 'params': params})
+
+
+def format_message(message, lang='en'):
+    templates = MESSAGES[message['code']]
+    return templates.get(lang, templates['en']).format(**message['params'])
@@ -0,0 +1,166 @@
+"""NASA POWER data access shared by the apps, the batch runner and background jobs"""
+
+from datetime import date
+
+import pandas as pd
+
+from power_weather.archive import load_power_json, store_power_json
+from power_weather.cache import get_response_cache
+from power_weather.client import http_get
+from power_weather.climatology import day_of_year_climatology, day_of_year_means, get_climatology_store
+from power_weather.decode import decode_json, power_arrays
+from power_weather.grid import snap_to_grid
+from power_weather.messages import add_message
+
+DAILY_URL = "https://power.larc.nasa.gov/api/temporal/daily/point"
+DAILY_PARAMETERS = 'PRECTOTCORR,T2M,T2M_MAX,T2M_MIN,RH2M,WS2M'
+
+
+def fetch_nasa_power_daily(lat, lon, start_date, end_date, parameters=DAILY_PARAMETERS, messages=None):
+    """Daily POWER data as {'data': response, 'cached': bool}, or None on failure
+
+    Settled ranges come from the local archive, then the response cache, then
+    the API. Safe to call from worker threads when messages is None.
+    """
+    archived = load_power_json(lat, lon, parameters, start_date, end_date)
+    if archived is not None:
+        return {'data': archived, 'cached': True}
+
+    cache = get_response_cache()
+    cache_key = cache.make_key('daily', lat, lon, parameters, start_date, end_date)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        store_power_json(lat, lon, cached)
+        return {'data': cached, 'cached': True}
+
+    try:
+        cell_lat, cell_lon = snap_to_grid(lat, lon)
+        params = {
+            'parameters': parameters,
+            'community': 'RE',
+            'longitude': cell_lon,
+            'latitude': cell_lat,
+            'start': start_date.strftime("%Y%m%d"),
+            'end': end_date.strftime("%Y%m%d"),
+            'format': 'JSON'
+        }
+
+        add_message(messages, 'info', 'power_request', start=start_date, end=end_date)
+
+        response = http_get(DAILY_URL, params=params, endpoint='power_daily')
+
+        if response.status_code == 200:
+            data = decode_json(response)
+            if 'properties' in data and 'parameter' in data['properties']:
+                add_message(messages, 'success', 'power_success')
+                cache.set(cache_key, data, end_date=end_date)
+                store_power_json(lat, lon, data)
+                return {'data': data, 'cached': False}
+            else:
+                add_message(messages, 'warning', 'power_unexpected')
+                return None
+        else:
+            add_message(messages, 'warning', 'power_http_error', status=response.status_code)
+            return None
+    except Exception as e:
+        add_message(messages, 'warning', 'power_connection_error', error=str(e))
+        return None
+
+
+def get_nasa_power_daily(lat, lon, start_date, end_date, messages=None, parameters=DAILY_PARAMETERS):
+    """Fetch daily data from NASA POWER API (settled ranges come from the local archive)"""
+    result = fetch_nasa_power_daily(lat, lon, start_date, end_date, parameters, messages)
+    return result['data'] if result else None
+
+
+def get_nasa_power_climatology_for_date_range(lat, lon, target_month, target_day, start_year, end_year, window_dates=None):
+    """Day-of-year climatology (±7 days) from the locally stored 10-year daily series
+
+    When window_dates is given, per-day climatological means for those dates are
+    returned as well (used for the alternative-dates strip).
+    """
+    try:
+        series = get_climatology_store().get_series(lat, lon, start_year, end_year)
+        if series is None:
+            return None
+        # 2000 is a leap year, so 29 February is a valid target as well
+        target = date(2000, target_month, target_day)
+        climate = day_of_year_climatology(series, target)
+        stats = climate['parameters']
+        if not stats.get('PRECTOTCORR') or not stats.get('T2M'):
+            return None
+        expected_samples = (end_year - start_year + 1) * (2 * climate['window_days'] + 1)
+        result = {
+            'precipitation': stats['PRECTOTCORR']['mean'],
+            'temperature': stats['T2M']['mean'],
+            'rh': stats['RH2M']['mean'] if stats.get('RH2M') else 60.0,
+            'wind_speed': stats['WS2M']['mean'] if stats.get('WS2M') else 3.0,
+            'confidence': 'high' if climate['samples'] >= 0.8 * expected_samples else 'medium',
+            'climatology': climate
+        }
+        if window_dates:
+            means = day_of_year_means(series, window_dates)
+            row = {name: i for i, name in enumerate(series.parameters)}
+            result['window'] = {
+                'dates': list(window_dates),
+                'precipitation': means[row['PRECTOTCORR']].tolist(),
+                'temperature': means[row['T2M']].tolist(),
+                'rh': means[row['RH2M']].tolist(),
+                'wind_speed': means[row['WS2M']].tolist()
+            }
+        return result
+    except Exception:
+        return None
+
+
+def get_simulated_weather(selected_date):
+    """Seasonal baseline (precipitation, temperature, RH, wind) used when NASA data is unavailable"""
+    month = selected_date.month
+    day = selected_date.day
+
+    if month in [12, 1, 2]:
+        base_precip = 3.5
+        base_temp = 5.0
+        base_rh = 70.0
+        base_wind = 4.0
+    elif month in [3, 4, 5]:
+        base_precip = 2.0
+        base_temp = 15.0
+        base_rh = 65.0
+        base_wind = 3.5
+    elif month in [6, 7, 8]:
+        base_precip = 0.8
+        base_temp = 27.0
+        base_rh = 55.0
+        base_wind = 2.5
+    else:  # Fall
+        base_precip = 2.5
+        base_temp = 18.0
+        base_rh = 60.0
+        base_wind = 3.0
+
+    day_factor = 1.0 + (day - 15) / 30 * 0.4
+    precip = max(0.1, base_precip * day_factor)
+    temp = base_temp + (day - 15) * 0.1
+    rh = base_rh
+    wind_speed = base_wind + (day - 15) * 0.05
+    return precip, temp, rh, wind_speed
+
+
+def daily_frame(data):
+    """Wide DataFrame (DatetimeIndex 'date' × parameter) from a POWER daily response, -999 as NaN
+
+    Built from the per-parameter arrays of decode.power_arrays, so the date
+    strings are parsed once and no per-day Python objects are created.
+    """
+    dates, columns = power_arrays(data)
+    if not columns:
+        return None
+    return pd.DataFrame(columns, index=pd.DatetimeIndex(dates, name='date'))
+
+
+def long_frame(frame, names=None):
+    """date, parameter, value rows from a daily_frame, with parameter_name from names (else the code)"""
+    long = frame.melt(ignore_index=False, var_name='parameter', value_name='value').reset_index()
+    long['parameter_name'] = long['parameter'].map(names or {}).fillna(long['parameter'])
+    return long
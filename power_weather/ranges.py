@@ -0,0 +1,86 @@
+"""Long date ranges fetched as parallel, individually retried year-sized chunks
+
+    chunks = split_range(date(1990, 1, 1), date(2024, 12, 31))   # 35 calendar years
+    parts = fetch_chunks(fetch_year, chunks, progress=show_progress)
+    data = merge_power_json(parts)
+
+A failing chunk is retried on its own, so one bad year costs a retry of that
+year instead of the whole query, and the parts are merged back in date order.
+Chunks are aligned to calendar years, so overlapping queries share cached
+chunks.
+"""
+
+import copy
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, timedelta
+
+DEFAULT_WORKERS = 4
+CHUNK_RETRIES = 2
+RETRY_DELAY_SECONDS = 1.0
+
+
+def split_range(start, end, years=1):
+    """[(chunk_start, chunk_end), ...] covering start..end, cut at calendar year ends"""
+    chunks = []
+    chunk_start = start
+    while chunk_start <= end:
+        chunk_end = min(date(chunk_start.year + years - 1, 12, 31), end)
+        chunks.append((chunk_start, chunk_end))
+        chunk_start = chunk_end + timedelta(days=1)
+    return chunks
+
+
+def _retry(fetch, chunk, delay):
+    time.sleep(delay)
+    return fetch(*chunk)
+
+
+def fetch_chunks(fetch, chunks, max_workers=DEFAULT_WORKERS, retries=CHUNK_RETRIES, progress=None):
+    """Run fetch(start, end) for every chunk on a bounded pool; results in chunk order
+
+    A chunk whose fetch raises or returns None is resubmitted (after a short
+    growing delay) up to retries times; if it still fails its slot is None.
+    progress(done, total, chunk, result) is called from the calling thread as
+    each chunk finishes for good, so it can update Streamlit elements.
+    """
+    results = [None] * len(chunks)
+    attempts = [0] * len(chunks)
+    done = 0
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='power-range') as executor:
+        pending = {executor.submit(fetch, *chunk): i for i, chunk in enumerate(chunks)}
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                i = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception:
+                    result = None
+                if result is None and attempts[i] < retries:
+                    attempts[i] += 1
+                    pending[executor.submit(_retry, fetch, chunks[i], RETRY_DELAY_SECONDS * attempts[i])] = i
+                    continue
+                results[i] = result
+                done += 1
+                if progress:
+                    progress(done, len(chunks), chunks[i], result)
+    return results
+
+
+def merge_power_json(parts):
+    """One POWER daily response from chunk responses in date order (failed chunks skipped)
+
+    Later chunks only add dates, so every parameter keeps its dates in order.
+    """
+    merged = None
+    for part in parts:
+        if part is None:
+            continue
+        if merged is None:
+            merged = copy.deepcopy(part)
+            continue
+        columns = merged['properties']['parameter']
+        for name, column in part['properties']['parameter'].items():
+            columns.setdefault(name, {}).update(column)
+    return merged
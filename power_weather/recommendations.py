@@ -0,0 +1,621 @@
+"""Event-specific recommendations built from an analysis result
+
+Texts for both languages live in rule tables that are collected once at import
+into RULES, keyed by (dimension, level, event, lang). A call only looks up the
+rules that apply and fills in the numbers with str.format; templates are never
+executed as code. Callers pass the language explicitly.
+For many rows at once (batch, best-date finder) recommendation_titles maps
+level codes to prebuilt title strings with array indexing.
+"""
+
+import numpy as np
+
+from power_weather.risk import (
+    RISK_LEVELS,
+    get_precipitation_risk_level,
+    get_wind_risk_level,
+    precipitation_risk_codes,
+    wind_risk_codes,
+)
+
+# Event type labels per language; the lists are parallel (same index = same event)
+EVENT_TYPES = {
+    "tr": ["Düğün", "Konser", "Spor Etkinliği", "Festival", "Açık Hava Partisi", "Piknik", "İş Toplantısı", "Diğer"],
+    "en": ["Wedding", "Concert", "Sports Event", "Festival", "Outdoor Party", "Picnic", "Business Meeting", "Other"]
+}
+
+# GENİŞLETİLMİŞ ETKİNLİK BAZLI ÖNERİLER - EXPANDED EVENT-SPECIFIC RECOMMENDATIONS
+EVENT_RECOMMENDATIONS = {
+    "tr": {
+        "Düğün": {
+            "low": [
+                "Mükemmel düğün havası! Açık alanda tören için ideal koşullar",
+                "Dış mekan fotoğraf çekimi için harika fırsat",
+                "Misafirler için konforlu bir ortam sağlanacak",
+                "Açık hava resepsiyonu için yeşil ışık"
+            ],
+            "medium": [
+                "Yedek iç mekan planı yapın, hava değişebilir",
+                "Gelinlik ve takım elbise seçimlerinde hava koşullarını dikkate alın",
+                "Misafirler için şemsiye ve hafif yelek bulundurun",
+                "Fotoğraf çekimi için hem iç hem dış mekan planlayın"
+            ],
+            "high": [
+                "KESİNLİKLE iç mekan yedek planı uygulayın",
+                "Düğün programını kısaltmayı düşünün",
+                "Misafir konforu için klima/ısıtma önlemleri alın",
+                "Ulaşımda hava koşullarını dikkate alın"
+            ]
+        },
+        "Konser": {
+            "low": [
+                "Harika konser havası! Açık hava sahnesi için mükemmel",
+                "Ses kalitesi için ideal rüzgar koşulları",
+                "Seyirci konforu üst düzeyde",
+                "Uzun süreli performanslar için uygun"
+            ],
+            "medium": [
+                "Sahne ekipmanlarını koruyucu örtülerle koruyun",
+                "Ses sistemini rüzgar yönüne göre optimize edin",
+                "Seyirci alanında gölgelikler düşünün",
+                "Elektrik güvenliği için ek önlemler alın"
+            ],
+            "high": [
+                "Konseri iptal etmeyi veya kapalı mekana taşımayı düşünün",
+                "Elektrikli ekipmanları yağmurdan koruyun",
+                "Seyirci güvenliği için acil tahliye planı hazırlayın",
+                "Kısa program ve erken bitiş planlayın"
+            ]
+        },
+        "Festival": {
+            "low": [
+                "Festival için mükemmel hava koşulları!",
+                "Tüm gün açık hava etkinlikleri için uygun",
+                "Yiyecek-içecek stantları için ideal",
+                "Katılımın yüksek olması beklenir"
+            ],
+            "medium": [
+                "Çadır alanları için su geçirmez zemin hazırlayın",
+                "Acil yağmur planı oluşturun",
+                "Elektrik hatlarını yalıtımlı koruyun",
+                "İlk yardım istasyonlarını artırın"
+            ],
+            "high": [
+                "Festivali ertelemeyi ciddi olarak düşünün",
+                "Tüm açık hava aktivitelerini iptal edin",
+                "Güvenlik ekibini artırın",
+                "Acildurum iletişim planını devreye alın"
+            ]
+        },
+        "Spor Etkinliği": {
+            "low": [
+                "Spor müsabakaları için ideal koşullar",
+                "Atlet performansı maksimum düzeyde",
+                "Seyirci konforu üst düzeyde",
+                "Uzun süreli müsabakalar için uygun"
+            ],
+            "medium": [
+                "Saha durumunu sürekli kontrol edin",
+                "Molaları sıklaştırın",
+                "Seyirciler için ek su istasyonları kurun",
+                "Hava durumuna göre program esnekliği sağlayın"
+            ],
+            "high": [
+                "Müsabakayı erteleyin veya iptal edin",
+                "Atlet sağlığını ön planda tutun",
+                "Seyirci güvenliği için önlemleri artırın",
+                "Alternatif kapalı mekan planı uygulayın"
+            ]
+        },
+        "Açık Hava Partisi": {
+            "low": [
+                "Parti için mükemmel hava! Tüm planlar uygulanabilir",
+                "Dış mekan dekorasyonları için ideal",
+                "Misafirler rahatça sosyalleşebilir",
+                "Gece saatlerine kadar parti devam edebilir"
+            ],
+            "medium": [
+                "Yedek çadır veya şemsiye bulundurun",
+                "Müzik ekipmanlarını koruyucu örtülerle koruyun",
+                "Hafif yiyecekler tercih edin",
+                "Misafir sayısını sınırlamayı düşünün"
+            ],
+            "high": [
+                "Partiyi kapalı mekana taşıyın",
+                "Kısa süreli bir program planlayın",
+                "Misafirleri önceden bilgilendirin",
+                "Alternatif tarih önerin"
+            ]
+        },
+        "Piknik": {
+            "low": [
+                "Harika piknik havası! Doğayla iç içe keyifli vakit",
+                "Açık ateş için uygun koşullar",
+                "Uzun süreli açık hava aktiviteleri mümkün",
+                "Fotoğraf çekimi için mükemmel ışık"
+            ],
+            "medium": [
+                "Piknik alanı seçerken yüksek ve korunaklı yerleri tercih edin",
+                "Yiyecekleri kapalı kaplarda saklayın",
+                "Acil durum çadırı bulundurun",
+                "Programı esnek tutun"
+            ],
+            "high": [
+                "Pikniği iptal edin veya kapalı mekana taşıyın",
+                "Açık ateş kesinlikle yakmayın",
+                "Islak zeminde kayma riskine karşı dikkatli olun",
+                "Alternatif aktivite planlayın"
+            ]
+        },
+        "İş Toplantısı": {
+            "low": [
+                "Verimli bir açık hava toplantısı için ideal koşullar",
+                "Doğal ortamda yaratıcı fikirler geliştirme fırsatı",
+                "Katılımcı motivasyonu yüksek olacak",
+                "Uzun süreli oturumlar için uygun"
+            ],
+            "medium": [
+                "Yedek kapalı mekan ayarlayın",
+                "Elektronik cihazları koruyucu önlemler alın",
+                "Sunum ekipmanlarını yedekleyin",
+                "Toplantı süresini optimize edin"
+            ],
+            "high": [
+                "Toplantıyı kesinlikle kapalı mekana alın",
+                "Video konferans alternatifi sunun",
+                "Katılımcı ulaşımını yeniden planlayın",
+                "Toplantıyı ertelemeyi düşünün"
+            ]
+        },
+        "Diğer": {
+            "low": ["Mükemmel koşullar - planlarınızı güvenle uygulayın"],
+            "medium": ["Dikkatli olun - yedek planlar yapın"],
+            "high": ["Riskli koşullar - alternatif plan uygulayın"]
+        }
+    },
+    "en": {
+        "Wedding": {
+            "low": [
+                "Perfect wedding weather! Ideal conditions for outdoor ceremony",
+                "Great opportunity for outdoor photography",
+                "Comfortable environment for guests",
+                "Green light for outdoor reception"
+            ],
+            "medium": [
+                "Have an indoor backup plan, weather may change",
+                "Consider weather conditions for dress and suit selections",
+                "Have umbrellas and light jackets available for guests",
+                "Plan both indoor and outdoor photography options"
+            ],
+            "high": [
+                "DEFINITELY implement indoor backup plan",
+                "Consider shortening the wedding program",
+                "Take air conditioning/heating measures for guest comfort",
+                "Consider transportation weather conditions"
+            ]
+        },
+        "Concert": {
+            "low": [
+                "Great concert weather! Perfect for outdoor stage",
+                "Ideal wind conditions for sound quality",
+                "Maximum audience comfort",
+                "Suitable for long performances"
+            ],
+            "medium": [
+                "Protect stage equipment with protective covers",
+                "Optimize sound system according to wind direction",
+                "Consider shades in audience area",
+                "Take extra electrical safety measures"
+            ],
+            "high": [
+                "Consider canceling concert or moving indoors",
+                "Protect electrical equipment from rain",
+                "Prepare emergency evacuation plan for audience safety",
+                "Plan shorter program and early ending"
+            ]
+        },
+        "Festival": {
+            "low": [
+                "Perfect weather conditions for festival!",
+                "Suitable for all-day outdoor activities",
+                "Ideal for food and beverage stands",
+                "High attendance expected"
+            ],
+            "medium": [
+                "Prepare waterproof flooring for tent areas",
+                "Create emergency rain plan",
+                "Protect electrical lines with insulation",
+                "Increase first aid stations"
+            ],
+            "high": [
+                "Seriously consider postponing the festival",
+                "Cancel all outdoor activities",
+                "Increase security team",
+                "Activate emergency communication plan"
+            ]
+        },
+        "Sports Event": {
+            "low": [
+                "Ideal conditions for sports competitions",
+                "Maximum athlete performance",
+                "Maximum spectator comfort",
+                "Suitable for long competitions"
+            ],
+            "medium": [
+                "Continuously monitor field conditions",
+                "Increase break frequency",
+                "Set up additional water stations for spectators",
+                "Provide schedule flexibility based on weather"
+            ],
+            "high": [
+                "Postpone or cancel the competition",
+                "Prioritize athlete health",
+                "Increase spectator safety measures",
+                "Implement alternative indoor venue plan"
+            ]
+        },
+        "Outdoor Party": {
+            "low": [
+                "Perfect party weather! All plans can be implemented",
+                "Ideal for outdoor decorations",
+                "Guests can socialize comfortably",
+                "Party can continue until night hours"
+            ],
+            "medium": [
+                "Have backup tents or umbrellas",
+                "Protect music equipment with covers",
+                "Prefer light foods",
+                "Consider limiting number of guests"
+            ],
+            "high": [
+                "Move party indoors",
+                "Plan short-term program",
+                "Inform guests in advance",
+                "Suggest alternative date"
+            ]
+        },
+        "Picnic": {
+            "low": [
+                "Great picnic weather! Enjoyable time in nature",
+                "Suitable conditions for open fire",
+                "Long-term outdoor activities possible",
+                "Perfect lighting for photography"
+            ],
+            "medium": [
+                "Choose high and protected areas for picnic location",
+                "Store food in closed containers",
+                "Have emergency tent available",
+                "Keep schedule flexible"
+            ],
+            "high": [
+                "Cancel picnic or move indoors",
+                "Absolutely no open fire",
+                "Be careful of slipping risk on wet ground",
+                "Plan alternative activity"
+            ]
+        },
+        "Business Meeting": {
+            "low": [
+                "Ideal conditions for productive outdoor meeting",
+                "Opportunity to develop creative ideas in natural environment",
+                "High participant motivation",
+                "Suitable for long sessions"
+            ],
+            "medium": [
+                "Arrange backup indoor venue",
+                "Take protective measures for electronic devices",
+                "Backup presentation equipment",
+                "Optimize meeting duration"
+            ],
+            "high": [
+                "Definitely move meeting indoors",
+                "Offer video conference alternative",
+                "Replan participant transportation",
+                "Consider postponing meeting"
+            ]
+        },
+        "Other": {
+            "low": ["Perfect conditions - implement your plans with confidence"],
+            "medium": ["Be careful - make backup plans"],
+            "high": ["Risky conditions - implement alternative plan"]
+        }
+    }
+}
+
+
+# Risk-dimension rules: (dimension, level) -> (card type, {lang: (title, message, details)})
+# Templates are filled with date, location, thi, precip, wind_speed, temp and analysis_period
+RULE_TEXTS = {
+    ('thi', 'low'): ('success', {
+        'en': ('✅ PERFECT CHOICE!', '{date} has low heat stress risk for {location}', [
+            'Average THI: {thi:.1f}, Precipitation: {precip:.1f} mm/day, Wind: {wind_speed:.1f} m/s on {date}',
+            'Ideal conditions for outdoor events',
+            'Analysis period: {analysis_period}',
+            'Data reliability: High'
+        ]),
+        'tr': ('✅ MÜKEMMEL SEÇİM!', '{date} tarihi {location} için düşük ısı stresi riskine sahip', [
+            'Ortalama THI: {thi:.1f}, Yağış: {precip:.1f} mm/gün, Rüzgar: {wind_speed:.1f} m/s {date} tarihinde',
+            'Açık hava etkinliği için ideal koşullar',
+            'Analiz dönemi: {analysis_period}',
+            'Veri güvenilirliği: Yüksek'
+        ])
+    }),
+    ('thi', 'medium'): ('warning', {
+        'en': ('⚠️ MEDIUM RISK', '{date} has moderate heat stress risk', [
+            'Average THI: {thi:.1f}, Precipitation: {precip:.1f} mm/day, Wind: {wind_speed:.1f} m/s on {date}',
+            'Prepare for moderate heat and humidity',
+            'Plan hydration and shaded areas',
+            'Inform guests about weather conditions'
+        ]),
+        'tr': ('⚠️ ORTA SEVİYE RİSK', '{date} tarihi orta ısı stresi riski taşıyor', [
+            'Ortalama THI: {thi:.1f}, Yağış: {precip:.1f} mm/gün, Rüzgar: {wind_speed:.1f} m/s {date} tarihinde',
+            'Orta seviye ısı ve nem için hazırlıklı olun',
+            'Hidrasyon ve gölgeli alanlar planlayın',
+            'Misafirleri hava durumu konusunda bilgilendirin'
+        ])
+    }),
+    ('thi', 'high'): ('danger', {
+        'en': ('🌡️ HIGH RISK', '{date} has high heat stress risk', [
+            'Average THI: {thi:.1f}, Precipitation: {precip:.1f} mm/day, Wind: {wind_speed:.1f} m/s on {date}',
+            'Not suitable for prolonged outdoor activities',
+            'Consider indoor alternatives or rescheduling',
+            'High risk of heat-related issues'
+        ]),
+        'tr': ('🌡️ YÜKSEK RİSK', '{date} tarihi yüksek ısı stresi riski taşıyor', [
+            'Ortalama THI: {thi:.1f}, Yağış: {precip:.1f} mm/gün, Rüzgar: {wind_speed:.1f} m/s {date} tarihinde',
+            'Uzun süreli açık hava etkinlikleri için uygun değil',
+            'Kapalı mekan alternatifi veya erteleme düşünün',
+            'Isı kaynaklı sorunlar için yüksek risk'
+        ])
+    }),
+    ('wind', 'high'): ('warning', {
+        'en': ('💨 HIGH WIND WARNING', 'High wind speed expected: {wind_speed:.1f} m/s', [
+            'Secure loose items and decorations',
+            'Consider wind protection for outdoor setups',
+            'Monitor weather updates for wind gusts',
+            'Postpone activities requiring stable conditions'
+        ]),
+        'tr': ('💨 YÜKSEK RÜZGAR UYARISI', 'Yüksek rüzgar hızı bekleniyor: {wind_speed:.1f} m/s', [
+            'Gevşek eşyaları ve dekorasyonları sabitleyin',
+            'Açık hava düzenlemeleri için rüzgar koruması düşünün',
+            'Rüzgar sağanakları için hava durumu güncellemelerini takip edin',
+            'Sabit koşullar gerektiren aktiviteleri erteleyin'
+        ])
+    }),
+    ('wind', 'medium'): ('info', {
+        'en': ('💨 MODERATE WIND', 'Moderate wind speed: {wind_speed:.1f} m/s', [
+            'Light items may be affected by wind',
+            'Consider securing paper materials and light decorations',
+            'Wind may affect sound quality for outdoor speeches'
+        ]),
+        'tr': ('💨 ORTA SEVİYE RÜZGAR', 'Orta seviye rüzgar hızı: {wind_speed:.1f} m/s', [
+            'Hafif eşyalar rüzgardan etkilenebilir',
+            'Kağıt malzemeleri ve hafif dekorasyonları sabitlemeyi düşünün',
+            'Rüzgar açık hava konuşmalarında ses kalitesini etkileyebilir'
+        ])
+    }),
+    ('precip', 'high'): ('danger', {
+        'en': ('🌧️ HEAVY RAIN WARNING', 'High precipitation expected: {precip:.1f} mm/day', [
+            'Postpone outdoor activities or move indoors',
+            'Ensure proper drainage at venue',
+            'Prepare for potential flooding in low areas',
+            'Have emergency shelters ready'
+        ]),
+        'tr': ('🌧️ ŞİDDETLİ YAĞMUR UYARISI', 'Yüksek yağış bekleniyor: {precip:.1f} mm/gün', [
+            'Açık hava aktivitelerini erteleyin veya iç mekana taşıyın',
+            'Mekanda uygun drenaj olduğundan emin olun',
+            'Alçak bölgelerde olası su baskınlarına hazırlıklı olun',
+            'Acil barınaklar hazır bulundurun'
+        ])
+    }),
+    ('precip', 'medium'): ('warning', {
+        'en': ('🌦️ LIGHT RAIN POSSIBLE', 'Light to moderate precipitation: {precip:.1f} mm/day', [
+            'Have umbrellas and rain covers ready',
+            'Protect electronic equipment from moisture',
+            'Consider temporary shelters or tents',
+            'Prepare for potential schedule adjustments'
+        ]),
+        'tr': ('🌦️ HAFİF YAĞMUR OLABİLİR', 'Hafif-orta şiddette yağış: {precip:.1f} mm/gün', [
+            'Şemsiye ve yağmur örtüleri hazır bulundurun',
+            'Elektronik ekipmanları nemden koruyun',
+            'Geçici barınaklar veya çadırlar düşünün',
+            'Olası program değişikliklerine hazırlıklı olun'
+        ])
+    }),
+    ('temperature', 'cold'): ('warning', {
+        'en': ('🥶 COLD WEATHER ALERT', 'Cold temperature expected: {temp:.1f}°C', [
+            'Provide heating solutions for outdoor areas',
+            'Warm beverages and indoor warming areas recommended',
+            'Inform guests to dress warmly',
+            'Consider shorter duration for outdoor activities'
+        ]),
+        'tr': ('🥶 SOĞUK HAVA UYARISI', 'Soğuk sıcaklık bekleniyor: {temp:.1f}°C', [
+            'Açık alanlar için ısıtma çözümleri sağlayın',
+            'Sıcak içecekler ve kapalı ısınma alanları önerilir',
+            'Misafirlere sıcak giyinmeleri konusunda bilgi verin',
+            'Açık hava aktiviteleri için daha kısa süre düşünün'
+        ])
+    }),
+    ('temperature', 'hot'): ('warning', {
+        'en': ('🥵 HOT WEATHER ALERT', 'Hot temperature expected: {temp:.1f}°C', [
+            'Provide ample shaded areas and cooling stations',
+            'Ensure proper hydration with water stations',
+            'Schedule activities during cooler morning/evening hours',
+            'Have medical support for heat-related issues'
+        ]),
+        'tr': ('🥵 SICAK HAVA UYARISI', 'Sıcak hava bekleniyor: {temp:.1f}°C', [
+            'Bol gölgeli alanlar ve serinleme istasyonları sağlayın',
+            'Su istasyonları ile uygun hidrasyon sağlayın',
+            'Aktiviteleri daha serin sabah/akşam saatlerine planlayın',
+            'Isı kaynaklı sorunlar için tıbbi destek hazır bulundurun'
+        ])
+    }),
+}
+
+# Order in which the cards are shown; the event card comes last
+DIMENSIONS = ('thi', 'wind', 'precip', 'temperature', 'event')
+
+# Level names per dimension, indexed by the codes used in bulk mode
+DIMENSION_LEVELS = {
+    'thi': tuple(RISK_LEVELS),
+    'wind': tuple(RISK_LEVELS),
+    'precip': tuple(RISK_LEVELS),
+    'temperature': (None, 'cold', 'hot'),
+    'event': tuple(RISK_LEVELS),
+}
+
+# Below / above these (°C) the cold / hot weather card is added
+TEMPERATURE_LIMITS = (10, 30)
+
+DEFAULT_ANALYSIS_PERIOD = {'en': '±2 days', 'tr': '±2 gün'}
+
+
+class Rule:
+    """One recommendation card; texts containing {fields} are str.format templates"""
+
+    __slots__ = ('type', 'title', 'message', 'details', '_message_template', '_detail_templates')
+
+    def __init__(self, card_type, title, message, details):
+        self.type = card_type
+        self.title = title
+        self.message = message
+        self.details = tuple(details)
+        # Plain texts are copied as they are; only the templates are formatted per call
+        self._message_template = '{' in message
+        self._detail_templates = tuple('{' in text for text in self.details)
+
+    def render(self, fields):
+        """The card as a dict, with {date}, {thi:.1f}, ... filled in from fields"""
+        return {
+            'type': self.type,
+            'title': self.title,
+            'message': self.message.format_map(fields) if self._message_template else self.message,
+            'details': [
+                text.format_map(fields) if template else text
+                for text, template in zip(self.details, self._detail_templates)
+            ]
+        }
+
+
+def _compile_rules():
+    rules = {}
+    for canonical in EVENT_TYPES['en']:
+        for lang in EVENT_TYPES:
+            for (dimension, level), (card_type, texts) in RULE_TEXTS.items():
+                title, message, details = texts[lang]
+                rules[(dimension, level, canonical, lang)] = Rule(card_type, title, message, details)
+            event_name = localize_event_type(canonical, lang)
+            for level, details in EVENT_RECOMMENDATIONS[lang].get(event_name, {}).items():
+                if lang == 'tr':
+                    title = f'🎪 {event_name.upper()} ÖZEL ÖNERİLER'
+                    message = f'{event_name} için {level} risk seviyesine göre öneriler:'
+                else:
+                    title = f'🎪 {event_name.upper()} SPECIFIC RECOMMENDATIONS'
+                    message = f'Recommendations for {event_name} at {level} risk level:'
+                rules[('event', level, canonical, lang)] = Rule('info', title, message, details)
+    return rules
+
+
+def get_canonical_event_type(event_type):
+    """English event name for a label in either language"""
+    for options in EVENT_TYPES.values():
+        if event_type in options:
+            return EVENT_TYPES["en"][options.index(event_type)]
+    return "Other"
+
+
+def localize_event_type(event_type, lang='en'):
+    """Event label in the given language for a label in either language"""
+    return EVENT_TYPES[lang][EVENT_TYPES["en"].index(get_canonical_event_type(event_type))]
+
+
+RULES = _compile_rules()
+
+
+def temperature_level_codes(temperature):
+    """0 = no card, 1 = cold, 2 = hot (NaN gets no card)"""
+    temperature = np.asarray(temperature, dtype=float)
+    with np.errstate(invalid='ignore'):
+        return np.where(temperature < TEMPERATURE_LIMITS[0], 1, np.where(temperature > TEMPERATURE_LIMITS[1], 2, 0)).astype(np.int8)
+
+
+def recommendation_levels(analysis_data):
+    """{dimension: level} for one analysis result; dimensions without a card are left out"""
+    temp = analysis_data['temperature']
+    levels = {
+        'thi': analysis_data['risk_level'],
+        'wind': get_wind_risk_level(analysis_data['wind_speed']),
+        'precip': get_precipitation_risk_level(analysis_data['precipitation']),
+    }
+    if temp < TEMPERATURE_LIMITS[0]:
+        levels['temperature'] = 'cold'
+    elif temp > TEMPERATURE_LIMITS[1]:
+        levels['temperature'] = 'hot'
+    levels['event'] = analysis_data['risk_level']
+    return levels
+
+
+def get_event_specific_recommendations(event_type, analysis_data, lang='en'):
+    """Generate event-specific recommendations, incorporating THI risk and wind speed"""
+    canonical = get_canonical_event_type(event_type)
+    selected_date = analysis_data['selected_date']
+    fields = {
+        # Same as strftime('%d.%m.%Y') at a fraction of the cost
+        'date': f"{selected_date.day:02d}.{selected_date.month:02d}.{selected_date.year}",
+        'location': analysis_data['location'],
+        'thi': analysis_data['thi'],
+        'precip': analysis_data['precipitation'],
+        'wind_speed': analysis_data['wind_speed'],
+        'temp': analysis_data['temperature'],
+        'analysis_period': analysis_data.get('analysis_period', DEFAULT_ANALYSIS_PERIOD[lang]),
+    }
+    recommendations = []
+    for dimension, level in recommendation_levels(analysis_data).items():
+        rule = RULES.get((dimension, level, canonical, lang))
+        if rule is not None:
+            recommendations.append(rule.render(fields))
+    return recommendations
+
+
+def _title_table(lang, separator):
+    """Joined card titles for every combination of level codes, shape (thi, wind, precip, temperature, event)"""
+    shape = tuple(len(DIMENSION_LEVELS[d]) for d in DIMENSIONS[:-1]) + (len(EVENT_TYPES['en']),)
+    table = np.empty(shape, dtype=object)
+    for index in np.ndindex(*shape):
+        canonical = EVENT_TYPES['en'][index[-1]]
+        levels = [DIMENSION_LEVELS[d][code] for d, code in zip(DIMENSIONS, index[:-1])] + [DIMENSION_LEVELS['event'][index[0]]]
+        rules = [RULES.get((d, level, canonical, lang)) for d, level in zip(DIMENSIONS, levels)]
+        table[index] = separator.join(rule.title for rule in rules if rule is not None)
+    return table
+
+
+_title_tables = {}
+
+
+def recommendation_titles(risk_level, wind_speed, precipitation, temperature=None, event_type='Other', lang='en',
+                          separator=' | '):
+    """Card titles for many rows at once, as an object array of joined strings
+
+    risk_level holds 'low' / 'medium' / 'high' labels; event_type is one label
+    or one per row (either language). No Python code runs per row: the levels
+    become integer codes and index a table of every code combination.
+    """
+    key = (lang, separator)
+    if key not in _title_tables:
+        _title_tables[key] = _title_table(lang, separator)
+    table = _title_tables[key]
+
+    labels = np.asarray(risk_level, dtype=object)
+    thi = np.zeros(labels.shape, dtype=np.int8)
+    for code, label in enumerate(RISK_LEVELS):
+        thi[labels == label] = code
+    wind = wind_risk_codes(wind_speed)
+    precip = precipitation_risk_codes(precipitation)
+    temp = np.zeros(labels.shape, dtype=np.int8) if temperature is None else temperature_level_codes(temperature)
+    if np.ndim(event_type) == 0:
+        event = np.full(labels.shape, EVENT_TYPES['en'].index(get_canonical_event_type(event_type)), dtype=np.int8)
+    else:
+        # Label lookups happen once per distinct event, not once per row
+        names, inverse = np.unique(np.asarray(event_type, dtype=object).astype(str), return_inverse=True)
+        event = np.array([EVENT_TYPES['en'].index(get_canonical_event_type(n)) for n in names], dtype=np.int8)[inverse]
+    return table[thi, wind, precip, temp, event]
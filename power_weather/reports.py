@@ -0,0 +1,80 @@
+"""PDF, CSV and columnar exports of an analysis result and its nearby-dates strip
+
+Exports are built on demand: lazy_exports returns zero-argument callables
+that generate the file the first time they are called and keep the bytes, so
+rendering a result page never pays for reportlab or a DataFrame.
+"""
+
+import io
+import threading
+
+import pandas as pd
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from power_weather.columnar import generate_analysis_export
+
+
+def generate_pdf(results, alt_dates):
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    c.drawString(100, 750, "NASA POWER Weather Report")
+    c.drawString(100, 730, f"Date: {results['selected_date'].strftime('%d.%m.%Y')}")
+    c.drawString(100, 710, f"Precipitation: {results['precipitation']:.1f} mm/day")
+    c.drawString(100, 690, f"Temperature: {results['temperature']:.1f} °C")
+    c.drawString(100, 670, f"Wind Speed: {results['wind_speed']:.1f} m/s")
+    c.drawString(100, 650, f"THI: {results['thi']:.1f}")
+    c.drawString(100, 630, f"Risk Level: {results['risk_level']}")
+    c.drawString(100, 610, f"Accuracy: {results['accuracy']}")
+    y = 590
+    for alt in alt_dates:
+        c.drawString(100, y, f"{alt['date'].strftime('%d.%m.%Y')}: {alt['precipitation']:.1f} mm, Wind: {alt['wind_speed']:.1f} m/s, THI: {alt['thi']:.1f}")
+        y -= 20
+
+    c.save()
+    buffer.seek(0)
+    return buffer
+
+
+def generate_csv(results, alt_dates):
+    df = pd.DataFrame(alt_dates)
+    df['selected_date'] = results['selected_date'].strftime('%d.%m.%Y')
+    df['temperature_main'] = results['temperature']
+    df['thi_main'] = results['thi']
+    df['precipitation_main'] = results['precipitation']
+    df['wind_speed_main'] = results['wind_speed']
+    df['accuracy'] = results['accuracy']
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False)
+    return buffer.getvalue()
+
+
+class LazyExport:
+    """Zero-argument callable that builds an export on first call and then returns the kept contents"""
+
+    def __init__(self, build, *args):
+        self._build = build
+        self._args = args
+        self._data = None
+        self._lock = threading.Lock()
+
+    @property
+    def built(self):
+        return self._data is not None
+
+    def __call__(self):
+        with self._lock:
+            if self._data is None:
+                data = self._build(*self._args)
+                self._data = data.getvalue() if hasattr(data, 'getvalue') else data
+            return self._data
+
+
+def lazy_exports(results, alt_dates):
+    """{'pdf', 'csv', 'parquet', 'arrow': LazyExport} for one analysis result"""
+    return {
+        'pdf': LazyExport(generate_pdf, results, alt_dates),
+        'csv': LazyExport(generate_csv, results, alt_dates),
+        'parquet': LazyExport(generate_analysis_export, results, alt_dates, 'parquet'),
+        'arrow': LazyExport(generate_analysis_export, results, alt_dates, 'arrow')
+    }
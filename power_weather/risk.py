@@ -0,0 +1,111 @@
+"""Temperature-Humidity Index (THI) and weather risk helpers
+
+Scalar functions mirror the original if/elif rules; the array kernels give
+identical results on NumPy arrays or pandas columns, so multi-day and
+multi-location scoring does not need a Python loop.
+"""
+
+import numpy as np
+import pandas as pd
+
+RISK_LEVELS = np.array(['low', 'medium', 'high'])
+RISK_LOW, RISK_MEDIUM, RISK_HIGH = 0, 1, 2
+
+# Lower bounds of 'medium' and 'high' for each risk dimension
+THI_THRESHOLDS = (72.0, 79.0)
+WIND_THRESHOLDS = (5.0, 10.0)
+PRECIP_THRESHOLDS = (1.0, 5.0)
+
+
+def calculate_thi(t, rh):
+    """Calculate Temperature-Humidity Index (THI) based on the research formula
+
+    Works on scalars as well as NumPy arrays / pandas Series.
+    """
+    return (1.8 * t + 32) - ((0.55 - 0.0055 * rh) * (1.8 * t - 26))
+
+
+def get_thi_risk_level(thi):
+    """Determine risk level based on THI thresholds (adapted for outdoor events; research focused on livestock, but generalizable)"""
+    if thi < 72:
+        return 'low'
+    elif thi < 79:
+        return 'medium'
+    else:
+        return 'high'
+
+
+def get_wind_risk_level(wind_speed):
+    """Determine risk level based on wind speed"""
+    if wind_speed < 5.0:
+        return 'low'
+    elif wind_speed < 10.0:
+        return 'medium'
+    else:
+        return 'high'
+
+
+def get_precipitation_risk_level(precip):
+    """Determine risk level based on precipitation"""
+    if precip < 1.0:
+        return 'low'
+    elif precip < 5.0:
+        return 'medium'
+    else:
+        return 'high'
+
+
+def risk_codes(values, thresholds):
+    """0/1/2 risk codes for an array; NaN counts as 'high' like the scalar rules"""
+    return np.digitize(np.asarray(values, dtype=float), thresholds).astype(np.int8)
+
+
+def thi_risk_codes(thi):
+    return risk_codes(thi, THI_THRESHOLDS)
+
+
+def wind_risk_codes(wind_speed):
+    return risk_codes(wind_speed, WIND_THRESHOLDS)
+
+
+def precipitation_risk_codes(precip):
+    return risk_codes(precip, PRECIP_THRESHOLDS)
+
+
+def risk_labels(codes):
+    """Map risk codes back to 'low' / 'medium' / 'high'"""
+    return RISK_LEVELS[np.asarray(codes)]
+
+
+def thi_risk_levels(thi):
+    """Array version of get_thi_risk_level"""
+    return risk_labels(thi_risk_codes(thi))
+
+
+def score_weather(temperature, rh, wind_speed, precipitation):
+    """THI plus risk codes for every element of the input arrays
+
+    'overall' is the worst of the three dimensions.
+    """
+    thi = calculate_thi(np.asarray(temperature, dtype=float), np.asarray(rh, dtype=float))
+    thi_risk = thi_risk_codes(thi)
+    wind_risk = wind_risk_codes(wind_speed)
+    precip_risk = precipitation_risk_codes(precipitation)
+    return {
+        'thi': thi,
+        'thi_risk': thi_risk,
+        'wind_risk': wind_risk,
+        'precip_risk': precip_risk,
+        'overall_risk': np.maximum.reduce([thi_risk, wind_risk, precip_risk])
+    }
+
+
+def score_frame(df, temperature='T2M', rh='RH2M', wind_speed='WS2M', precipitation='PRECTOTCORR'):
+    """Return a copy of a wide DataFrame with THI and categorical risk columns added"""
+    scores = score_weather(df[temperature], df[rh], df[wind_speed], df[precipitation])
+    levels = pd.CategoricalDtype(list(RISK_LEVELS), ordered=True)
+    result = df.copy()
+    result['THI'] = scores['thi']
+    for column in ('thi_risk', 'wind_risk', 'precip_risk', 'overall_risk'):
+        result[column] = pd.Categorical.from_codes(scores[column], dtype=levels)
+    return result
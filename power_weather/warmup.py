@@ -0,0 +1,111 @@
+"""Cold-start cache warming for the quick-city venues
+
+    python -m power_weather.warmup [--venues venues.csv] [--workers 4]
+
+For every venue the climatology series, the most recent daily window and the
+place name are fetched into the shared caches, so the first users after a
+deploy get the same response times as everyone else. The app starts the same
+job in the background; POWER_WARMUP=0 disables that.
+
+The venue list is a CSV with name, lat, lon columns (power_weather/data/venues.csv
+by default, or the file named by POWER_WARMUP_VENUES).
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import timedelta
+
+import pandas as pd
+
+from power_weather.analysis import DEFAULT_ANALYSIS_OFFSET_DAYS, get_date_limits
+from power_weather.batch import plan_fetches
+from power_weather.geocode import get_city_name, get_place_index
+from power_weather.grid import grid_cell
+
+DEFAULT_VENUES_PATH = os.environ.get(
+    'POWER_WARMUP_VENUES', os.path.join(os.path.dirname(__file__), 'data', 'venues.csv')
+)
+DEFAULT_WORKERS = 4
+ENABLED = os.environ.get('POWER_WARMUP', '1') not in ('', '0')
+
+
+def load_venues(path=None):
+    """{name: (lat, lon)} in file order"""
+    venues = pd.read_csv(path or DEFAULT_VENUES_PATH)
+    return {name: (float(lat), float(lon)) for name, lat, lon in zip(venues['name'], venues['lat'], venues['lon'])}
+
+
+def plan_warmup(venues, today=None):
+    """Fetches that the first analysis of each venue would make
+
+    The app opens on a date DEFAULT_ANALYSIS_OFFSET_DAYS ahead (climatology);
+    yesterday stands for the past-date path (daily window).
+    """
+    today, _, _ = get_date_limits(today)
+    rows = [
+        {'venue': name, 'lat': lat, 'lon': lon, 'date': day, 'event_type': 'Other', 'cell_id': grid_cell(lat, lon).cell_id}
+        for name, (lat, lon) in venues.items()
+        for day in (today + timedelta(days=DEFAULT_ANALYSIS_OFFSET_DAYS), today - timedelta(days=1))
+    ]
+    tasks = plan_fetches(pd.DataFrame(rows), today)
+    for name, (lat, lon) in venues.items():
+        tasks[('place', grid_cell(lat, lon).cell_id, lat, lon)] = (get_city_name, lat, lon)
+    return tasks
+
+
+def warm_caches(venues=None, max_workers=DEFAULT_WORKERS, today=None, wait_for=True):
+    """Run the warm-up fetches on a thread pool; returns {task key: future}
+
+    With wait_for=False the call returns immediately and the pool finishes in
+    the background.
+    """
+    venues = load_venues() if venues is None else venues
+    tasks = plan_warmup(venues, today)
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='power-warmup')
+    # The gazetteer is loaded once up front instead of by every place task
+    executor.submit(get_place_index)
+    futures = {key: executor.submit(func, *args) for key, (func, *args) in tasks.items()}
+    executor.shutdown(wait=wait_for)
+    return futures
+
+
+_started = None
+_started_lock = threading.Lock()
+
+
+def start_background_warmup(venues=None, max_workers=DEFAULT_WORKERS):
+    """Start warming once per process (later calls are no-ops); returns the futures"""
+    global _started
+    with _started_lock:
+        if _started is None and ENABLED:
+            _started = warm_caches(venues, max_workers, wait_for=False)
+        return _started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-fetch NASA POWER data and place names for the quick-city venues")
+    parser.add_argument('--venues', help="CSV with name, lat, lon columns (default: bundled quick-city list)")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="parallel upstream requests")
+    args = parser.parse_args(argv)
+
+    started = time.monotonic()
+    venues = load_venues(args.venues)
+    futures = warm_caches(venues, args.workers)
+    wait(futures.values())
+    failed = [key for key, future in futures.items() if future.exception() is not None or future.result() is None]
+    print(
+        f"{len(venues)} venues, {len(futures)} fetches, {len(failed)} failed "
+        f"in {time.monotonic() - started:.1f}s",
+        file=sys.stderr
+    )
+    for key in failed:
+        print(f"  failed: {' '.join(str(part) for part in key)}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,37 @@
+"""Concurrent fetches: results by name, failed or late calls give None, nested loops do not starve"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from power_weather import aio
+from power_weather.aio import fetch_concurrently
+
+
+def fail():
+    raise ValueError("no data")
+
+
+def test_results_by_name():
+    started = time.monotonic()
+    results = fetch_concurrently({
+        'sum': (sum, [1, 2, 3]),
+        'slow': (time.sleep, 0.3),
+        'late': (time.sleep, 5),
+        'error': (fail,),
+    }, deadline=1)
+    assert results == {'sum': 6, 'slow': None, 'late': None, 'error': None}
+    assert time.monotonic() - started < 3
+    assert fetch_concurrently({}) == {}
+
+
+def test_inside_a_running_loop_with_one_fetch_worker(monkeypatch):
+    # With a single fetch worker, running the nested loop on that worker would leave none for the calls
+    monkeypatch.setattr(aio, '_executor', ThreadPoolExecutor(max_workers=1, thread_name_prefix='test-fetch'))
+
+    async def notebook_cell():
+        return fetch_concurrently({'a': (abs, -1), 'b': (abs, -2)}, deadline=5)
+
+    started = time.monotonic()
+    assert asyncio.run(notebook_cell()) == {'a': 1, 'b': 2}
+    assert time.monotonic() - started < 2
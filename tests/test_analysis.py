@@ -0,0 +1,39 @@
+"""Analysis fetch: POWER data and the place name are fetched concurrently"""
+
+import time
+from datetime import date
+
+from power_weather import analysis
+from power_weather.analysis import fetch_analysis_inputs
+
+DELAY = 0.3
+
+
+def slow_data(lat, lon, selected_date, today=None):
+    time.sleep(DELAY)
+    return {'status': 'success', 'source': 'historical', 'selected_date': selected_date, 'messages': []}
+
+
+def slow_name(lat, lon):
+    time.sleep(DELAY)
+    return 'Ankara'
+
+
+def test_data_and_name_are_fetched_concurrently(monkeypatch):
+    monkeypatch.setattr(analysis, 'get_analysis_data', slow_data)
+    monkeypatch.setattr(analysis, 'get_city_name', slow_name)
+    started = time.monotonic()
+    data, city_name = fetch_analysis_inputs(39.93, 32.86, date(2024, 6, 12))
+    assert time.monotonic() - started < 1.6 * DELAY
+    assert data['source'] == 'historical'
+    assert city_name == 'Ankara'
+
+
+def test_failed_fetch_falls_back_to_simulation(monkeypatch):
+    def failing_data(*args):
+        raise OSError("POWER unavailable")
+
+    monkeypatch.setattr(analysis, 'get_analysis_data', failing_data)
+    data, city_name = fetch_analysis_inputs(39.93, 32.86, date(2024, 6, 12), city_name='Ankara')
+    assert data['source'] == 'simulation'
+    assert city_name == 'Ankara'
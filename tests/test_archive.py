@@ -0,0 +1,69 @@
+"""Series archive: only settled days with a value are archived and served"""
+
+import os
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from power_weather import archive as archive_module
+from power_weather.archive import INDEX_FILE, SeriesArchive, load_power_json, store_power_json
+from power_weather.cache import RECENT_DAYS
+from power_weather.decode import to_power_json
+from power_weather.grid import grid_cell
+
+LAT, LON = 39.93, 32.86
+TODAY = date(2024, 6, 30)
+
+
+@pytest.fixture
+def archive(tmp_path, monkeypatch):
+    archive = SeriesArchive(str(tmp_path))
+    monkeypatch.setattr(archive_module, '_default_archive', archive)
+    return archive
+
+
+def power_json(start, end, gaps=()):
+    dates = np.arange(np.datetime64(start, 'D'), np.datetime64(end, 'D') + 1)
+    values = np.arange(len(dates), dtype=np.float64)
+    for day in gaps:
+        values[(np.datetime64(day, 'D') - dates[0]).astype(np.int64)] = np.nan
+    return to_power_json(dates, {'T2M': values})
+
+
+def test_recent_days_are_not_archived(archive):
+    start, end = TODAY - timedelta(days=30), TODAY - timedelta(days=2)
+    store_power_json(LAT, LON, power_json(start, end), today=TODAY)
+    settled = TODAY - timedelta(days=RECENT_DAYS + 1)
+    assert archive.index(grid_cell(LAT, LON).cell_id)['T2M'] == [[
+        int(archive_module.day_number(start)), int(archive_module.day_number(settled))
+    ]]
+    assert load_power_json(LAT, LON, 'T2M', start, settled, today=TODAY) is not None
+    assert load_power_json(LAT, LON, 'T2M', start, end, today=TODAY) is None
+    # Ten days later the preliminary days are settled, but were never archived: POWER is asked again
+    later = TODAY + timedelta(days=10)
+    assert load_power_json(LAT, LON, 'T2M', start, end, today=later) is None
+
+
+def test_fill_values_are_not_archived(archive):
+    start, end = date(2020, 1, 1), date(2020, 1, 10)
+    store_power_json(LAT, LON, power_json(start, end, gaps=[date(2020, 1, 5)]), today=TODAY)
+    assert load_power_json(LAT, LON, 'T2M', start, end, today=TODAY) is None
+    assert load_power_json(LAT, LON, 'T2M', start, date(2020, 1, 4), today=TODAY) is not None
+    assert load_power_json(LAT, LON, 'T2M', date(2020, 1, 6), end, today=TODAY) is not None
+    # The gap is filled once POWER has a value for it
+    store_power_json(LAT, LON, power_json(start, end), today=TODAY)
+    served = load_power_json(LAT, LON, 'T2M', start, end, today=TODAY)
+    assert served['properties']['parameter']['T2M']['20200105'] == 4.0
+
+
+def test_archived_range_is_not_rewritten(archive):
+    data = power_json(date(2020, 1, 1), date(2020, 12, 31))
+    cell_id = grid_cell(LAT, LON).cell_id
+    dates = np.arange(np.datetime64('2020-01-01'), np.datetime64('2021-01-01'))
+    columns = {'T2M': np.arange(len(dates), dtype=np.float64)}
+    assert archive.write_valid(cell_id, dates, columns) == len(dates)
+    index_mtime = os.stat(os.path.join(archive.directory, cell_id, INDEX_FILE)).st_mtime_ns
+    assert archive.write_valid(cell_id, dates, columns) == 0
+    store_power_json(LAT, LON, data, today=TODAY)
+    assert os.stat(os.path.join(archive.directory, cell_id, INDEX_FILE)).st_mtime_ns == index_mtime
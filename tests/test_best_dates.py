@@ -0,0 +1,73 @@
+"""Best date finder: the day-of-year table agrees with day_of_year_climatology, ranking is lowest risk first"""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from power_weather.best_dates import RISK_DIMENSIONS, day_of_year_table, rank_event_days, score_date_window
+from power_weather.climatology import CLIMATOLOGY_PARAMETERS, DailySeries, day_of_year, day_of_year_climatology
+
+
+def make_series(seed, n_years=8):
+    rng = np.random.default_rng(seed)
+    n_days = int((np.datetime64(f'{2012 + n_years}-01-01') - np.datetime64('2012-01-01')).astype(np.int64))
+    values = np.vstack([
+        rng.gamma(0.6, 4.0, n_days),
+        rng.normal(14, 8, n_days),
+        rng.uniform(30, 95, n_days),
+        rng.gamma(2.0, 1.6, n_days),
+    ]).astype(np.float32)
+    values[:, rng.integers(n_days, size=n_days // 50)] = np.nan
+    return DailySeries.with_derived(CLIMATOLOGY_PARAMETERS, values, '2012-01-01')
+
+
+def calm_june_series(n_years=8):
+    """Hot, windy and wet all year except 10-30 June, which is mild, calm and dry"""
+    dates = np.arange(np.datetime64('2012-01-01'), np.datetime64(f'{2012 + n_years}-01-01'))
+    calm = (day_of_year(dates) >= day_of_year(np.datetime64('2001-06-10'))) & \
+           (day_of_year(dates) <= day_of_year(np.datetime64('2001-06-30')))
+    columns = {
+        'PRECTOTCORR': np.where(calm, 0.0, 10.0),
+        'T2M': np.where(calm, 15.0, 35.0),
+        'RH2M': np.where(calm, 50.0, 60.0),
+        'WS2M': np.where(calm, 1.0, 12.0),
+    }
+    values = np.vstack([columns[name] for name in CLIMATOLOGY_PARAMETERS])
+    return DailySeries.with_derived(CLIMATOLOGY_PARAMETERS, values, '2012-01-01')
+
+
+@pytest.fixture(scope='module')
+def series():
+    return make_series(seed=3)
+
+
+@pytest.mark.parametrize('target', [date(2024, 1, 2), date(2024, 2, 29), date(2024, 6, 15), date(2024, 12, 30)])
+def test_table_matches_day_of_year_climatology(series, target):
+    table = day_of_year_table(series)
+    expected = day_of_year_climatology(series, target, percentiles=(50, 90))['parameters']
+    doy = int(day_of_year(np.datetime64(target, 'D')))
+    for dimension, (parameter, thresholds) in RISK_DIMENSIONS.items():
+        stats = expected[parameter]
+        assert table[f'{dimension}_p50'][doy] == pytest.approx(stats['percentiles'][50], rel=1e-6)
+        assert table[f'{dimension}_p90'][doy] == pytest.approx(stats['percentiles'][90], rel=1e-6)
+        assert table[f'p_{dimension}_medium'][doy] == pytest.approx(stats['exceedance'][thresholds[0]])
+        assert table[f'p_{dimension}_high'][doy] == pytest.approx(stats['exceedance'][thresholds[1]])
+
+
+def test_ranked_days_are_the_lowest_risk_days(series):
+    start, end = date(2024, 3, 1), date(2024, 8, 27)
+    ranked = rank_event_days(series, start, end, 'Wedding', top_n=10)
+    scores = score_date_window(series, start, end, 'Wedding')
+    assert len(scores) == 180
+    assert ranked['rank'].tolist() == list(range(1, 11))
+    assert ranked['combined_risk'].is_monotonic_increasing
+    assert ranked['combined_risk'].tolist() == sorted(scores['combined_risk'])[:10]
+
+
+def test_top_days_fall_in_the_calm_period():
+    ranked = rank_event_days(calm_june_series(), date(2024, 6, 1), date(2024, 6, 30), 'Picnic', top_n=5)
+    # Only days whose whole ±7 day window is calm score zero; ties go to the earlier date
+    assert ranked['date'].tolist() == [date(2024, 6, 17) + timedelta(days=i) for i in range(5)]
+    assert (ranked['combined_risk'] == 0).all()
+    assert set(ranked['risk_level']) == {'low'}
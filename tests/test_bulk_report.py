@@ -0,0 +1,49 @@
+"""Bulk PDF report: every batch output format is read the same way, long reports can be split"""
+
+import os
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from power_weather.batch import RESULT_COLUMNS, write_results
+from power_weather.bulk_report import _format_cell, iter_report_rows, part_path, write_bulk_report
+
+
+@pytest.fixture
+def results():
+    return pd.DataFrame([
+        {'venue': 'Kordon', 'lat': 38.43, 'lon': 27.14, 'cell_id': 'r257c331', 'date': date(2024, 6, 12),
+         'event_type': 'Wedding', 'status': 'success', 'risk_level': 'medium', 'thi': 74.2, 'temperature': 27.5,
+         'precipitation': 0.4, 'wind_speed': 3.1, 'confidence': 'high', 'data_source': 'NASA POWER Historical'},
+        {'venue': 'Ulus', 'lat': 39.94, 'lon': 32.85, 'cell_id': 'r260c341', 'date': date(2024, 6, 13),
+         'event_type': 'Concert', 'status': 'error', 'messages': 'timeout'},
+    ]).reindex(columns=RESULT_COLUMNS)
+
+
+@pytest.mark.parametrize('extension', ['.csv', '.parquet', '.arrow', '.feather'])
+def test_batch_outputs_are_read(tmp_path, results, extension):
+    path = str(tmp_path / f"results{extension}")
+    write_results(results, path)
+    rows = list(iter_report_rows(path))
+    assert [row['venue'] for row in rows] == ['Kordon', 'Ulus']
+    # Dates print as dd.mm.yyyy whatever the input format
+    assert [_format_cell(row['date'], '{}') for row in rows] == ['12.06.2024', '13.06.2024']
+    assert rows[0]['thi'] == pytest.approx(74.2)
+
+
+def test_unknown_suffix_is_rejected(tmp_path):
+    path = tmp_path / "results.xlsx"
+    path.write_bytes(b'\x00')
+    with pytest.raises(ValueError, match='unsupported results file'):
+        list(iter_report_rows(str(path)))
+
+
+def test_pages_per_file_splits_the_report(tmp_path, results):
+    rows = results.iloc[[0] * 100].reset_index(drop=True)
+    output = str(tmp_path / "report.pdf")
+    pages = write_bulk_report(rows, output, pages_per_file=2)
+    files = sorted(os.listdir(tmp_path))
+    assert files == [os.path.basename(part_path(output, i + 1)) for i in range(len(files))]
+    assert len(files) == (pages + 1) // 2
+    assert all(os.path.getsize(tmp_path / name) > 0 for name in files)
@@ -0,0 +1,127 @@
+"""Round trips of the columnar exports: values and column types come back unchanged"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from power_weather.analysis import build_alt_dates
+from power_weather.batch import RESULT_COLUMNS
+from power_weather.climatology import CLIMATOLOGY_PARAMETERS, DailySeries
+from power_weather.columnar import (ANALYSIS_SCHEMA, FORMATS, RESULT_SCHEMA, analysis_table, read_series_dataset,
+                                    read_table, results_table, series_batch, table_bytes, write_series_dataset,
+                                    write_table)
+
+
+def make_series(seed, n_years=3):
+    rng = np.random.default_rng(seed)
+    n_days = int((np.datetime64(f'{2010 + n_years}-01-01') - np.datetime64('2010-01-01')).astype(np.int64))
+    values = np.vstack([
+        rng.gamma(0.6, 4.0, n_days),
+        rng.normal(14, 8, n_days),
+        rng.uniform(30, 95, n_days),
+        rng.gamma(2.0, 1.6, n_days),
+    ]).astype(np.float32)
+    values[:, rng.integers(n_days, size=n_days // 50)] = np.nan
+    return DailySeries.with_derived(CLIMATOLOGY_PARAMETERS, values, '2010-01-01')
+
+
+def make_analysis(selected_date=date(2024, 6, 12)):
+    dates = [date(2024, 6, day) for day in range(9, 16)]
+    return {
+        'status': 'success',
+        'selected_date': selected_date,
+        'precipitation': 0.4,
+        'temperature': 27.5,
+        'rh': 48.0,
+        'wind_speed': 3.1,
+        'thi': 74.2,
+        'risk_level': 'medium',
+        'accuracy': 'Based on actual historical data (high accuracy)',
+        'window': {
+            'dates': dates,
+            'precipitation': [0.0, 0.2, 1.4, 0.4, 6.0, 0.0, 0.1],
+            'temperature': [24.0, 25.5, 26.0, 27.5, 22.0, 29.0, 31.5],
+            'rh': [55.0, 52.0, 60.0, 48.0, 80.0, 40.0, 35.0],
+            'wind_speed': [2.0, 3.5, 4.0, 3.1, 9.0, 11.0, 1.5],
+        }
+    }
+
+
+@pytest.fixture(scope='module')
+def cells():
+    return [(f"r{250 + i:03d}c{340 + i:03d}", make_series(seed=i)) for i in range(3)]
+
+
+@pytest.fixture(scope='module')
+def expected_series(cells):
+    table = pa.Table.from_batches([series_batch(series, cell_id) for cell_id, series in cells])
+    return table.sort_by([('cell_id', 'ascending'), ('date', 'ascending')])
+
+
+@pytest.mark.parametrize('fmt', FORMATS)
+def test_series_dataset_round_trip(tmp_path, cells, expected_series, fmt):
+    write_series_dataset(cells, tmp_path, fmt)
+    table = read_series_dataset(tmp_path, fmt)
+    # Same values and the same column types, partition column included
+    assert table.select(expected_series.column_names).equals(expected_series)
+
+
+@pytest.mark.parametrize('fmt', FORMATS)
+def test_series_dataset_filters(tmp_path, cells, fmt):
+    write_series_dataset(cells, tmp_path, fmt)
+    subset = read_series_dataset(tmp_path, fmt, cell_ids=[cells[0][0]], start=date(2010, 3, 1), end=date(2011, 2, 28))
+    assert subset.num_rows == 365
+    assert set(subset['cell_id'].to_pylist()) == {cells[0][0]}
+    assert subset['date'][0].as_py() == date(2010, 3, 1)
+
+
+@pytest.mark.parametrize('fmt', FORMATS)
+def test_results_round_trip(tmp_path, fmt):
+    results = pd.DataFrame([
+        {'venue': 'Kordon', 'lat': 38.43, 'lon': 27.14, 'cell_id': 'r257c331', 'date': date(2024, 6, 12),
+         'event_type': 'Wedding', 'status': 'success', 'risk_level': 'medium', 'thi': 74.2, 'temperature': 27.5,
+         'precipitation': 0.4, 'wind_speed': 3.1, 'wind_risk': 'low', 'precip_risk': 'low', 'confidence': 'high',
+         'data_source': 'NASA POWER Historical', 'historical_period': '2024', 'recommendations': 'A | B',
+         'messages': ''},
+        # A failed row: every measurement column is null
+        {'venue': 'Ulus', 'lat': 39.94, 'lon': 32.85, 'cell_id': 'r260c341', 'date': date(2024, 6, 13),
+         'event_type': 'Concert', 'status': 'error', 'messages': 'timeout'},
+    ]).reindex(columns=RESULT_COLUMNS)
+    table = results_table(results)
+    assert table.schema.equals(RESULT_SCHEMA)
+    path = tmp_path / f"results.{fmt}"
+    write_table(table, path, fmt)
+    assert read_table(path, fmt).equals(table)
+
+
+@pytest.mark.parametrize('fmt', FORMATS)
+def test_analysis_round_trip(tmp_path, fmt):
+    results = make_analysis()
+    table = analysis_table(results, build_alt_dates(results, today=date(2024, 7, 1)))
+    assert table.schema.equals(ANALYSIS_SCHEMA)
+    path = tmp_path / f"analysis.{fmt}"
+    path.write_bytes(table_bytes(table, fmt))
+    assert read_table(path, fmt).equals(table)
+
+
+def test_analysis_rows_carry_temperature_and_rh():
+    results = make_analysis()
+    rows = analysis_table(results, build_alt_dates(results, today=date(2024, 7, 1))).to_pylist()
+    assert [row['date'] for row in rows] == results['window']['dates']
+    assert [row['temperature'] for row in rows] == results['window']['temperature']
+    assert [row['rh'] for row in rows] == results['window']['rh']
+    assert [row['selected'] for row in rows] == [day == results['selected_date'] for day in results['window']['dates']]
+
+
+@pytest.mark.parametrize('fmt', FORMATS)
+def test_series_dataset_rewrite_replaces_rows(tmp_path, cells, expected_series, fmt):
+    write_series_dataset(cells, tmp_path, fmt)
+    # Exporting the same cells again replaces their files instead of duplicating rows
+    write_series_dataset(cells, tmp_path, fmt)
+    assert read_series_dataset(tmp_path, fmt).num_rows == expected_series.num_rows
+    # A later run for another cell adds to the directory
+    write_series_dataset([('r300c300', cells[0][1])], tmp_path, fmt)
+    assert read_series_dataset(tmp_path, fmt).num_rows == expected_series.num_rows + len(cells[0][1].dates)
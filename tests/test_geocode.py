@@ -0,0 +1,74 @@
+"""Place name cache: final answers are kept, failed lookups are retried"""
+
+from power_weather import geocode
+from power_weather.geocode import PlaceNameCache
+
+
+class BrokenIndex:
+    def nearest(self, lat, lon):
+        raise OSError("gazetteer unavailable")
+
+
+def test_found_name_is_cached(monkeypatch):
+    cache = PlaceNameCache()
+    key = PlaceNameCache.make_key(39.93, 32.86, False)
+    assert cache.resolve(key).startswith('Ankara')
+    monkeypatch.setattr(geocode, 'get_place_index', BrokenIndex)
+    assert cache.resolve(key).startswith('Ankara')
+
+
+def test_no_place_in_range_is_cached():
+    cache = PlaceNameCache()
+    # Open sea in the middle of the Black Sea
+    key = PlaceNameCache.make_key(43.0, 34.0, False)
+    assert cache.resolve(key) == ''
+    assert cache.peek(key) == ''
+
+
+def test_failed_online_lookup_is_retried(monkeypatch):
+    cache = PlaceNameCache()
+    key = PlaceNameCache.make_key(43.0, 34.0, True)
+    monkeypatch.setattr(geocode, 'get_nominatim_name', lambda lat, lon: None)
+    assert cache.resolve(key) == ''
+    assert cache.peek(key) is None
+    monkeypatch.setattr(geocode, 'get_nominatim_name', lambda lat, lon: 'Karadeniz')
+    assert cache.resolve(key) == 'Karadeniz'
+    assert cache.peek(key) == 'Karadeniz'
+
+
+def test_failed_index_load_is_retried(monkeypatch):
+    cache = PlaceNameCache()
+    key = PlaceNameCache.make_key(39.93, 32.86, False)
+    monkeypatch.setattr(geocode, 'get_place_index', BrokenIndex)
+    assert cache.resolve(key) == ''
+    assert cache.peek(key) is None
+
+
+def test_nearest_place_keeps_turkish_letters():
+    index = geocode.get_place_index()
+    assert index.nearest(41.0175, 28.9710)[0].startswith('Eminönü,')
+    assert index.nearest(40.1553, 26.4142)[0].startswith('Çanakkale,')
+    assert index.nearest(38.4127, 27.1384)[0].startswith('İzmir,')
+
+
+def test_nearest_place_is_the_closest_within_range():
+    index = geocode.get_place_index()
+    # Between Kızılay and Ulus in Ankara; the label ends with the country code
+    label, distance = index.nearest(39.93, 32.86)
+    assert label.startswith('Ankara') and label.endswith(', TR')
+    assert distance < 5
+    assert index.nearest(39.93, 32.86, max_km=0.5) is None
+    assert index.nearest(43.0, 34.0) is None
+
+
+def test_least_recently_used_name_is_evicted():
+    cache = PlaceNameCache(max_entries=2)
+    ankara, izmir, istanbul = (PlaceNameCache.make_key(lat, lon, False)
+                               for lat, lon in ((39.93, 32.86), (38.41, 27.14), (41.02, 28.97)))
+    cache.resolve(ankara)
+    cache.resolve(izmir)
+    cache.peek(ankara)
+    cache.resolve(istanbul)
+    assert cache.peek(izmir) is None
+    assert cache.peek(ankara).startswith('Ankara')
+    assert cache.peek(istanbul).startswith('Eminönü')
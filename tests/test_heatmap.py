@@ -0,0 +1,56 @@
+"""Heatmap overlay: codes are reprojected to Web Mercator and keep the exact risk colours"""
+
+import base64
+import io
+
+import folium
+import numpy as np
+import pytest
+from PIL import Image
+
+from power_weather.heatmap import MERCATOR_ROWS_PER_CELL, NO_DATA, OVERLAY_RGBA, _png, overlay_codes, overlay_colour
+
+
+def mercator(lat):
+    return np.degrees(np.arcsinh(np.tan(np.radians(lat))))
+
+
+def overlay_pixels(path, bounds):
+    overlay = folium.raster_layers.ImageOverlay(overlay_codes(path), bounds=bounds, colormap=overlay_colour,
+                                                mercator_project=True, pixelated=True)
+    png = base64.b64decode(overlay.url.split(',', 1)[1])
+    return np.asarray(Image.open(io.BytesIO(png)).convert('RGBA'))
+
+
+@pytest.fixture
+def heatmap_png(tmp_path):
+    # North row low, south row high; the last column has no data
+    path = str(tmp_path / "152.png")
+    _png(np.array([[0, 0, NO_DATA], [2, 2, NO_DATA]], dtype=np.uint8), path)
+    return path
+
+
+def test_overlay_codes(heatmap_png):
+    codes = overlay_codes(heatmap_png)
+    assert codes.shape == (2 * MERCATOR_ROWS_PER_CELL, 3)
+    assert np.isnan(codes[:, 2]).all()
+    assert set(np.unique(codes[:, :2])) == {0.0, 2.0}
+
+
+def test_overlay_keeps_risk_colours(heatmap_png):
+    pixels = overlay_pixels(heatmap_png, [[36.0, 26.0], [42.0, 45.0]])
+    colours = {tuple(pixel) for pixel in pixels.reshape(-1, 4)}
+    assert colours <= {tuple(rgba) for rgba in OVERLAY_RGBA}
+    # No-data cells stay fully transparent
+    assert (pixels[:, 2, 3] == 0).all()
+    assert tuple(pixels[0, 0]) == tuple(OVERLAY_RGBA[0]) and tuple(pixels[-1, 0]) == tuple(OVERLAY_RGBA[2])
+
+
+def test_overlay_is_mercator_projected(heatmap_png):
+    south, north = 30.0, 60.0
+    pixels = overlay_pixels(heatmap_png, [[south, 0.0], [north, 10.0]])
+    north_rows = int((pixels[:, 0, :3] == OVERLAY_RGBA[0, :3]).all(axis=1).sum())
+    # The two grid rows meet at 45°, which is below the middle of a Mercator image
+    expected = (mercator(north) - mercator(45.0)) / (mercator(north) - mercator(south)) * len(pixels)
+    assert abs(north_rows - expected) <= 1
+    assert north_rows > len(pixels) / 2
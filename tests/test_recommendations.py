@@ -0,0 +1,32 @@
+"""Event cards: labels in either language map to the same event"""
+
+from datetime import date
+
+import pytest
+
+from power_weather.recommendations import get_event_specific_recommendations
+
+
+@pytest.fixture
+def analysis():
+    return {
+        'selected_date': date(2024, 6, 12), 'precipitation': 0.4, 'thi': 70.0, 'wind_speed': 3.1,
+        'temperature': 22.0, 'risk_level': 'low', 'location': '39.93, 32.86', 'analysis_period': '10.06 - 14.06'
+    }
+
+
+def event_card(cards):
+    return cards[-1]['title']
+
+
+@pytest.mark.parametrize('event_type', ['Wedding', 'Düğün'])
+def test_label_in_either_language_gives_the_event_card(analysis, event_type):
+    # The baseline mapped a label of the other language to "Other"
+    assert event_card(get_event_specific_recommendations(event_type, analysis, lang='tr')) == '🎪 DÜĞÜN ÖZEL ÖNERİLER'
+    assert event_card(get_event_specific_recommendations(event_type, analysis, lang='en')) == \
+        '🎪 WEDDING SPECIFIC RECOMMENDATIONS'
+
+
+def test_unknown_label_gives_the_other_card(analysis):
+    assert event_card(get_event_specific_recommendations('Gala', analysis, lang='en')) == '🎪 OTHER SPECIFIC RECOMMENDATIONS'
+    assert event_card(get_event_specific_recommendations('Gala', analysis, lang='tr')) == '🎪 DIĞER ÖZEL ÖNERİLER'
@@ -0,0 +1,59 @@
+"""Risk kernels: the array versions agree with the scalar if/elif rules, NaN included"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from power_weather.risk import (PRECIP_THRESHOLDS, RISK_LEVELS, THI_THRESHOLDS, WIND_THRESHOLDS, calculate_thi,
+                                get_precipitation_risk_level, get_thi_risk_level, get_wind_risk_level, score_frame,
+                                score_weather, thi_risk_levels)
+
+
+def with_edges(values, thresholds):
+    """Random values plus each threshold, its neighbours and NaN"""
+    edges = [np.nextafter(t, -np.inf) for t in thresholds] + list(thresholds) + [np.nextafter(t, np.inf) for t in thresholds]
+    return np.concatenate([values, edges, [np.nan, -np.inf, np.inf]])
+
+
+@pytest.fixture
+def weather():
+    rng = np.random.default_rng(7)
+    n = 2000
+    wind = with_edges(rng.uniform(0, 15, n), WIND_THRESHOLDS)
+    precip = with_edges(rng.gamma(0.6, 4.0, n), PRECIP_THRESHOLDS)
+    temperature = rng.uniform(-10, 45, len(wind))
+    rh = rng.uniform(5, 100, len(wind))
+    temperature[rng.integers(len(wind), size=20)] = np.nan
+    return pd.DataFrame({'T2M': temperature, 'RH2M': rh, 'WS2M': wind, 'PRECTOTCORR': precip})
+
+
+def scalar_levels(function, values):
+    return [function(float(value)) for value in values]
+
+
+def test_score_weather_matches_scalar_rules(weather):
+    scores = score_weather(weather['T2M'], weather['RH2M'], weather['WS2M'], weather['PRECTOTCORR'])
+    thi = [calculate_thi(t, rh) for t, rh in zip(weather['T2M'], weather['RH2M'])]
+    np.testing.assert_allclose(scores['thi'], thi, equal_nan=True)
+    assert RISK_LEVELS[scores['thi_risk']].tolist() == scalar_levels(get_thi_risk_level, thi)
+    assert RISK_LEVELS[scores['wind_risk']].tolist() == scalar_levels(get_wind_risk_level, weather['WS2M'])
+    assert RISK_LEVELS[scores['precip_risk']].tolist() == scalar_levels(get_precipitation_risk_level, weather['PRECTOTCORR'])
+
+
+def test_thi_boundaries_match_scalar_rules():
+    # THI is derived inside score_weather, so its thresholds are checked on the kernel it uses
+    thi = with_edges(np.linspace(60, 90, 301), THI_THRESHOLDS)
+    assert thi_risk_levels(thi).tolist() == scalar_levels(get_thi_risk_level, thi)
+
+
+def test_score_frame_matches_scalar_rules(weather):
+    frame = score_frame(weather)
+    for column, function, source in [('wind_risk', get_wind_risk_level, 'WS2M'),
+                                     ('precip_risk', get_precipitation_risk_level, 'PRECTOTCORR')]:
+        assert frame[column].astype(str).tolist() == scalar_levels(function, weather[source])
+    assert frame['thi_risk'].astype(str).tolist() == scalar_levels(get_thi_risk_level, frame['THI'])
+    # Overall is the worst of the three
+    worst = [max(levels, key=list(RISK_LEVELS).index)
+             for levels in zip(frame['thi_risk'].astype(str), frame['wind_risk'].astype(str), frame['precip_risk'].astype(str))]
+    assert frame['overall_risk'].astype(str).tolist() == worst
+    assert frame['overall_risk'].cat.ordered